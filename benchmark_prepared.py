@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: benchmark_prepared.py - Comparação texto x comando preparado
+# Descrição: Este script mede o tempo médio das buscas mais frequentes do
+#            sistema (aluno por matrícula, pet por ID e login) executadas como
+#            SQL em texto e como comando preparado no servidor, usando a mesma
+#            conexão do pool para as duas variantes.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - model.conexao_db: Para obter uma conexão do pool.
+# - model.repositorios: Para os repositórios de alunos, pets e usuários.
+# - argparse, time: Biblioteca padrão.
+#
+# Uso: Execute o script a partir da raiz do projeto (com dados cadastrados):
+#      $ python benchmark_prepared.py --repeticoes 5000
+# ==============================================================================
+
+import argparse
+import time
+
+from model.conexao_db import conexao
+from model.repositorios import AlunoRepository, PetRepository, UserRepository
+
+
+def medir(funcao, repeticoes):
+    """Executa 'funcao' repetidas vezes e retorna o tempo médio em microssegundos."""
+    funcao()  # Aquecimento: prepara o comando e carrega as páginas no cache do banco
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1_000_000
+
+
+def obter_chaves(conn):
+    """Busca uma matrícula, um ID de pet e um login existentes para as medições."""
+    cursor = conn.cursor()
+    chaves = []
+    for sql in ("SELECT matricula FROM alunos LIMIT 1",
+                "SELECT Id FROM pets LIMIT 1",
+                "SELECT login FROM users LIMIT 1"):
+        cursor.execute(sql)
+        linha = cursor.fetchone()
+        chaves.append(linha[0] if linha else None)
+    cursor.close()
+    return chaves
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara SQL em texto com comandos preparados.")
+    parser.add_argument("--repeticoes", type=int, default=2000, help="execuções por medição")
+    args = parser.parse_args()
+
+    with conexao() as conn:
+        matricula, pet_id, login = obter_chaves(conn)
+        casos = [
+            ("aluno por matrícula", AlunoRepository, lambda r: r.por_matricula(matricula)),
+            ("pet por ID", PetRepository, lambda r: r.por_id(pet_id)),
+            ("login", UserRepository, lambda r: r.autenticar(login, "0" * 64)),
+        ]
+
+        print(f"{'consulta':<22} {'texto (µs)':>12} {'preparado (µs)':>16} {'ganho':>8}")
+        for nome, classe, chamada in casos:
+            texto = medir(lambda: chamada(classe(conn, preparado=False)), args.repeticoes)
+            preparado = medir(lambda: chamada(classe(conn, preparado=True)), args.repeticoes)
+            ganho = (texto - preparado) / texto * 100 if texto else 0.0
+            print(f"{nome:<22} {texto:>12.1f} {preparado:>16.1f} {ganho:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
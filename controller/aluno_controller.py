@@ -9,7 +9,11 @@
 # Hora de Criação:
 #
 # Dependências:
-# - model.conexao_db: Para obter a conexão com o banco de dados.
+# - model.conexao_db: Para obter conexões do pool do banco de dados.
+# - model.repositorios: Para os comandos preparados de busca e gravação.
+# - controller.midia_controller: Para gravar e liberar as fotos (tabela midias).
+# - model.eventos: Para avisar os caches de imagens quando uma foto muda.
+# - model.cache_entidades: Para reaproveitar os alunos lidos pela matrícula.
 #
 # Uso: Este módulo deve ser importado pelos componentes da camada de view e
 #      controller para manipulação de dados de alunos.
@@ -18,7 +22,20 @@
 # controller/aluno_controller.py
 # Operações CRUD para Alunos
 
-from model.conexao_db import obter_conexao
+import re
+
+from model.cache_entidades import cache_entidades
+from model.conexao_db import apos_commit, backend_atual, conexao, unidade_de_trabalho
+from model.eventos import FOTO_ALTERADA, publicar
+from model.paginacao import paginar, TAMANHO_PAGINA_PADRAO
+from model.repositorios import AlunoRepository
+from controller.midia_controller import hash_da_foto, liberar_midia
+
+# Colunas listadas nas grades e colunas aceitas para ordenação
+COLUNAS_LISTAGEM = ("matricula", "nome", "cpf", "curso", "idade", "sexo")
+ORDENACOES_ALUNOS = ("matricula", "nome", "curso", "idade", "sexo")
+LIMITE_BUSCA_PADRAO = 200
+MIN_PALAVRA_FULLTEXT = 3  # innodb_ft_min_token_size: palavras menores não são indexadas
 
 
 def obter_alunos():
@@ -33,45 +50,271 @@ def obter_alunos():
                     um aluno com as chaves: matricula, nome, cpf, curso,
                     idade e sexo.
     """
-    conn = obter_conexao()
-    cursor = conn.cursor(dictionary=True)  # Retorna resultados como dicionários
-    cursor.execute("SELECT matricula, nome, cpf, curso, idade, sexo FROM alunos")
-    alunos = cursor.fetchall()  # Obtém todos os registros de uma vez
-    cursor.close()
-    conn.close()
+    with conexao() as conn:
+        cursor = conn.cursor(dictionary=True)  # Retorna resultados como dicionários
+        cursor.execute("SELECT matricula, nome, cpf, curso, idade, sexo FROM alunos")
+        alunos = cursor.fetchall()  # Obtém todos os registros de uma vez
+        cursor.close()
     return alunos
 
 
+def obter_pagina_alunos(tamanho_pagina=TAMANHO_PAGINA_PADRAO, ordenar_por="matricula",
+                        ordem="asc", cursor=None, deslocamento=0):
+    """
+    Retorna uma página de alunos usando paginação por chave (keyset).
+
+    Cada página continua a partir da última linha vista (ordenada pela
+    coluna escolhida e, em caso de empate, pela matrícula), de modo que o
+    custo não cresce com o número da página.
+
+    Args:
+        tamanho_pagina (int): Quantidade de alunos por página.
+        ordenar_por (str): Uma das colunas de ORDENACOES_ALUNOS.
+        ordem (str): 'asc' ou 'desc'.
+        cursor (str): Token 'proxima' ou 'anterior' de uma página já obtida
+                      com a mesma ordenação; None para a primeira página.
+        deslocamento (int): Linhas puladas a partir do cursor (ou do início,
+                            sem cursor); salto direto, ex.: barra de rolagem da grade.
+
+    Returns:
+        dict: {"itens": list[dict], "proxima": str ou None, "anterior": str ou None},
+              onde cada item tem as chaves matricula, nome, cpf, curso, idade e sexo.
+    """
+    with conexao() as conn:
+        return paginar(conn, "alunos", COLUNAS_LISTAGEM, "matricula", ORDENACOES_ALUNOS,
+                       ordenar_por, ordem, tamanho_pagina, cursor, deslocamento=deslocamento)
+
+
+def obter_alunos_vizinhos(matricula=None, sentido="depois", quantidade=TAMANHO_PAGINA_PADRAO,
+                          incluir=False):
+    """
+    Retorna os alunos logo depois (ou antes) de uma matrícula, na ordem da
+    matrícula, para navegar registro a registro sem carregar a tabela.
+
+    Cada chamada é uma consulta por faixa na chave primária (keyset), com o
+    mesmo custo em qualquer posição da tabela.
+
+    Args:
+        matricula (str): Matrícula de referência. None: a partir do primeiro
+                         aluno (sentido 'depois') ou do último ('antes').
+        sentido (str): 'depois' (matrículas maiores) ou 'antes' (menores).
+        quantidade (int): Número máximo de alunos retornados.
+        incluir (bool): Inclui o próprio aluno da matrícula, se existir
+                        (ex.: saltar para uma matrícula digitada).
+
+    Returns:
+        list[dict]: Alunos em ordem crescente de matrícula, com as chaves
+                    matricula, nome, cpf, curso, idade e sexo. Menos que
+                    'quantidade' itens indica que o início/fim da tabela foi alcançado.
+    """
+    if sentido not in ("depois", "antes"):
+        raise ValueError(f"Sentido inválido: {sentido!r}")
+    filtro, parametros = None, ()
+    if matricula is not None:
+        operador = (">" if sentido == "depois" else "<") + ("=" if incluir else "")
+        filtro, parametros = f"matricula {operador} %s", (matricula,)
+    with conexao() as conn:
+        pagina = paginar(conn, "alunos", COLUNAS_LISTAGEM, "matricula", ORDENACOES_ALUNOS,
+                         "matricula", "asc" if sentido == "depois" else "desc", quantidade,
+                         filtro=filtro, parametros=parametros)
+    itens = pagina["itens"]
+    if sentido == "antes":
+        itens.reverse()
+    return itens
+
+
+def _escapar_like(texto):
+    # '!' é o caractere de escape (ESCAPE '!'), igual no MySQL e no SQLite
+    return texto.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def buscar_alunos(termo, limite=LIMITE_BUSCA_PADRAO):
+    """
+    Busca alunos cuja matrícula, nome ou curso comece com o termo, ou cujo
+    nome contenha as palavras do termo.
+
+    Cada critério é uma consulta separada com LIMIT, resolvida pelo seu
+    próprio índice (chave primária, idx_alunos_nome, idx_alunos_curso e o
+    índice FULLTEXT ft_alunos_nome, ver db_script/alunos_indices.sql), e os
+    resultados são unidos com UNION. Assim a busca lê no máximo algumas
+    vezes 'limite' linhas, qualquer que seja o tamanho da tabela. No SQLite,
+    que não tem FULLTEXT, a busca por palavra usa LIKE '%palavra%'.
+
+    Args:
+        termo (str): Texto digitado na busca.
+        limite (int): Quantidade máxima de alunos retornados.
+
+    Returns:
+        list[dict]: Alunos encontrados, ordenados por nome, com as chaves
+                    matricula, nome, cpf, curso, idade e sexo.
+    """
+    termo = (termo or "").strip()
+    if not termo:
+        return []
+    limite = max(1, int(limite))
+    colunas = ", ".join(COLUNAS_LISTAGEM)
+    prefixo = _escapar_like(termo) + "%"
+    partes, params = [], []
+    for coluna in ("matricula", "nome", "curso"):
+        partes.append(f"SELECT {colunas} FROM alunos WHERE {coluna} LIKE %s ESCAPE '!' "
+                      f"ORDER BY {coluna} LIMIT %s")
+        params += [prefixo, limite]
+
+    # Palavras do nome em qualquer posição (sem os operadores da busca booleana)
+    palavras = [p for p in re.split(r"[\s+\-<>()~*\"@]+", termo) if p]
+    if backend_atual() == "mysql":
+        palavras = [p for p in palavras if len(p) >= MIN_PALAVRA_FULLTEXT]
+        if palavras:
+            partes.append(f"SELECT {colunas} FROM alunos "
+                          "WHERE MATCH(nome) AGAINST (%s IN BOOLEAN MODE) LIMIT %s")
+            params += [" ".join(f"+{p}*" for p in palavras), limite]
+    elif palavras:
+        condicoes = " AND ".join(["nome LIKE %s ESCAPE '!'"] * len(palavras))
+        partes.append(f"SELECT {colunas} FROM alunos WHERE {condicoes} LIMIT %s")
+        params += [f"%{_escapar_like(p)}%" for p in palavras] + [limite]
+
+    # Cada parte vira uma tabela derivada para poder ter ORDER BY/LIMIT próprios
+    sql = " UNION ".join(f"SELECT * FROM ({parte}) AS busca{i}" for i, parte in enumerate(partes))
+    sql += " ORDER BY nome, matricula LIMIT %s"
+    params.append(limite)
+
+    with conexao() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(sql, tuple(params))
+        alunos = cursor.fetchall()
+        cursor.close()
+    return alunos
+
+
+def iterar_alunos(tamanho_lote=1000):
+    """
+    Percorre todos os alunos em lotes, sem carregar a tabela inteira na memória.
+
+    Usa um cursor não bufferizado (as linhas ficam no servidor e são lidas
+    com fetchmany conforme o consumo), de modo que a memória usada depende
+    apenas do tamanho do lote. Se a leitura for interrompida antes do fim,
+    a conexão é descartada, pois ainda haveria linhas pendentes nela.
+
+    Args:
+        tamanho_lote (int): Quantidade de linhas lidas por vez.
+
+    Yields:
+        list[dict]: Lotes de alunos com as chaves matricula, nome, cpf,
+                    curso, idade e sexo.
+    """
+    with conexao() as conn:
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        concluido = False
+        try:
+            cursor.execute(f"SELECT {', '.join(COLUNAS_LISTAGEM)} FROM alunos")
+            while True:
+                lote = cursor.fetchmany(tamanho_lote)
+                if not lote:
+                    break
+                yield lote
+            concluido = True
+        finally:
+            if not concluido:
+                conn.descartar = True
+            try:
+                cursor.close()
+            except Exception:
+                pass  # Resultado não lido até o fim; a conexão será fechada
+
+
+def iterar_alunos_com_pets(tamanho_lote=1000):
+    """
+    Percorre todos os alunos junto com os seus pets, em uma única consulta.
+
+    Um LEFT JOIN de alunos com pets (pelo CPF do dono, resolvido pelo
+    índice idx_pets_cpf) é lido em ordem de matrícula com um cursor não
+    bufferizado, como em iterar_alunos(); as linhas de um mesmo aluno são
+    agrupadas à medida que chegam. Assim um relatório de donos e pets custa
+    uma consulta, e não uma por aluno.
+
+    Args:
+        tamanho_lote (int): Quantidade de linhas do JOIN lidas por vez.
+
+    Yields:
+        list[dict]: Lotes de alunos, cada um com as chaves matricula, nome,
+                    cpf, curso, idade, sexo e pets (lista de dicts com Id,
+                    apelido, raca e data_nascimento, vazia se não houver).
+    """
+    colunas_pet = ("Id", "apelido", "raca", "data_nascimento")
+    sql = (f"SELECT {', '.join('a.' + c for c in COLUNAS_LISTAGEM)}, "
+           f"{', '.join('p.' + c for c in colunas_pet)} "
+           "FROM alunos a LEFT JOIN pets p ON p.cpf = a.cpf "
+           "ORDER BY a.matricula, p.Id")
+    with conexao() as conn:
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        concluido = False
+        try:
+            cursor.execute(sql)
+            atual = None  # Aluno cujas linhas ainda podem continuar no próximo lote
+            while True:
+                linhas = cursor.fetchmany(tamanho_lote)
+                if not linhas:
+                    break
+                lote = []
+                for linha in linhas:
+                    if atual is None or linha["matricula"] != atual["matricula"]:
+                        if atual is not None:
+                            lote.append(atual)
+                        atual = {c: linha[c] for c in COLUNAS_LISTAGEM}
+                        atual["pets"] = []
+                    if linha["Id"] is not None:  # LEFT JOIN: aluno sem pets
+                        atual["pets"].append({c: linha[c] for c in colunas_pet})
+                if lote:
+                    yield lote
+            if atual is not None:
+                yield [atual]
+            concluido = True
+        finally:
+            if not concluido:
+                conn.descartar = True
+            try:
+                cursor.close()
+            except Exception:
+                pass  # Resultado não lido até o fim; a conexão será fechada
+
+
 def obter_aluno_por_matricula(matricula):
     """
-    Retorna os dados completos de um aluno específico pela matrícula.
+    Retorna os dados de um aluno específico pela matrícula.
 
-    Realiza uma consulta SELECT * na tabela 'alunos' filtrando pelo
-    campo matrícula. Utiliza query parametrizada para evitar SQL injection.
+    Realiza uma consulta SELECT na tabela 'alunos' filtrando pelo campo
+    matrícula. Utiliza comando preparado (AlunoRepository), o que também
+    evita SQL injection. A foto não é lida: use carregar_foto_aluno ou
+    carregar_midia(aluno["foto_hash"]) (controller.midia_controller).
+
+    O aluno lido fica em memória (model.cache_entidades) por até
+    cache_entidades_ttl segundos: reabrir o mesmo aluno não consulta o
+    banco. salvar_aluno e deletar_aluno o descartam.
 
     Args:
         matricula (str): Número de matrícula do aluno a ser consultado.
 
     Returns:
-        dict or None: Dicionário com todos os campos do aluno (incluindo
-                      foto em LONGBLOB), ou None se não encontrado.
+        dict or None: Dicionário com os campos do aluno (incluindo
+                      foto_hash), ou None se não encontrado.
     """
-    conn = obter_conexao()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM alunos WHERE matricula = %s", (matricula,))
-    aluno = cursor.fetchone()  # Retorna apenas um registro ou None
-    cursor.close()
-    conn.close()
-    return aluno
+    def consultar():
+        with conexao() as conn:
+            return AlunoRepository(conn).por_matricula(matricula)  # Um registro ou None
+
+    return cache_entidades.obter(("aluno", str(matricula)), consultar)
 
 
-def salvar_aluno(dados):
+def salvar_aluno(dados, novo=None):
     """
     Insere um novo aluno ou atualiza um aluno existente no banco de dados.
 
-    Verifica se o dicionário 'dados' contém uma matrícula preenchida.
-    Se sim, executa um UPDATE; caso contrário, executa um INSERT.
-    Utiliza conn.commit() para confirmar a transação no banco.
+    Como a matrícula é informada pelo usuário também no cadastro, ela não
+    indica sozinha se o aluno é novo: use 'novo' para escolher entre INSERT
+    e UPDATE. Se 'novo' for omitido, executa um INSERT apenas quando a
+    matrícula estiver vazia. A foto nova (se houver) e o aluno são gravados
+    na mesma transação; a foto substituída é apagada se nenhum outro
+    registro a usar.
 
     Args:
         dados (dict): Dicionário com os dados do aluno contendo as chaves:
@@ -80,41 +323,80 @@ def salvar_aluno(dados):
                       - curso (str): Nome do curso.
                       - idade (int): Idade do aluno.
                       - sexo (str): Sexo do aluno ('M' ou 'F').
-                      - foto (bytes ou None): Imagem em formato binário (LONGBLOB).
-    """
-    conn = obter_conexao()
-    cursor = conn.cursor()
-    if dados.get("matricula"):
-        # Atualiza os dados de um aluno existente com base na matrícula
-        cursor.execute("""
-            UPDATE alunos SET nome=%s, curso=%s, idade=%s, sexo=%s, foto=%s WHERE matricula=%s
-        """, (dados["nome"], dados["curso"], dados["idade"], dados["foto"], dados["sexo"], dados["matricula"]))
-    else:
-        # Insere um novo registro de aluno na tabela
-        cursor.execute("""
-            INSERT INTO alunos (matricula, nome, curso, idade, foto, sexo) VALUES (%s, %s, %s, %s, %s, %s)
-        """, (dados["matricula"], dados["nome"], dados["curso"], dados["idade"], dados["foto"], dados["sexo"]))
-    conn.commit()  # Confirma a transação no banco de dados
-    cursor.close()
-    conn.close()
+                      - foto (bytes ou None): Foto nova escolhida pelo usuário.
+                      - foto_hash (str ou None): Foto atual, mantida quando
+                        'foto' não é informada (None remove a foto).
+        novo (bool): True para INSERT, False para UPDATE.
+
+    Returns:
+        tuple: (matricula, linha), onde linha é o aluno gravado com as
+               colunas das grades (matricula, nome, cpf, curso, idade e sexo),
+               para que a grade atualize apenas esta linha.
+    """
+    if novo is None:
+        novo = not dados.get("matricula")
+    with unidade_de_trabalho() as conn:
+        repositorio = AlunoRepository(conn)
+        anterior = None if novo else repositorio.hash_foto(dados["matricula"])
+        dados = dict(dados, foto_hash=hash_da_foto(dados))
+        if novo:
+            # Insere um novo registro de aluno na tabela
+            repositorio.inserir(dados)
+        else:
+            # Atualiza os dados de um aluno existente com base na matrícula
+            repositorio.atualizar(dados)
+        if anterior != dados["foto_hash"]:
+            liberar_midia(anterior)
+        linha = repositorio.linha_listagem(dados["matricula"])
+    apos_commit(cache_entidades.invalidar, ("aluno", str(dados["matricula"])))
+    if anterior != dados["foto_hash"]:
+        apos_commit(publicar, FOTO_ALTERADA, entidade="aluno", chave=dados["matricula"],
+                    hash_anterior=anterior, hash_novo=dados["foto_hash"])
+    return dados["matricula"], linha
 
 
 def deletar_aluno(matricula):
     """
     Remove um aluno do banco de dados pela matrícula.
 
-    Executa um DELETE na tabela 'alunos' filtrando pelo campo matrícula.
-    A exclusão é confirmada com conn.commit().
+    Executa um DELETE na tabela 'alunos' filtrando pelo campo matrícula
+    e apaga a foto do aluno, se nenhum outro registro a usar.
 
     Args:
         matricula (str): Número de matrícula do aluno a ser removido.
+
+    Returns:
+        str: A matrícula removida (para a grade retirar apenas esta linha).
+    """
+    # Cache e telas só são avisados após o COMMIT (em deletar_alunos, o do lote todo)
+    with unidade_de_trabalho() as conn:
+        repositorio = AlunoRepository(conn)
+        foto_hash = repositorio.hash_foto(matricula)
+        repositorio.excluir(matricula)
+        liberar_midia(foto_hash)
+    apos_commit(cache_entidades.invalidar, ("aluno", str(matricula)))
+    apos_commit(cache_entidades.invalidar_tipo, "pet")  # Os pets do aluno ficam sem dono (ON DELETE SET NULL)
+    if foto_hash:
+        apos_commit(publicar, FOTO_ALTERADA, entidade="aluno", chave=matricula,
+                    hash_anterior=foto_hash, hash_novo=None)
+    return matricula
+
+
+def deletar_alunos(matriculas):
+    """
+    Remove vários alunos em uma única transação.
+
+    Todas as exclusões usam a mesma conexão e são confirmadas com um único
+    COMMIT; se alguma falhar, nenhuma é aplicada (ROLLBACK).
+
+    Args:
+        matriculas (list[str]): Matrículas dos alunos a serem removidos.
+
+    Returns:
+        list[str]: As matrículas removidas.
     """
-    conn = obter_conexao()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM alunos WHERE matricula = %s", (matricula,))
-    conn.commit()  # Confirma a exclusão no banco de dados
-    cursor.close()
-    conn.close()
+    with unidade_de_trabalho():
+        return [deletar_aluno(matricula) for matricula in matriculas]
 
 
 def contar_alunos():
@@ -127,12 +409,11 @@ def contar_alunos():
     Returns:
         int: Número total de alunos cadastrados.
     """
-    conn = obter_conexao()
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM alunos")
-    total = cursor.fetchone()[0]  # Extrai o valor escalar do resultado
-    cursor.close()
-    conn.close()
+    with conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM alunos")
+        total = cursor.fetchone()[0]  # Extrai o valor escalar do resultado
+        cursor.close()
     return total
 
 
@@ -147,10 +428,9 @@ def obter_idades_alunos():
     Returns:
         list[int]: Lista contendo a idade de cada aluno cadastrado.
     """
-    conn = obter_conexao()
-    cursor = conn.cursor()
-    cursor.execute("SELECT idade FROM alunos")
-    idades = [row[0] for row in cursor.fetchall()]  # Extrai apenas o valor de cada tupla
-    cursor.close()
-    conn.close()
+    with conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT idade FROM alunos")
+        idades = [row[0] for row in cursor.fetchall()]  # Extrai apenas o valor de cada tupla
+        cursor.close()
     return idades
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: exportacao_controller.py - Exportação de alunos para CSV
+# Descrição: Este script grava os alunos (ou os alunos com os seus pets) em
+#            um arquivo CSV (opcionalmente compactado com gzip) à medida que
+#            as linhas chegam do banco, em lotes lidos de um cursor não
+#            bufferizado. A memória usada não depende da quantidade de alunos
+#            cadastrados.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - csv, gzip, os, time: Biblioteca padrão.
+# - controller.aluno_controller: Para contar e percorrer os alunos em lotes.
+# - logger: Para registro de eventos do sistema.
+#
+# Uso: Pelo menu 'Relatórios' > 'Exportar Alunos para CSV' ou pela linha de
+#      comando, a partir da raiz do projeto:
+#      $ python -m controller.exportacao_controller alunos.csv
+#      $ python -m controller.exportacao_controller alunos.csv.gz --lote 5000
+#      $ python -m controller.exportacao_controller alunos_pets.csv --com-pets
+# ==============================================================================
+
+# controller/exportacao_controller.py
+# Exportação de alunos para CSV em fluxo contínuo
+
+import argparse
+import csv
+import gzip
+import os
+import time
+
+from controller.aluno_controller import contar_alunos, iterar_alunos, iterar_alunos_com_pets
+from logger import log_event
+
+TAMANHO_LOTE_PADRAO = 1000
+COLUNAS_ALUNOS = ("matricula", "nome", "cpf", "curso", "idade", "sexo")
+COLUNAS_ALUNOS_PETS = COLUNAS_ALUNOS + ("pet_id", "pet_apelido", "pet_raca", "pet_data_nascimento")
+
+
+class ExportacaoCanceladaError(Exception):
+    """Lançada quando a exportação é cancelada pelo usuário."""
+
+
+def _gravar_csv(caminho, colunas, lotes, total, compactar, ao_progresso, cancelar):
+    """
+    Grava as linhas de 'lotes' em '<caminho>.parcial' e renomeia o arquivo
+    para o nome final ao término, de modo que uma exportação interrompida
+    nunca deixa um CSV incompleto com o nome escolhido.
+
+    'lotes' produz pares (linhas do CSV, alunos exportados no lote); o
+    progresso é informado em alunos.
+
+    Returns:
+        tuple: (linhas gravadas, alunos exportados).
+    """
+    if compactar is None:
+        compactar = caminho.lower().endswith(".gz")
+    abrir = gzip.open if compactar else open
+    temporario = f"{caminho}.parcial"
+    linhas = alunos = 0
+    try:
+        with abrir(temporario, "wt", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=colunas)
+            writer.writeheader()
+            for lote, quantidade in lotes:
+                if cancelar is not None and cancelar.is_set():
+                    raise ExportacaoCanceladaError("Exportação cancelada.")
+                writer.writerows(lote)
+                linhas += len(lote)
+                alunos += quantidade
+                if ao_progresso:
+                    ao_progresso(alunos, max(total, alunos))
+        os.replace(temporario, caminho)
+    except BaseException:
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+        raise
+    return linhas, alunos
+
+
+def _resultado(caminho, linhas, alunos, inicio):
+    segundos = time.perf_counter() - inicio
+    return {
+        "caminho": caminho,
+        "linhas": linhas,
+        "alunos": alunos,
+        "bytes": os.path.getsize(caminho),
+        "segundos": segundos,
+        "linhas_por_segundo": linhas / segundos if segundos else 0.0,
+    }
+
+
+def exportar_alunos_csv(caminho, compactar=None, tamanho_lote=TAMANHO_LOTE_PADRAO,
+                        ao_progresso=None, cancelar=None):
+    """
+    Exporta todos os alunos para um arquivo CSV, lote a lote.
+
+    O arquivo é gravado primeiro como '<caminho>.parcial' e só é renomeado
+    para o nome final ao término, de modo que uma exportação interrompida
+    nunca deixa um CSV incompleto com o nome escolhido.
+
+    Args:
+        caminho (str): Arquivo de destino.
+        compactar (bool): Grava com gzip. Se omitido, compacta quando o
+                          caminho termina em '.gz'.
+        tamanho_lote (int): Linhas lidas do banco e gravadas por vez.
+        ao_progresso: Callback(linhas_gravadas, total) chamado após cada lote
+                      (na thread da exportação).
+        cancelar (threading.Event): Se sinalizado, interrompe a exportação
+                                    com ExportacaoCanceladaError.
+
+    Returns:
+        dict: Chaves caminho, linhas, alunos (iguais às linhas), bytes
+              (tamanho do arquivo), segundos e linhas_por_segundo.
+    """
+    log_event("exportacao_controller", f"exportar_alunos_csv {caminho}")
+    total = contar_alunos()  # Apenas para o progresso; o arquivo não depende dele
+    inicio = time.perf_counter()
+    lotes = ((lote, len(lote)) for lote in iterar_alunos(max(1, int(tamanho_lote))))
+    linhas, alunos = _gravar_csv(caminho, COLUNAS_ALUNOS, lotes, total, compactar, ao_progresso, cancelar)
+    resultado = _resultado(caminho, linhas, alunos, inicio)
+    log_event("exportacao_controller", f"exportar_alunos_csv: {linhas} linhas em {resultado['segundos']:.1f}s")
+    return resultado
+
+
+def _linhas_alunos_pets(alunos):
+    # Uma linha por pet; alunos sem pets saem em uma linha com as colunas do pet vazias
+    linhas = []
+    for aluno in alunos:
+        dono = {c: aluno[c] for c in COLUNAS_ALUNOS}
+        if not aluno["pets"]:
+            linhas.append(dono)
+        for pet in aluno["pets"]:
+            linhas.append({**dono, **{f"pet_{c.lower()}": v for c, v in pet.items()}})
+    return linhas
+
+
+def exportar_alunos_pets_csv(caminho, compactar=None, tamanho_lote=TAMANHO_LOTE_PADRAO,
+                             ao_progresso=None, cancelar=None):
+    """
+    Exporta todos os alunos com os seus pets para um arquivo CSV, com uma
+    linha por pet (alunos sem pets aparecem uma vez, sem os dados de pet).
+
+    Os dados vêm de uma única consulta (iterar_alunos_com_pets), lida em
+    lotes. Os argumentos são os mesmos de exportar_alunos_csv; o progresso
+    é informado em alunos.
+
+    Returns:
+        dict: Chaves caminho, linhas, alunos, bytes, segundos e linhas_por_segundo.
+    """
+    log_event("exportacao_controller", f"exportar_alunos_pets_csv {caminho}")
+    total = contar_alunos()
+    inicio = time.perf_counter()
+    lotes = ((_linhas_alunos_pets(lote), len(lote))
+             for lote in iterar_alunos_com_pets(max(1, int(tamanho_lote))))
+    linhas, alunos = _gravar_csv(caminho, COLUNAS_ALUNOS_PETS, lotes, total, compactar, ao_progresso, cancelar)
+    resultado = _resultado(caminho, linhas, alunos, inicio)
+    log_event("exportacao_controller", f"exportar_alunos_pets_csv: {alunos} alunos, {linhas} linhas "
+                                       f"em {resultado['segundos']:.1f}s")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta os alunos para um arquivo CSV.")
+    parser.add_argument("arquivo", help="arquivo de destino (termine em .gz para compactar)")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO, help="linhas por lote")
+    parser.add_argument("--com-pets", action="store_true", help="uma linha por pet de cada aluno")
+    args = parser.parse_args()
+
+    def mostrar(alunos, total):
+        print(f"\r{alunos}/{total} alunos", end="", flush=True)
+
+    exportar = exportar_alunos_pets_csv if args.com_pets else exportar_alunos_csv
+    resultado = exportar(args.arquivo, tamanho_lote=args.lote, ao_progresso=mostrar)
+    print()
+    print(f"{resultado['alunos']} alunos exportados para {resultado['caminho']} "
+          f"({resultado['linhas']} linhas, {resultado['bytes']} bytes, {resultado['segundos']:.1f}s).")
+
+
+if __name__ == "__main__":
+    main()
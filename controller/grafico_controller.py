@@ -9,7 +9,7 @@
 # Hora de Criação:
 #
 # Dependências:
-# - model.conexao_db: Para obter a conexão com o banco de dados.
+# - model.conexao_db: Para obter conexões do pool do banco de dados.
 #
 # Uso: Este módulo deve ser importado pela camada de view para renderizar gráficos
 #      baseados em dados de alunos.
@@ -18,7 +18,7 @@
 # controller/grafico_controller.py
 # Controlador para gráficos de idade e quantidade de alunos
 
-from model.conexao_db import obter_conexao
+from model.conexao_db import conexao
 
 
 def contar_alunos_por_faixa_etaria():
@@ -34,26 +34,25 @@ def contar_alunos_por_faixa_etaria():
                     - faixa_etaria (str): Rótulo da faixa (ex: '18-25').
                     - quantidade (int): Número de alunos nessa faixa.
     """
-    conn = obter_conexao()
-    cursor = conn.cursor(dictionary=True)  # Retorna resultados como dicionários
-    # Query com CASE para classificar idades em faixas etárias predefinidas
-    query = """
-    SELECT
-        CASE
-            WHEN idade BETWEEN 18 AND 25 THEN '18-25'
-            WHEN idade BETWEEN 26 AND 30 THEN '26-30'
-            WHEN idade BETWEEN 31 AND 40 THEN '31-40'
-            WHEN idade BETWEEN 41 AND 50 THEN '41-50'
-            ELSE '51+'
-        END AS faixa_etaria,
-        COUNT(*) AS quantidade
-    FROM alunos
-    GROUP BY faixa_etaria
-    """
-    cursor.execute(query)
-    dados = cursor.fetchall()  # Obtém todas as faixas com suas contagens
-    cursor.close()
-    conn.close()
+    with conexao() as conn:
+        cursor = conn.cursor(dictionary=True)  # Retorna resultados como dicionários
+        # Query com CASE para classificar idades em faixas etárias predefinidas
+        query = """
+        SELECT
+            CASE
+                WHEN idade BETWEEN 18 AND 25 THEN '18-25'
+                WHEN idade BETWEEN 26 AND 30 THEN '26-30'
+                WHEN idade BETWEEN 31 AND 40 THEN '31-40'
+                WHEN idade BETWEEN 41 AND 50 THEN '41-50'
+                ELSE '51+'
+            END AS faixa_etaria,
+            COUNT(*) AS quantidade
+        FROM alunos
+        GROUP BY faixa_etaria
+        """
+        cursor.execute(query)
+        dados = cursor.fetchall()  # Obtém todas as faixas com suas contagens
+        cursor.close()
     return dados
 
 
@@ -68,10 +67,9 @@ def contar_total_alunos():
     Returns:
         int: Número total de alunos cadastrados.
     """
-    conn = obter_conexao()
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM alunos")
-    total = cursor.fetchone()[0]  # Extrai o valor escalar do resultado
-    cursor.close()
-    conn.close()
+    with conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM alunos")
+        total = cursor.fetchone()[0]  # Extrai o valor escalar do resultado
+        cursor.close()
     return total
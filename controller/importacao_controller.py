@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: importacao_controller.py - Importação em massa de alunos e pets
+# Descrição: Este script lê arquivos CSV linha a linha (sem carregar o arquivo
+#            inteiro na memória), valida os registros em lotes e os grava com
+#            executemany (um INSERT de várias linhas por lote) ou, quando o
+#            servidor MySQL permite, com LOAD DATA LOCAL INFILE. Informa o
+#            progresso, a vazão (linhas/s) e as linhas rejeitadas.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - csv, datetime, itertools, os, tempfile, time: Biblioteca padrão.
+# - model.conexao_db: Para conexões do pool e transações por lote.
+# - logger: Para registro de eventos do sistema.
+#
+# Uso: Pelo menu 'Arquivo' > 'Importar ... de CSV' ou pela linha de comando,
+#      a partir da raiz do projeto:
+#      $ python -m controller.importacao_controller alunos novos_alunos.csv --lote 2000
+#      $ python -m controller.importacao_controller pets pets.csv --load-data
+#
+#      Colunas esperadas (cabeçalho na primeira linha, separador ',' ou ';'):
+#      alunos: matricula, nome, cpf, curso, idade, sexo
+#      pets:   apelido, raca, data_nascimento, cpf
+# ==============================================================================
+
+# controller/importacao_controller.py
+# Importação em massa de alunos e pets a partir de CSV
+
+import argparse
+import csv
+import datetime
+import os
+import tempfile
+import time
+from contextlib import nullcontext
+from itertools import islice
+
+from model.conexao_db import backend_atual, conexao, conexao_dedicada, unidade_de_trabalho
+from logger import log_event
+
+TAMANHO_LOTE_PADRAO = 1000
+MAX_EXEMPLOS_REJEITADOS = 100  # Motivos guardados em memória; o restante vai só para o arquivo
+
+
+def _texto(linha, campo, tamanho, obrigatorio=False):
+    valor = (linha.get(campo) or "").strip()
+    if not valor:
+        if obrigatorio:
+            raise ValueError(f"campo '{campo}' vazio")
+        return None
+    if len(valor) > tamanho:
+        raise ValueError(f"campo '{campo}' maior que {tamanho} caracteres")
+    return valor
+
+
+def _cpf(linha):
+    valor = "".join(c for c in (linha.get("cpf") or "") if c.isalnum())
+    if not valor:
+        return None
+    if not valor.isdigit() or len(valor) > 11:
+        raise ValueError(f"CPF inválido: {linha.get('cpf')!r}")
+    return valor.zfill(11)
+
+
+def validar_aluno(linha):
+    """
+    Valida e converte uma linha do CSV de alunos.
+
+    Returns:
+        tuple: (matricula, nome, cpf, curso, idade, sexo) prontos para o INSERT.
+
+    Raises:
+        ValueError: Com o motivo da rejeição.
+    """
+    idade = (linha.get("idade") or "").strip()
+    if idade:
+        if not idade.isdigit() or not 0 < int(idade) < 150:
+            raise ValueError(f"idade inválida: {idade!r}")
+        idade = int(idade)
+    else:
+        idade = None
+    sexo = (linha.get("sexo") or "").strip().upper()[:1] or None
+    if sexo not in (None, "M", "F"):
+        raise ValueError(f"sexo inválido: {linha.get('sexo')!r}")
+    return (
+        _texto(linha, "matricula", 20, obrigatorio=True),
+        _texto(linha, "nome", 100, obrigatorio=True),
+        _cpf(linha),
+        _texto(linha, "curso", 100),
+        idade,
+        sexo,
+    )
+
+
+def validar_pet(linha):
+    """
+    Valida e converte uma linha do CSV de pets.
+
+    Returns:
+        tuple: (apelido, raca, data_nascimento, cpf) prontos para o INSERT.
+
+    Raises:
+        ValueError: Com o motivo da rejeição.
+    """
+    data = (linha.get("data_nascimento") or "").strip()
+    if data:
+        try:
+            data = datetime.date.fromisoformat(data).isoformat()
+        except ValueError:
+            raise ValueError(f"data_nascimento inválida (use AAAA-MM-DD): {data!r}") from None
+    else:
+        data = None
+    return (
+        _texto(linha, "apelido", 20, obrigatorio=True),
+        _texto(linha, "raca", 20),
+        data,
+        _cpf(linha),
+    )
+
+
+# Tabela -> (colunas gravadas, função de validação)
+TABELAS = {
+    "alunos": (("matricula", "nome", "cpf", "curso", "idade", "sexo"), validar_aluno),
+    "pets": (("apelido", "raca", "data_nascimento", "cpf"), validar_pet),
+}
+
+
+def _cpfs_cadastrados(cpfs):
+    """Retorna, dos CPFs informados, os que pertencem a algum aluno (uma consulta pelo índice de alunos.cpf)."""
+    if not cpfs:
+        return set()
+    marcadores = ", ".join(["%s"] * len(cpfs))
+    with conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT cpf FROM alunos WHERE cpf IN ({marcadores})", tuple(cpfs))
+        cadastrados = {linha[0] for linha in cursor.fetchall()}
+        cursor.close()
+    return cadastrados
+
+
+def _detectar_delimitador(caminho):
+    with open(caminho, "r", encoding="utf-8-sig", newline="") as f:
+        cabecalho = f.readline()
+    return ";" if cabecalho.count(";") > cabecalho.count(",") else ","
+
+
+def _sql_insert(tabela, colunas):
+    # Linhas com chave já cadastrada são ignoradas (contadas como duplicadas)
+    ignorar = "INSERT OR IGNORE" if backend_atual() == "sqlite" else "INSERT IGNORE"
+    marcadores = ", ".join(["%s"] * len(colunas))
+    return f"{ignorar} INTO {tabela} ({', '.join(colunas)}) VALUES ({marcadores})"
+
+
+def servidor_permite_load_data():
+    """Retorna True se o backend for MySQL e o servidor aceitar LOAD DATA LOCAL INFILE."""
+    if backend_atual() != "mysql":
+        return False
+    with conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT @@GLOBAL.local_infile")
+        valor = cursor.fetchone()[0]
+        cursor.close()
+    return str(valor) in ("1", "ON")
+
+
+def _gravar_lote_executemany(sql, lote):
+    """Grava um lote em uma única transação; retorna as linhas inseridas."""
+    with unidade_de_trabalho() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(sql, lote)
+        inseridas = max(cursor.rowcount, 0)
+        cursor.close()
+    return inseridas
+
+
+def _campo_load_data(valor):
+    # Com ESCAPED BY '', \\N não é lido como NULL: NULL vai como a palavra
+    # NULL sem aspas e todo valor real vai entre aspas (aspas internas dobradas)
+    if valor is None:
+        return "NULL"
+    return '"' + str(valor).replace('"', '""') + '"'
+
+
+def _gravar_lote_load_data(conn, tabela, colunas, lote):
+    """Grava um lote com LOAD DATA LOCAL INFILE a partir de um arquivo temporário."""
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False,
+                                     encoding="utf-8", newline="") as tmp:
+        for registro in lote:
+            tmp.write(",".join(_campo_load_data(v) for v in registro) + "\n")
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE {tabela} CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+            f"LINES TERMINATED BY '\\n' ({', '.join(colunas)})",
+            (tmp.name.replace("\\", "/"),)
+        )
+        inseridas = max(cursor.rowcount, 0)
+        cursor.close()
+        conn.commit()
+    finally:
+        os.remove(tmp.name)
+    return inseridas
+
+
+def importar_csv(caminho, tabela="alunos", tamanho_lote=TAMANHO_LOTE_PADRAO,
+                 usar_load_data=False, ao_progresso=None, arquivo_rejeitados=None):
+    """
+    Importa um arquivo CSV para a tabela 'alunos' ou 'pets' em lotes.
+
+    O arquivo é lido como fluxo: apenas um lote fica na memória por vez.
+    Cada lote é validado e gravado em uma única transação. Linhas inválidas
+    (e pets cujo CPF não pertence a nenhum aluno) são rejeitadas e
+    registradas, com o número da linha e o motivo, no arquivo de
+    rejeitados; linhas com chave já cadastrada são ignoradas e contadas
+    como duplicadas.
+
+    Args:
+        caminho (str): Caminho do arquivo CSV (UTF-8, com cabeçalho).
+        tabela (str): 'alunos' ou 'pets'.
+        tamanho_lote (int): Quantidade de linhas por lote/transação.
+        usar_load_data (bool): Usa LOAD DATA LOCAL INFILE se o servidor permitir
+                               (caso contrário, usa executemany).
+        ao_progresso: Callback(resultado) chamado após cada lote (na thread
+                      da importação) com o dicionário de resultado parcial.
+        arquivo_rejeitados (str): Onde gravar as linhas rejeitadas
+                                  (padrão: <caminho>.rejeitados.csv).
+
+    Returns:
+        dict: Chaves lidas, inseridas, duplicadas (chave já cadastrada),
+              rejeitadas (inválidas), segundos, linhas_por_segundo,
+              metodo, arquivo_rejeitados e exemplos_rejeitados (lista de
+              (linha, motivo) com até 100 itens).
+    """
+    if tabela not in TABELAS:
+        raise ValueError(f"Tabela inválida: {tabela!r} (use 'alunos' ou 'pets').")
+    log_event("importacao_controller", f"importar_csv {tabela}")
+    colunas, validar = TABELAS[tabela]
+    tamanho_lote = max(1, int(tamanho_lote))
+    arquivo_rejeitados = arquivo_rejeitados or f"{caminho}.rejeitados.csv"
+    if usar_load_data and not servidor_permite_load_data():
+        usar_load_data = False
+
+    resultado = {
+        "lidas": 0, "inseridas": 0, "duplicadas": 0, "rejeitadas": 0, "segundos": 0.0,
+        "linhas_por_segundo": 0.0, "metodo": "load data" if usar_load_data else "executemany",
+        "arquivo_rejeitados": arquivo_rejeitados, "exemplos_rejeitados": [],
+    }
+    inicio = time.perf_counter()
+    sql = _sql_insert(tabela, colunas)
+
+    with open(caminho, "r", encoding="utf-8-sig", newline="") as entrada, \
+            open(arquivo_rejeitados, "w", encoding="utf-8", newline="") as saida_rejeitados:
+        leitor = csv.DictReader(entrada, delimiter=_detectar_delimitador(caminho))
+        rejeitados = csv.writer(saida_rejeitados, delimiter=";")
+        rejeitados.writerow(["linha", "motivo"])
+
+        def rejeitar(numero_linha, motivo):
+            resultado["rejeitadas"] += 1
+            rejeitados.writerow([numero_linha, motivo])
+            if len(resultado["exemplos_rejeitados"]) < MAX_EXEMPLOS_REJEITADOS:
+                resultado["exemplos_rejeitados"].append((numero_linha, motivo))
+
+        dedicada = conexao_dedicada(allow_local_infile=True) if usar_load_data else nullcontext()
+        with dedicada as conn:
+            while True:
+                bloco = list(islice(leitor, tamanho_lote))
+                if not bloco:
+                    break
+                lote = []
+                numeros = []
+                for linha in bloco:
+                    resultado["lidas"] += 1
+                    try:
+                        lote.append(validar(linha))
+                        numeros.append(resultado["lidas"] + 1)
+                    except ValueError as e:
+                        # +1 pelo cabeçalho (registros com quebra de linha entre aspas
+                        # são contados como uma linha só)
+                        rejeitar(resultado["lidas"] + 1, str(e))
+                if tabela == "pets":
+                    # pets.cpf é chave estrangeira: o dono precisa estar cadastrado
+                    cadastrados = _cpfs_cadastrados({registro[-1] for registro in lote if registro[-1]})
+                    validos = []
+                    for numero_linha, registro in zip(numeros, lote):
+                        if registro[-1] and registro[-1] not in cadastrados:
+                            rejeitar(numero_linha, f"CPF sem aluno cadastrado: {registro[-1]}")
+                        else:
+                            validos.append(registro)
+                    lote = validos
+                if lote:
+                    if conn is not None:
+                        inseridas = _gravar_lote_load_data(conn, tabela, colunas, lote)
+                    else:
+                        inseridas = _gravar_lote_executemany(sql, lote)
+                    resultado["inseridas"] += inseridas
+                    # Linhas ignoradas pelo banco (chave já cadastrada); não há
+                    # como saber quais linhas do lote eram, apenas quantas
+                    resultado["duplicadas"] += len(lote) - inseridas
+                resultado["segundos"] = time.perf_counter() - inicio
+                resultado["linhas_por_segundo"] = resultado["lidas"] / resultado["segundos"]
+                if ao_progresso:
+                    ao_progresso(dict(resultado))
+
+    resultado["segundos"] = time.perf_counter() - inicio
+    if resultado["segundos"]:
+        resultado["linhas_por_segundo"] = resultado["lidas"] / resultado["segundos"]
+    log_event("importacao_controller",
+              f"importar_csv {tabela}: {resultado['inseridas']} inseridas, "
+              f"{resultado['duplicadas']} duplicadas, {resultado['rejeitadas']} rejeitadas")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa alunos ou pets de um arquivo CSV.")
+    parser.add_argument("tabela", choices=sorted(TABELAS), help="tabela de destino")
+    parser.add_argument("arquivo", help="arquivo CSV com cabeçalho")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO, help="linhas por lote")
+    parser.add_argument("--load-data", action="store_true",
+                        help="usa LOAD DATA LOCAL INFILE se o servidor permitir")
+    args = parser.parse_args()
+
+    def mostrar(parcial):
+        print(f"\r{parcial['lidas']} lidas, {parcial['inseridas']} inseridas, "
+              f"{parcial['duplicadas']} duplicadas, "
+              f"{parcial['rejeitadas']} rejeitadas ({parcial['linhas_por_segundo']:.0f} linhas/s)",
+              end="", flush=True)
+
+    resultado = importar_csv(args.arquivo, args.tabela, args.lote, args.load_data, ao_progresso=mostrar)
+    print()
+    print(f"Concluído em {resultado['segundos']:.1f}s via {resultado['metodo']}.")
+    if resultado["rejeitadas"]:
+        print(f"Linhas rejeitadas gravadas em {resultado['arquivo_rejeitados']}")
+
+
+if __name__ == "__main__":
+    main()
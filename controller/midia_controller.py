@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: midia_controller.py - Gravação e leitura das fotos
+# Descrição: Este script grava e lê as fotos de alunos e pets, que ficam na
+#            tabela 'midias', fora das linhas de alunos e pets. Cada arquivo é
+#            identificado pelo SHA-256 do conteúdo; os registros guardam apenas
+#            esse hash (coluna foto_hash). Assim, listagens e consultas por
+#            chave nunca trazem os bytes das fotos: elas só são lidas pelas
+#            funções de carregamento deste módulo. Ao gravar uma foto, também
+#            são gravadas a miniatura 120x160 e uma versão média. As fotos
+#            escolhidas nos formulários passam antes por preparar_foto(), que
+#            as reduz e recodifica conforme o conexao.con.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - hashlib: Biblioteca padrão (SHA-256 do conteúdo).
+# - model.conexao_db: Para obter conexões do pool do banco de dados.
+# - model.configuracao: Para as opções foto_* (formato, qualidade, versão média).
+# - model.imagens: Para preparar a foto e gerar a miniatura e a versão média.
+# - model.repositorios: Para os comandos preparados da tabela 'midias'.
+# - logger: Para registro dos bytes economizados na preparação das fotos.
+#
+# Uso: conteudo, relatorio = preparar_foto("/caminho/foto.png")
+#      foto = carregar_foto_aluno("2024001")   # bytes ou None
+#      foto = carregar_midia(aluno["foto_hash"], "miniatura")
+# ==============================================================================
+
+# controller/midia_controller.py
+# Fotos de alunos e pets endereçadas pelo conteúdo
+
+import hashlib
+
+from model.configuracao import obter_configuracao
+from model.conexao_db import conexao
+from model.imagens import gerar_variantes, normalizar_foto
+from model.repositorios import AlunoRepository, MidiaRepository, PetRepository
+from logger import log_event
+
+
+def hash_conteudo(conteudo):
+    """Retorna o SHA-256 (64 caracteres hexadecimais) dos bytes informados."""
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+def preparar_foto(caminho):
+    """
+    Lê a foto escolhida pelo usuário e a prepara para gravação: aplica a
+    orientação EXIF, remove os metadados, limita a resolução a
+    foto_dimensao_maxima e recodifica em foto_formato com foto_qualidade
+    (parâmetros do conexao.con).
+
+    Args:
+        caminho (str): Arquivo de imagem escolhido no formulário.
+
+    Returns:
+        tuple: (bytes a gravar, relatorio), em que relatorio traz
+               bytes_originais, bytes_finais, bytes_economizados, tamanho e formato.
+
+    Raises:
+        OSError: Se o arquivo não puder ser lido ou não for uma imagem válida.
+    """
+    with open(caminho, "rb") as f:
+        original = f.read()
+    config = obter_configuracao()
+    conteudo, relatorio = normalizar_foto(original, config['foto_dimensao_maxima'],
+                                          config['foto_formato'], config['foto_qualidade'])
+    log_event("midia_controller", f"preparar_foto: {resumo_preparacao(relatorio)}")
+    return conteudo, relatorio
+
+
+def resumo_preparacao(relatorio):
+    """Descreve o relatório de preparar_foto(), ex.: '2.4 MB → 310 KB (87% menor), 1200x1600 JPEG'."""
+    def tamanho(n):
+        return f"{n / 1048576:.1f} MB" if n >= 1048576 else f"{n / 1024:.0f} KB"
+
+    economia = relatorio["bytes_economizados"] / relatorio["bytes_originais"] if relatorio["bytes_originais"] else 0
+    largura, altura = relatorio["tamanho"]
+    return (f"{tamanho(relatorio['bytes_originais'])} → {tamanho(relatorio['bytes_finais'])} "
+            f"({abs(economia):.0%} {'menor' if economia >= 0 else 'maior'}), "
+            f"{largura}x{altura} {relatorio['formato'].upper()}")
+
+
+def salvar_midia(conteudo):
+    """
+    Grava uma foto na tabela 'midias' e retorna seu hash.
+
+    A miniatura (e, se foto_versao_media estiver ativa no conexao.con, a
+    versão média) é gerada aqui e gravada junto com a original. Se uma foto
+    idêntica já estiver gravada, nada é gerado nem enviado novamente.
+    Dentro de unidade_de_trabalho(), a gravação entra na mesma transação
+    do registro que aponta para ela.
+
+    Args:
+        conteudo (bytes): Arquivo da imagem.
+
+    Returns:
+        str: Hash a ser guardado na coluna foto_hash do registro.
+
+    Raises:
+        OSError: Se o conteúdo não for uma imagem válida.
+    """
+    hash_midia = hash_conteudo(conteudo)
+    with conexao() as conn:
+        repositorio = MidiaRepository(conn)
+        if not repositorio.existe(hash_midia):
+            miniatura, media = gerar_variantes(conteudo, obter_configuracao()['foto_versao_media'])
+            repositorio.inserir(hash_midia, conteudo, miniatura, media)
+            conn.commit()
+    return hash_midia
+
+
+def hash_da_foto(dados):
+    """
+    Resolve o foto_hash a gravar a partir dos dados de um formulário.
+
+    'foto' (bytes) é uma foto nova escolhida pelo usuário e é gravada em
+    'midias'; sem ela, vale o 'foto_hash' já existente (None remove a foto).
+    """
+    if dados.get("foto"):
+        return salvar_midia(dados["foto"])
+    return dados.get("foto_hash")
+
+
+def liberar_midia(hash_midia):
+    """
+    Apaga a foto se nenhum aluno ou pet apontar mais para ela.
+
+    Chamada depois que um registro troca de foto ou é excluído; fotos
+    compartilhadas por outros registros são mantidas.
+    """
+    if not hash_midia:
+        return
+    with conexao() as conn:
+        MidiaRepository(conn).excluir_se_orfa(hash_midia)
+        conn.commit()
+
+
+def carregar_midia(hash_midia, versao="original"):
+    """
+    Retorna os bytes da foto com o hash informado.
+
+    Args:
+        hash_midia (str): Valor da coluna foto_hash (None é aceito).
+        versao (str): 'original', 'miniatura' (JPEG 120x160) ou 'media'.
+
+    Returns:
+        bytes or None: Conteúdo da foto, ou None se não houver. A miniatura
+                       de fotos antigas é None até ser gerada (python -m
+                       model.migracoes miniaturas).
+    """
+    if not hash_midia:
+        return None
+    with conexao() as conn:
+        return MidiaRepository(conn).conteudo(hash_midia, versao)
+
+
+def carregar_foto_aluno(matricula, versao="original"):
+    """Retorna os bytes da foto do aluno, ou None se ele não tiver foto."""
+    with conexao() as conn:
+        hash_midia = AlunoRepository(conn).hash_foto(matricula)
+        return MidiaRepository(conn).conteudo(hash_midia, versao) if hash_midia else None
+
+
+def carregar_foto_pet(pet_id, versao="original"):
+    """Retorna os bytes da foto do pet, ou None se ele não tiver foto."""
+    with conexao() as conn:
+        hash_midia = PetRepository(conn).hash_foto(pet_id)
+        return MidiaRepository(conn).conteudo(hash_midia, versao) if hash_midia else None
+
+
+def carregar_miniatura(hash_midia):
+    """
+    Retorna a miniatura 120x160 (JPEG) da foto para exibição.
+
+    Para fotos gravadas antes das miniaturas, gera a miniatura a partir da
+    original (sem gravá-la); use 'python -m model.migracoes miniaturas'
+    para gerá-las de uma vez.
+    """
+    miniatura = carregar_midia(hash_midia, "miniatura")
+    if miniatura is None and hash_midia:
+        original = carregar_midia(hash_midia)
+        if original:
+            miniatura, _ = gerar_variantes(original, com_media=False)
+    return miniatura
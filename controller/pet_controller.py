@@ -9,7 +9,11 @@
 # Hora de Criação:
 #
 # Dependências:
-# - model.conexao_db: Para obter a conexão com o banco de dados.
+# - model.conexao_db: Para obter conexões do pool do banco de dados.
+# - model.repositorios: Para os comandos preparados de busca e gravação.
+# - controller.midia_controller: Para gravar e liberar as fotos (tabela midias).
+# - model.eventos: Para avisar os caches de imagens quando uma foto muda.
+# - model.cache_entidades: Para reaproveitar os pets lidos pelo ID.
 #
 # Uso: Este módulo deve ser importado pelos componentes da camada de view e
 #      controller para manipulação de dados de pets.
@@ -18,51 +22,133 @@
 # controller/pet_controller.py
 # Operações CRUD para Pets
 
-from model.conexao_db import obter_conexao
+from model.cache_entidades import cache_entidades
+from model.conexao_db import apos_commit, conexao, unidade_de_trabalho
+from model.eventos import FOTO_ALTERADA, publicar
+from model.paginacao import paginar, TAMANHO_PAGINA_PADRAO
+from model.repositorios import PetRepository
+from controller.midia_controller import hash_da_foto, liberar_midia
+
+# Colunas listadas nas grades (sem a foto) e colunas aceitas para ordenação
+COLUNAS_LISTAGEM = ("Id", "apelido", "raca", "data_nascimento", "cpf")
+ORDENACOES_PETS = ("Id", "apelido", "raca", "data_nascimento", "cpf")
 
 
 def obter_pets():
     """
     Retorna a lista de todos os pets cadastrados no banco de dados.
 
-    Realiza uma consulta SELECT * na tabela 'pets', retornando todos
-    os campos de cada registro.
+    Realiza uma consulta SELECT na tabela 'pets' com os campos usados nas
+    listagens; a foto não é lida (use carregar_foto_pet de controller.midia_controller).
 
     Returns:
         list[dict]: Lista de dicionários, onde cada dicionário representa
-                    um pet com as chaves: Id, apelido, raca, data_nascimento,
-                    foto e cpf (do dono).
-    """
-    conn = obter_conexao()
-    cursor = conn.cursor(dictionary=True)  # Retorna resultados como dicionários
-    cursor.execute("SELECT * FROM pets")
-    pets = cursor.fetchall()  # Obtém todos os registros de uma vez
-    cursor.close()
-    conn.close()
+                    um pet com as chaves: Id, apelido, raca, data_nascimento
+                    e cpf (do dono).
+    """
+    with conexao() as conn:
+        cursor = conn.cursor(dictionary=True)  # Retorna resultados como dicionários
+        cursor.execute(f"SELECT {', '.join(COLUNAS_LISTAGEM)} FROM pets")
+        pets = cursor.fetchall()  # Obtém todos os registros de uma vez
+        cursor.close()
     return pets
 
 
+def obter_pets_por_cpf(cpf):
+    """
+    Retorna os pets de um dono, em uma única consulta pelo índice
+    idx_pets_cpf (db_script/pets_indices.sql), sem ler a tabela inteira
+    nem as fotos.
+
+    Args:
+        cpf (str): CPF do dono (aluno).
+
+    Returns:
+        list[dict]: Pets do dono, ordenados pelo Id, com as chaves Id,
+                    apelido, raca, data_nascimento e cpf. Lista vazia se o
+                    CPF for vazio ou não tiver pets.
+    """
+    if not cpf:
+        return []
+    with conexao() as conn:
+        return PetRepository(conn).por_cpf(cpf)
+
+
+def obter_pagina_pets(tamanho_pagina=TAMANHO_PAGINA_PADRAO, ordenar_por="Id",
+                      ordem="asc", cursor=None, deslocamento=0, cpf=None):
+    """
+    Retorna uma página de pets usando paginação por chave (keyset).
+
+    Cada página continua a partir da última linha vista (ordenada pela
+    coluna escolhida e, em caso de empate, pelo Id), de modo que o custo
+    não cresce com o número da página.
+
+    Args:
+        tamanho_pagina (int): Quantidade de pets por página.
+        ordenar_por (str): Uma das colunas de ORDENACOES_PETS.
+        ordem (str): 'asc' ou 'desc'.
+        cursor (str): Token 'proxima' ou 'anterior' de uma página já obtida
+                      com a mesma ordenação; None para a primeira página.
+        deslocamento (int): Linhas puladas a partir do cursor (ou do início,
+                            sem cursor); salto direto, ex.: barra de rolagem da grade.
+        cpf (str): Se informado, lista apenas os pets deste dono.
+
+    Returns:
+        dict: {"itens": list[dict], "proxima": str ou None, "anterior": str ou None},
+              onde cada item tem as chaves Id, apelido, raca, data_nascimento e cpf.
+    """
+    filtro, parametros = ("cpf = %s", (cpf,)) if cpf is not None else (None, ())
+    with conexao() as conn:
+        return paginar(conn, "pets", COLUNAS_LISTAGEM, "Id", ORDENACOES_PETS,
+                       ordenar_por, ordem, tamanho_pagina, cursor, filtro, parametros, deslocamento)
+
+
+def contar_pets(cpf=None):
+    """
+    Conta os pets cadastrados (todos ou apenas os do dono informado).
+
+    Args:
+        cpf (str): Se informado, conta apenas os pets deste dono.
+
+    Returns:
+        int: Número de pets.
+    """
+    with conexao() as conn:
+        cursor = conn.cursor()
+        if cpf is None:
+            cursor.execute("SELECT COUNT(*) FROM pets")
+        else:
+            cursor.execute("SELECT COUNT(*) FROM pets WHERE cpf = %s", (cpf,))
+        total = cursor.fetchone()[0]  # Extrai o valor escalar do resultado
+        cursor.close()
+    return total
+
+
 def obter_pet_por_id(pet_id):
     """
-    Retorna os dados completos de um pet específico pelo ID.
+    Retorna os dados de um pet específico pelo ID.
+
+    Realiza uma consulta SELECT na tabela 'pets' filtrando pelo campo id.
+    Utiliza comando preparado (PetRepository), o que também evita SQL
+    injection. A foto não é lida: use carregar_foto_pet ou
+    carregar_midia(pet["foto_hash"]) (controller.midia_controller).
 
-    Realiza uma consulta SELECT * na tabela 'pets' filtrando pelo
-    campo id. Utiliza query parametrizada para evitar SQL injection.
+    O pet lido fica em memória (model.cache_entidades) por até
+    cache_entidades_ttl segundos: reabrir o mesmo pet não consulta o
+    banco. salvar_pet e deletar_pet o descartam.
 
     Args:
         pet_id (int): Identificador único do pet a ser consultado.
 
     Returns:
-        dict or None: Dicionário com todos os campos do pet (incluindo
-                      foto em LONGBLOB), ou None se não encontrado.
+        dict or None: Dicionário com os campos do pet (incluindo
+                      foto_hash), ou None se não encontrado.
     """
-    conn = obter_conexao()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM pets WHERE id = %s", (pet_id,))
-    pet = cursor.fetchone()  # Retorna apenas um registro ou None
-    cursor.close()
-    conn.close()
-    return pet
+    def consultar():
+        with conexao() as conn:
+            return PetRepository(conn).por_id(pet_id)  # Um registro ou None
+
+    return cache_entidades.obter(("pet", str(pet_id)), consultar)
 
 
 def salvar_pet(dados):
@@ -71,7 +157,8 @@ def salvar_pet(dados):
 
     Verifica se o dicionário 'dados' contém um ID preenchido.
     Se sim, executa um UPDATE; caso contrário, executa um INSERT.
-    Utiliza conn.commit() para confirmar a transação no banco.
+    A foto nova (se houver) e o pet são gravados na mesma transação; a foto
+    substituída é apagada se nenhum outro registro a usar.
 
     Args:
         dados (dict): Dicionário com os dados do pet contendo as chaves:
@@ -79,37 +166,76 @@ def salvar_pet(dados):
                       - apelido (str): Nome/apelido do pet.
                       - raca (str): Raça do pet.
                       - data_nascimento (date): Data de nascimento do pet.
-                      - cpf (str): CPF do dono (FK para tabela alunos).
-                      - foto (bytes ou None): Imagem em formato binário (LONGBLOB).
-    """
-    conn = obter_conexao()
-    cursor = conn.cursor()
-    if dados.get("id"):
-        # Atualiza os dados de um pet existente com base no ID
-        cursor.execute("UPDATE pets SET apelido=%s, raca=%s, data_nascimento=%s, cpf=%s, foto=%s WHERE id=%s",
-                       (dados["apelido"], dados["raca"], dados["data_nascimento"], dados["cpf"], dados["foto"], dados["id"]))
-    else:
-        # Insere um novo registro de pet na tabela
-        cursor.execute("INSERT INTO pets (apelido, raca, data_nascimento, cpf, foto) VALUES (%s, %s, %s, %s, %s)",
-                       (dados["apelido"], dados["raca"], dados["data_nascimento"], dados["cpf"], dados["foto"]))
-    conn.commit()  # Confirma a transação no banco de dados
-    cursor.close()
-    conn.close()
+                      - cpf (str): CPF do dono (FK para alunos.cpf); vazio
+                        grava o pet sem dono.
+                      - foto (bytes ou None): Foto nova escolhida pelo usuário.
+                      - foto_hash (str ou None): Foto atual, mantida quando
+                        'foto' não é informada (None remove a foto).
+
+    Returns:
+        tuple: (id, linha), onde id é o ID do pet (gerado, no INSERT) e linha
+               é o pet gravado com as colunas das grades (Id, apelido, raca,
+               data_nascimento e cpf), para que a grade atualize apenas esta linha.
+    """
+    with unidade_de_trabalho() as conn:
+        repositorio = PetRepository(conn)
+        anterior = repositorio.hash_foto(dados["id"]) if dados.get("id") else None
+        dados = dict(dados, cpf=dados.get("cpf") or None, foto_hash=hash_da_foto(dados))
+        if dados.get("id"):
+            # Atualiza os dados de um pet existente com base no ID
+            repositorio.atualizar(dados)
+            pet_id = dados["id"]
+        else:
+            # Insere um novo registro de pet na tabela
+            _, pet_id = repositorio.inserir(dados)
+        if anterior != dados["foto_hash"]:
+            liberar_midia(anterior)
+        linha = repositorio.linha_listagem(pet_id)
+    apos_commit(cache_entidades.invalidar, ("pet", str(pet_id)))
+    if anterior != dados["foto_hash"]:
+        apos_commit(publicar, FOTO_ALTERADA, entidade="pet", chave=pet_id,
+                    hash_anterior=anterior, hash_novo=dados["foto_hash"])
+    return pet_id, linha
 
 
 def deletar_pet(pet_id):
     """
     Remove um pet do banco de dados pelo ID.
 
-    Executa um DELETE na tabela 'pets' filtrando pelo campo id.
-    A exclusão é confirmada com conn.commit().
+    Executa um DELETE na tabela 'pets' filtrando pelo campo id e apaga
+    a foto do pet, se nenhum outro registro a usar.
 
     Args:
         pet_id (int): Identificador único do pet a ser removido.
+
+    Returns:
+        int: O ID removido (para a grade retirar apenas esta linha).
+    """
+    # Cache e telas só são avisados após o COMMIT (em deletar_pets, o do lote todo)
+    with unidade_de_trabalho() as conn:
+        repositorio = PetRepository(conn)
+        foto_hash = repositorio.hash_foto(pet_id)
+        repositorio.excluir(pet_id)
+        liberar_midia(foto_hash)
+    apos_commit(cache_entidades.invalidar, ("pet", str(pet_id)))
+    if foto_hash:
+        apos_commit(publicar, FOTO_ALTERADA, entidade="pet", chave=pet_id,
+                    hash_anterior=foto_hash, hash_novo=None)
+    return pet_id
+
+
+def deletar_pets(pet_ids):
+    """
+    Remove vários pets em uma única transação.
+
+    Todas as exclusões usam a mesma conexão e são confirmadas com um único
+    COMMIT; se alguma falhar, nenhuma é aplicada (ROLLBACK).
+
+    Args:
+        pet_ids (list[int]): IDs dos pets a serem removidos.
+
+    Returns:
+        list[int]: Os IDs removidos.
     """
-    conn = obter_conexao()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM pets WHERE id = %s", (pet_id,))
-    conn.commit()  # Confirma a exclusão no banco de dados
-    cursor.close()
-    conn.close()
+    with unidade_de_trabalho():
+        return [deletar_pet(pet_id) for pet_id in pet_ids]
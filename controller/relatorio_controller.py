@@ -9,7 +9,7 @@
 # Hora de Criação:
 #
 # Dependências:
-# - model.conexao_db: Para obter a conexão com o banco de dados.
+# - model.conexao_db: Para obter conexões do pool do banco de dados.
 #
 # Uso: Este módulo deve ser importado pela camada de view para gerar relatórios PDF.
 # ==============================================================================
@@ -17,7 +17,7 @@
 # controller/relatorio_controller.py
 # Controlador para geração de relatórios PDF
 
-from model.conexao_db import obter_conexao
+from model.conexao_db import conexao
 
 
 def obter_dados_relatorio():
@@ -33,10 +33,9 @@ def obter_dados_relatorio():
                     um aluno com as chaves: matricula, nome, curso, idade
                     e sexo.
     """
-    conn = obter_conexao()
-    cursor = conn.cursor(dictionary=True)  # Retorna resultados como dicionários
-    cursor.execute("SELECT matricula, nome, curso, idade, sexo FROM alunos")
-    alunos = cursor.fetchall()  # Obtém todos os registros para o relatório
-    cursor.close()
-    conn.close()
+    with conexao() as conn:
+        cursor = conn.cursor(dictionary=True)  # Retorna resultados como dicionários
+        cursor.execute("SELECT matricula, nome, curso, idade, sexo FROM alunos")
+        alunos = cursor.fetchall()  # Obtém todos os registros para o relatório
+        cursor.close()
     return alunos
@@ -9,7 +9,8 @@
 # Hora de Criação:
 #
 # Dependências:
-# - model.conexao_db: Para obter a conexão com o banco de dados.
+# - model.conexao_db: Para obter conexões do pool do banco de dados.
+# - model.repositorios: Para os comandos preparados de login e cadastro.
 # - hashlib: Para geração de hash SHA-256 das senhas.
 # - logger: Para registro de eventos do sistema.
 #
@@ -21,7 +22,8 @@
 # Operações de autenticação de usuários
 
 import hashlib
-from model.conexao_db import obter_conexao
+from model.conexao_db import conexao
+from model.repositorios import UserRepository
 from logger import log_event
 
 def autenticar_usuario(login, senha):
@@ -38,22 +40,12 @@ def autenticar_usuario(login, senha):
     log_event("user_controller", "autenticar_usuario")
 
     try:
-        conexao = obter_conexao()
-        cursor = conexao.cursor()
-
         # Hash da senha usando SHA-256
         senha_hash = hashlib.sha256(senha.encode()).hexdigest()
 
         # Busca usuário com login e senha correspondentes
-        sql = "SELECT login FROM users WHERE login = %s AND pswd = %s"
-        cursor.execute(sql, (login, senha_hash))
-
-        resultado = cursor.fetchone()
-
-        cursor.close()
-        conexao.close()
-
-        return resultado is not None
+        with conexao() as conn:
+            return UserRepository(conn).autenticar(login, senha_hash)
 
     except Exception as e:
         print(f"Erro ao autenticar usuário: {e}")
@@ -73,19 +65,13 @@ def criar_usuario(login, senha):
     log_event("user_controller", "criar_usuario")
 
     try:
-        conexao = obter_conexao()
-        cursor = conexao.cursor()
-
         # Hash da senha usando SHA-256
         senha_hash = hashlib.sha256(senha.encode()).hexdigest()
 
         # Insere novo usuário
-        sql = "INSERT INTO users (login, pswd) VALUES (%s, %s)"
-        cursor.execute(sql, (login, senha_hash))
-
-        conexao.commit()
-        cursor.close()
-        conexao.close()
+        with conexao() as conn:
+            UserRepository(conn).inserir(login, senha_hash)
+            conn.commit()
 
         return True
 
@@ -106,18 +92,8 @@ def verificar_usuario_existe(login):
     log_event("user_controller", "verificar_usuario_existe")
 
     try:
-        conexao = obter_conexao()
-        cursor = conexao.cursor()
-
-        sql = "SELECT login FROM users WHERE login = %s"
-        cursor.execute(sql, (login,))
-
-        resultado = cursor.fetchone()
-
-        cursor.close()
-        conexao.close()
-
-        return resultado is not None
+        with conexao() as conn:
+            return UserRepository(conn).existe(login)
 
     except Exception as e:
         print(f"Erro ao verificar usuário: {e}")
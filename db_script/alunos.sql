@@ -9,7 +9,9 @@ CREATE TABLE `alunos` (
   `curso` varchar(100) COLLATE utf8mb4_general_ci DEFAULT NULL,
   `sexo` varchar(1) COLLATE utf8mb4_general_ci DEFAULT NULL,
   `idade` int DEFAULT NULL,
-  `foto` longblob,
+  `foto_hash` char(64) COLLATE utf8mb4_general_ci DEFAULT NULL,
   `observacao` varchar(255) COLLATE utf8mb4_general_ci DEFAULT NULL,
-  PRIMARY KEY (`matricula`)
+  PRIMARY KEY (`matricula`),
+  UNIQUE KEY `uq_alunos_cpf` (`cpf`),
+  KEY `idx_alunos_foto_hash` (`foto_hash`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
@@ -0,0 +1,20 @@
+#
+# Indexes for table "alunos" (busca e ordenação na grade de alunos)
+#
+# Execute depois de alunos.sql:
+#   mysql -u seu_usuario -p nome_do_banco < db_script/alunos_indices.sql
+#
+# - idx_alunos_<coluna>: a grade ordena por (coluna, matricula) e continua
+#   cada página a partir da última linha vista; com a matrícula no índice,
+#   a página é lida direto do índice, sem ordenar a tabela (filesort).
+#   idx_alunos_nome e idx_alunos_curso também atendem às buscas por prefixo
+#   (LIKE 'texto%'); a matrícula já é coberta pela chave primária.
+# - ft_alunos_nome: busca por palavra em qualquer parte do nome
+#   (MATCH ... AGAINST, ex.: "silva" encontra "João da Silva").
+#
+
+CREATE INDEX `idx_alunos_nome` ON `alunos` (`nome`, `matricula`);
+CREATE INDEX `idx_alunos_curso` ON `alunos` (`curso`, `matricula`);
+CREATE INDEX `idx_alunos_idade` ON `alunos` (`idade`, `matricula`);
+CREATE INDEX `idx_alunos_sexo` ON `alunos` (`sexo`, `matricula`);
+CREATE FULLTEXT INDEX `ft_alunos_nome` ON `alunos` (`nome`);
@@ -0,0 +1,21 @@
+﻿#
+# Structure for table "midias"
+#
+# Fotos de alunos e pets, fora das linhas de alunos/pets. Cada arquivo é
+# guardado uma única vez, identificado pelo SHA-256 do conteúdo (hash); os
+# registros apontam para ele pela coluna foto_hash. Bancos com fotos na coluna
+# antiga 'foto' são convertidos com: python -m model.migracoes fotos
+#
+# miniatura: JPEG 120x160 exibido nos formulários; media: JPEG de até
+# 480x640 (NULL quando a original já é pequena). São geradas ao gravar a
+# foto; para fotos antigas: python -m model.migracoes miniaturas
+#
+
+CREATE TABLE `midias` (
+  `hash` char(64) COLLATE utf8mb4_general_ci NOT NULL,
+  `tamanho` int NOT NULL,
+  `conteudo` longblob NOT NULL,
+  `miniatura` longblob,
+  `media` longblob,
+  PRIMARY KEY (`hash`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
@@ -1,13 +1,19 @@
 ﻿#
 # Structure for table "pets"
 #
+# Execute depois de alunos.sql: pets.cpf referencia alunos.cpf (mesmo tipo e
+# collation, para que a junção entre as tabelas use os índices).
+#
 
 CREATE TABLE `pets` (
   `Id` int NOT NULL AUTO_INCREMENT,
   `apelido` varchar(20) COLLATE utf8mb4_general_ci DEFAULT NULL,
   `raca` varchar(20) COLLATE utf8mb4_general_ci DEFAULT NULL,
   `data_nascimento` date DEFAULT NULL,
-  `foto` longblob,
-  `cpf` int DEFAULT NULL,
-  PRIMARY KEY (`Id`)
+  `foto_hash` char(64) COLLATE utf8mb4_general_ci DEFAULT NULL,
+  `cpf` varchar(11) COLLATE utf8mb4_general_ci DEFAULT NULL,
+  PRIMARY KEY (`Id`),
+  KEY `idx_pets_foto_hash` (`foto_hash`),
+  CONSTRAINT `fk_pets_alunos_cpf` FOREIGN KEY (`cpf`) REFERENCES `alunos` (`cpf`)
+    ON DELETE SET NULL ON UPDATE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=9 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
@@ -0,0 +1,18 @@
+#
+# Indexes for table "pets" (ordenação na grade de pets)
+#
+# Execute depois de pets.sql:
+#   mysql -u seu_usuario -p nome_do_banco < db_script/pets_indices.sql
+#
+# - idx_pets_<coluna>: a grade ordena por (coluna, Id) e continua cada
+#   página a partir da última linha vista; com o Id no índice, a página é
+#   lida direto do índice, sem ordenar a tabela (filesort).
+#   idx_pets_cpf também atende à lista de pets de um dono (WHERE cpf = ...)
+#   e à chave estrangeira fk_pets_alunos_cpf, no lugar do índice que o MySQL
+#   cria sozinho para ela.
+#
+
+CREATE INDEX `idx_pets_apelido` ON `pets` (`apelido`, `Id`);
+CREATE INDEX `idx_pets_raca` ON `pets` (`raca`, `Id`);
+CREATE INDEX `idx_pets_data_nascimento` ON `pets` (`data_nascimento`, `Id`);
+CREATE INDEX `idx_pets_cpf` ON `pets` (`cpf`, `Id`);
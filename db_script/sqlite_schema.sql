@@ -0,0 +1,61 @@
+--
+-- Estrutura das tabelas para o backend SQLite embarcado (backend='sqlite' no conexao.con)
+-- Tradução de alunos.sql, pets.sql, midias.sql e users.sql. O collation utf8mb4_general_ci
+-- (sem diferenciar maiúsculas/minúsculas) é reproduzido com COLLATE NOCASE.
+-- Arquivos criados com pets.cpf int são convertidos com: python -m model.migracoes cpf_pets
+--
+
+CREATE TABLE IF NOT EXISTS alunos (
+  matricula varchar(20) NOT NULL COLLATE NOCASE,
+  nome varchar(100) DEFAULT NULL COLLATE NOCASE,
+  cpf varchar(11) DEFAULT NULL UNIQUE COLLATE NOCASE,
+  curso varchar(100) DEFAULT NULL COLLATE NOCASE,
+  sexo varchar(1) DEFAULT NULL COLLATE NOCASE,
+  idade int DEFAULT NULL,
+  foto_hash char(64) DEFAULT NULL,
+  observacao varchar(255) DEFAULT NULL COLLATE NOCASE,
+  PRIMARY KEY (matricula)
+);
+
+CREATE TABLE IF NOT EXISTS pets (
+  Id INTEGER PRIMARY KEY AUTOINCREMENT,
+  apelido varchar(20) DEFAULT NULL COLLATE NOCASE,
+  raca varchar(20) DEFAULT NULL COLLATE NOCASE,
+  data_nascimento date DEFAULT NULL,
+  foto_hash char(64) DEFAULT NULL,
+  cpf varchar(11) DEFAULT NULL COLLATE NOCASE
+    REFERENCES alunos (cpf) ON DELETE SET NULL ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS midias (
+  hash char(64) NOT NULL,
+  tamanho int NOT NULL,
+  conteudo longblob NOT NULL,
+  miniatura longblob,
+  media longblob,
+  PRIMARY KEY (hash)
+);
+
+CREATE TABLE IF NOT EXISTS users (
+  login varchar(190) NOT NULL COLLATE NOCASE,
+  pswd varchar(255) NOT NULL,
+  PRIMARY KEY (login)
+);
+
+-- Índices de busca e ordenação (alunos_indices.sql e pets_indices.sql). Sem
+-- FULLTEXT no SQLite: a busca por palavra no meio do nome usa LIKE '%texto%'.
+-- Bancos criados antes da ordenação trocam os índices de uma coluna pelos compostos.
+DROP INDEX IF EXISTS idx_alunos_nome;
+DROP INDEX IF EXISTS idx_alunos_curso;
+CREATE INDEX IF NOT EXISTS idx_alunos_nome_matricula ON alunos (nome, matricula);
+CREATE INDEX IF NOT EXISTS idx_alunos_curso_matricula ON alunos (curso, matricula);
+CREATE INDEX IF NOT EXISTS idx_alunos_idade_matricula ON alunos (idade, matricula);
+CREATE INDEX IF NOT EXISTS idx_alunos_sexo_matricula ON alunos (sexo, matricula);
+CREATE INDEX IF NOT EXISTS idx_pets_apelido_id ON pets (apelido, Id);
+CREATE INDEX IF NOT EXISTS idx_pets_raca_id ON pets (raca, Id);
+CREATE INDEX IF NOT EXISTS idx_pets_data_nascimento_id ON pets (data_nascimento, Id);
+CREATE INDEX IF NOT EXISTS idx_pets_cpf_id ON pets (cpf, Id);
+
+-- Referências às fotos (midias.sql)
+CREATE INDEX IF NOT EXISTS idx_alunos_foto_hash ON alunos (foto_hash);
+CREATE INDEX IF NOT EXISTS idx_pets_foto_hash ON pets (foto_hash);
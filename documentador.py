@@ -109,7 +109,7 @@ classDiagram
         +curso: str
         +idade: int
         +sexo: str
-        +foto: blob
+        +foto_hash: str
     }
     class Pet {
         +id: int
@@ -11,7 +11,8 @@
 # Dependências:
 # - customtkinter: Para interface gráfica moderna.
 # - tkinter: Para widgets de menu e manipulação de eventos.
-# - PIL: Para manipulação e exibição da imagem de fundo.
+# - view.cache_imagens (PIL): Para carregar e redimensionar a imagem de fundo,
+#   sem decodificá-la nem redimensioná-la de novo a cada redesenho.
 # - logger: Para registro dos eventos em log.
 #
 # Uso: Execute este script a partir da raiz do projeto.
@@ -20,7 +21,6 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import Menu, messagebox
-from PIL import Image, ImageTk
 import os
 
 from view.grid_alunos import GridAlunos
@@ -28,10 +28,17 @@ from view.form_alunos import FormAlunos
 from view.form_idade_alunos import FormIdadeAlunos
 from view.form_quantidade_alunos import FormQuantidadeAlunos
 from view.report_alunos import ReportAlunos
+from view.report_alunos_pets import ReportAlunosPets
 from view.form_sobre import FormSobre
 from view.form_licenca import FormLicenca
 from view.grid_pets import GridPets
 from view.form_login import FormLogin
+from view.form_estatisticas import FormEstatisticas
+from view.form_importacao import FormImportacao
+from view.form_exportacao import FormExportacao
+from view.executor_db import executor
+from controller.exportacao_controller import exportar_alunos_pets_csv
+from view.cache_imagens import imagem_de_arquivo, photo_redimensionada
 
 from logger import log_event
 
@@ -78,6 +85,7 @@ class MainView(ctk.CTk):
         self._center_window()
 
         # Carrega o wallpaper original (imagem de fundo)
+        self._wallpaper_tamanho = None  # Tamanho do wallpaper exibido (redimensionado)
         self._load_original_wallpaper()
 
         # Cria um Label para exibir a imagem de fundo, ocupando toda a janela
@@ -119,7 +127,7 @@ class MainView(ctk.CTk):
             wallpaper_path = os.path.join(script_dir, "images", "wallpaper.jpg")
             if not os.path.exists(wallpaper_path):
                 raise FileNotFoundError(f"Arquivo não encontrado: {wallpaper_path}")
-            self._orig_wallpaper = Image.open(wallpaper_path)
+            self._orig_wallpaper = imagem_de_arquivo(wallpaper_path)  # Decodificada uma única vez
         except Exception as e:
             messagebox.showerror("Erro ao carregar wallpaper", f"Ocorreu um erro ao carregar o wallpaper:\n{e}")
             self._orig_wallpaper = None
@@ -130,9 +138,12 @@ class MainView(ctk.CTk):
         """
         if not self._orig_wallpaper:
             return
+        if self._wallpaper_tamanho == (width, height):
+            return  # <Configure> repetido sem mudança de tamanho
         try:
-            resized = self._orig_wallpaper.resize((width, height), Image.LANCZOS)
-            self._wallpaper_photo = ImageTk.PhotoImage(resized)
+            # Só a versão do tamanho atual fica em memória (fora do cache de imagens)
+            self._wallpaper_photo = photo_redimensionada(self._orig_wallpaper, width, height)
+            self._wallpaper_tamanho = (width, height)
             self._bg_label.configure(image=self._wallpaper_photo)
         except Exception as e:
             messagebox.showerror("Erro ao aplicar wallpaper", f"Ocorreu um erro ao aplicar o wallpaper:\n{e}")
@@ -152,7 +163,7 @@ class MainView(ctk.CTk):
     def configurar_menu(self):
         """
         Cria e configura a barra de menus da janela principal, adicionando as opções
-        de Arquivo, Gráficos, Relatórios e Sobre, com seus respectivos comandos.
+        de Arquivo, Gráficos, Relatórios, Ferramentas e Sobre, com seus respectivos comandos.
         """
         menu_bar = Menu(self)
 
@@ -163,6 +174,9 @@ class MainView(ctk.CTk):
         menu_arquivo.add_command(label="Abrir Grade de Pets", command=self.abrir_grid_pets)
         menu_arquivo.add_command(label="Mestre-Detalhe", command=self.abrir_mestre_detalhe)
         menu_arquivo.add_separator()
+        menu_arquivo.add_command(label="Importar Alunos de CSV...", command=lambda: self.abrir_importacao("alunos"))
+        menu_arquivo.add_command(label="Importar Pets de CSV...", command=lambda: self.abrir_importacao("pets"))
+        menu_arquivo.add_separator()
         menu_arquivo.add_command(label="Sair", command=self.destroy)
 
         # Menu Gráficos: exibição de gráficos estatísticos
@@ -175,6 +189,15 @@ class MainView(ctk.CTk):
         menu_relatorios.add_command(label="Relatório de Alunos", command=self.abrir_relatorio)
         # Nova opção: exportar alunos para CSV
         menu_relatorios.add_command(label="Exportar Alunos para CSV", command=self.exportar_alunos_csv)
+        # Alunos com os seus pets (uma única consulta com LEFT JOIN)
+        menu_relatorios.add_separator()
+        menu_relatorios.add_command(label="Relatório de Alunos e Pets", command=self.abrir_relatorio_pets)
+        menu_relatorios.add_command(label="Exportar Alunos e Pets para CSV",
+                                    command=self.exportar_alunos_pets_csv)
+
+        # Menu Ferramentas: diagnóstico de desempenho
+        menu_ferramentas = Menu(menu_bar, tearoff=0)
+        menu_ferramentas.add_command(label="Estatísticas de Consultas", command=self.abrir_estatisticas)
 
         # Menu Sobre: informações do sistema e licença
         menu_sobre = Menu(menu_bar, tearoff=0)
@@ -185,6 +208,7 @@ class MainView(ctk.CTk):
         menu_bar.add_cascade(label="Arquivo", menu=menu_arquivo)
         menu_bar.add_cascade(label="Gráficos", menu=menu_graficos)
         menu_bar.add_cascade(label="Relatórios", menu=menu_relatorios)
+        menu_bar.add_cascade(label="Ferramentas", menu=menu_ferramentas)
         menu_bar.add_cascade(label="Sobre", menu=menu_sobre)
 
         self.config(menu=menu_bar)
@@ -261,31 +285,66 @@ class MainView(ctk.CTk):
         except Exception as e:
             messagebox.showerror("Erro ao abrir Relatório", str(e))
 
+    def abrir_relatorio_pets(self):
+        """
+        Abre a janela para geração do relatório PDF dos alunos com os seus pets.
+        """
+        try:
+            form = ReportAlunosPets(self)
+            form.transient(self)
+            form.grab_set()
+            form.focus_set()
+        except Exception as e:
+            messagebox.showerror("Erro ao abrir Relatório", str(e))
+
     def exportar_alunos_csv(self):
         """
-        Exporta a lista de alunos para um arquivo CSV no diretório do script.
-        Caso não haja alunos cadastrados, exibe mensagem de informação.
+        Pergunta o arquivo de destino e exporta os alunos para CSV em segundo
+        plano (ver FormExportacao). Arquivos terminados em '.csv.gz' são
+        gravados compactados com gzip.
         """
-        from controller.aluno_controller import obter_alunos
-        import csv
+        from tkinter import filedialog
 
+        caminho = filedialog.asksaveasfilename(
+            parent=self, title="Exportar Alunos para CSV", initialfile="alunos_exportados.csv",
+            defaultextension=".csv",
+            filetypes=[("Arquivos CSV", "*.csv"), ("CSV compactado (gzip)", "*.csv.gz")]
+        )
+        if not caminho:
+            return
         try:
-            alunos = obter_alunos()
-            if not alunos:
-                messagebox.showinfo("Exportar CSV", "Não há alunos cadastrados para exportar.")
-                return
-            # Define o nome do arquivo exportado
-            arquivo_csv = "alunos_exportados.csv"
-            with open(arquivo_csv, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=alunos[0].keys())
-                writer.writeheader()
-                writer.writerows(alunos)
-            messagebox.showinfo("Exportar CSV", f"Alunos exportados para {arquivo_csv}!")
-            log_event("main", "Exportação de alunos para CSV realizada com sucesso.")
+            form = FormExportacao(self, caminho)
+            form.transient(self)
+            form.grab_set()
+            form.focus_set()
         except Exception as e:
             messagebox.showerror("Erro ao exportar CSV", str(e))
             log_event("main", f"ERRO exportar_alunos_csv: {e}")
 
+    def exportar_alunos_pets_csv(self):
+        """
+        Pergunta o arquivo de destino e exporta os alunos com os seus pets
+        (uma linha por pet) para CSV em segundo plano.
+        """
+        from tkinter import filedialog
+
+        caminho = filedialog.asksaveasfilename(
+            parent=self, title="Exportar Alunos e Pets para CSV", initialfile="alunos_pets_exportados.csv",
+            defaultextension=".csv",
+            filetypes=[("Arquivos CSV", "*.csv"), ("CSV compactado (gzip)", "*.csv.gz")]
+        )
+        if not caminho:
+            return
+        try:
+            form = FormExportacao(self, caminho, exportar=exportar_alunos_pets_csv,
+                                  titulo="Exportar Alunos e Pets para CSV")
+            form.transient(self)
+            form.grab_set()
+            form.focus_set()
+        except Exception as e:
+            messagebox.showerror("Erro ao exportar CSV", str(e))
+            log_event("main", f"ERRO exportar_alunos_pets_csv: {e}")
+
     def abrir_mestre_detalhe(self):
         """
         Abre a janela mestre-detalhe (aluno e seus pets).
@@ -301,6 +360,30 @@ class MainView(ctk.CTk):
             messagebox.showerror("Erro ao abrir Mestre-Detalhe", str(e))
             log_event("main", f"ERRO abrir_mestre_detalhe: {e}")
 
+    def abrir_importacao(self, tabela):
+        """
+        Abre a janela de importação em massa de alunos ou pets a partir de CSV.
+        """
+        try:
+            form = FormImportacao(self, tabela)
+            form.transient(self)
+            form.grab_set()
+            form.focus_set()
+        except Exception as e:
+            messagebox.showerror("Erro ao abrir Importação", str(e))
+
+    def abrir_estatisticas(self):
+        """
+        Abre a janela com as estatísticas de desempenho das consultas SQL.
+        """
+        try:
+            form = FormEstatisticas(self)
+            form.transient(self)
+            form.grab_set()
+            form.focus_set()
+        except Exception as e:
+            messagebox.showerror("Erro ao abrir Estatísticas", str(e))
+
     def abrir_sobre(self):
         """
         Abre a janela com informações sobre o sistema.
@@ -350,5 +433,6 @@ if __name__ == "__main__":
     try:
         app = MainView()
         app.mainloop()
+        executor.encerrar()  # Não espera consultas em andamento ao fechar a janela
     except Exception as e:
         messagebox.showerror("Erro fatal", f"Erro ao iniciar aplicação:\n{e}")
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: backend_sqlite.py - Backend SQLite embarcado
+# Descrição: Este script adapta o módulo sqlite3 à mesma interface usada pelos
+#            controllers com o mysql-connector (placeholders %s, cursores que
+#            retornam dicionários, commit/rollback), permitindo rodar o sistema
+#            sem servidor MySQL a partir de um arquivo local em modo WAL.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - sqlite3: Banco de dados embarcado da biblioteca padrão.
+# - os, re, threading: Para caminhos, tradução de SQL e controle de concorrência.
+#
+# Uso: No conexao.con, defina backend='sqlite'; e, opcionalmente,
+#      sqlite_arquivo='exemplo.db'; (relativo à raiz do projeto).
+#      O esquema de db_script/sqlite_schema.sql é criado automaticamente.
+# ==============================================================================
+
+import os
+import re
+import sqlite3
+import threading
+
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+ESQUEMA_SQLITE = os.path.join(RAIZ_PROJETO, 'db_script', 'sqlite_schema.sql')
+
+# %s vira ? e %% vira % (mesma convenção de escape do mysql-connector)
+_MARCADOR = re.compile(r"%(s|%)")
+
+# Colunas criadas depois da primeira versão do esquema: (tabela, coluna, tipo).
+# Arquivos antigos recebem a coluna antes do script, que já cria índices sobre ela.
+COLUNAS_ADICIONADAS = (
+    ('alunos', 'foto_hash', 'char(64) DEFAULT NULL'),
+    ('pets', 'foto_hash', 'char(64) DEFAULT NULL'),
+    ('midias', 'miniatura', 'longblob'),
+    ('midias', 'media', 'longblob'),
+)
+
+# Erros depois dos quais a conexão não deve voltar ao pool (ex.: "database is
+# locked", "disk I/O error"): ela pode ter ficado com uma transação aberta
+ERROS_DESCARTE = (sqlite3.OperationalError, sqlite3.InterfaceError)
+
+_esquemas_criados = set()
+_esquema_lock = threading.Lock()
+
+
+def traduzir_sql(sql):
+    """Converte os placeholders do estilo MySQL (%s) para o estilo SQLite (?)."""
+    return _MARCADOR.sub(lambda m: '?' if m.group(1) == 's' else '%', sql)
+
+
+class CursorSQLite:
+    """
+    Cursor do sqlite3 com a interface do cursor do mysql-connector.
+
+    Parâmetros:
+        cursor: Cursor nativo do sqlite3.
+        dictionary (bool): Se True, as linhas são retornadas como dicionários.
+    """
+
+    def __init__(self, cursor, dictionary=False):
+        self._cursor = cursor
+        self._dictionary = dictionary
+
+    def _linha(self, linha):
+        if linha is None or not self._dictionary:
+            return linha
+        return {col[0]: valor for col, valor in zip(self._cursor.description, linha)}
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(traduzir_sql(sql), tuple(params or ()))
+        return self
+
+    def executemany(self, sql, lista_params):
+        self._cursor.executemany(traduzir_sql(sql), [tuple(p) for p in lista_params])
+        return self
+
+    def fetchone(self):
+        return self._linha(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._linha(linha) for linha in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._linha(linha) for linha in self._cursor.fetchall()]
+
+    def __iter__(self):
+        for linha in self._cursor:
+            yield self._linha(linha)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def column_names(self):
+        return tuple(col[0] for col in self._cursor.description or ())
+
+    def close(self):
+        self._cursor.close()
+
+
+class ConexaoSQLite:
+    """
+    Conexão sqlite3 com a interface da conexão do mysql-connector.
+
+    Opera em autocommit, como as conexões MySQL do pool; start_transaction()
+    abre uma transação explícita que termina em commit() ou rollback().
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, dictionary=False, **_opcoes):
+        # Opções exclusivas do MySQL (buffered, prepared...) são ignoradas
+        return CursorSQLite(self._conn.cursor(), dictionary=dictionary)
+
+    def start_transaction(self):
+        self._conn.execute("BEGIN")
+
+    def commit(self):
+        if self._conn.in_transaction:
+            self._conn.commit()
+
+    def rollback(self):
+        if self._conn.in_transaction:
+            self._conn.rollback()
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def ping(self, reconnect=False):
+        self._conn.execute("SELECT 1")
+
+    def is_connected(self):
+        try:
+            self.ping()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def close(self):
+        self._conn.close()
+
+
+def caminho_arquivo(config):
+    """Resolve o caminho do arquivo SQLite (relativo à raiz do projeto)."""
+    arquivo = config.get('sqlite_arquivo') or 'exemplo.db'
+    if arquivo == ':memory:' or os.path.isabs(arquivo):
+        return arquivo
+    return os.path.join(RAIZ_PROJETO, arquivo)
+
+
+def _adicionar_colunas(conn):
+    """Acrescenta às tabelas já existentes as colunas de COLUNAS_ADICIONADAS que faltarem."""
+    for tabela, coluna, tipo in COLUNAS_ADICIONADAS:
+        existentes = [linha[1] for linha in conn.execute(f"PRAGMA table_info({tabela})")]
+        if existentes and coluna not in existentes:
+            conn.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {tipo}")
+
+
+def criar_esquema(conn, caminho=ESQUEMA_SQLITE):
+    """Executa o script de criação de tabelas e índices (idempotente)."""
+    _adicionar_colunas(conn)
+    with open(caminho, 'r', encoding='utf-8') as f:
+        conn.executescript(f.read())
+
+
+def abrir_conexao_sqlite(config):
+    """
+    Abre uma conexão com o arquivo SQLite configurado.
+
+    Ativa o journal WAL (leitores não bloqueiam o escritor), synchronous=NORMAL
+    e chaves estrangeiras. Na primeira conexão com cada arquivo, cria o esquema.
+
+    Args:
+        config (Mapping): Configurações de model.configuracao.
+
+    Returns:
+        ConexaoSQLite: Conexão pronta para uso pelos controllers.
+    """
+    arquivo = caminho_arquivo(config)
+    conn = sqlite3.connect(
+        arquivo,
+        timeout=config.get('connect_timeout', 10),
+        isolation_level=None,       # autocommit; transações via start_transaction()
+        check_same_thread=False     # o pool entrega a conexão a uma thread por vez
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    with _esquema_lock:
+        if arquivo not in _esquemas_criados or arquivo == ':memory:':
+            criar_esquema(conn)
+            _esquemas_criados.add(arquivo)
+    return ConexaoSQLite(conn)
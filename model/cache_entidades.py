@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: cache_entidades.py - Cache dos registros lidos pela chave
+# Descrição: Este script guarda em memória os alunos e pets lidos pela chave
+#            primária (obter_aluno_por_matricula, obter_pet_por_id), para que
+#            reabrir o mesmo registro em um formulário não consulte o banco
+#            de novo. Cada registro vale por cache_entidades_ttl segundos e,
+#            passando de cache_entidades_itens registros, os usados há mais
+#            tempo são descartados. Os controllers descartam o registro ao
+#            gravá-lo ou excluí-lo.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - collections, threading, time: Biblioteca padrão.
+# - model.configuracao: Para o tempo de vida e o limite de registros.
+#
+# Uso: aluno = cache_entidades.obter(("aluno", matricula), lambda: buscar(matricula))
+#      cache_entidades.invalidar(("aluno", matricula))   # após gravar ou excluir
+#      cache_entidades.estatisticas()                    # acertos, falhas, taxa_acertos...
+# ==============================================================================
+
+# model/cache_entidades.py
+# Cache de leitura (read-through) com tempo de vida e descarte LRU
+
+import threading
+import time
+from collections import OrderedDict
+
+from model.configuracao import obter_configuracao
+
+
+class CacheEntidades:
+    """
+    Cache LRU de registros com tempo de vida.
+
+    As chaves são tuplas (tipo, chave primária), ex.: ('aluno', '2024001')
+    ou ('pet', '12'). Registros não encontrados (None) não são guardados,
+    para que um registro incluído por outro caminho (ex.: importação)
+    apareça na hora.
+
+    Parâmetros:
+        ttl (float): Segundos que um registro pode ser reaproveitado.
+        max_itens (int): Registros mantidos; acima disso, descarta os menos usados.
+    """
+
+    def __init__(self, ttl, max_itens):
+        self.ttl = float(ttl)
+        self.max_itens = int(max_itens)
+        self.acertos = 0
+        self.falhas = 0
+        self.expirados = 0
+        self.descartes = 0
+        self.invalidacoes = 0
+        self._itens = OrderedDict()  # chave -> (momento da leitura, registro), do menos para o mais usado
+        self._versao = 0             # Muda a cada invalidação
+        self._lock = threading.Lock()
+
+    def obter(self, chave, carregar):
+        """
+        Retorna o registro da chave, chamando carregar() apenas se ele não
+        estiver no cache ou tiver passado do tempo de vida.
+
+        Args:
+            chave (tuple): (tipo, chave primária).
+            carregar: Função sem argumentos que consulta o banco e retorna
+                      o registro (dict) ou None.
+
+        Returns:
+            dict or None: Uma cópia do registro (pode ser alterada à vontade).
+        """
+        agora = time.monotonic()
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None:
+                if agora - item[0] < self.ttl:
+                    self._itens.move_to_end(chave)
+                    self.acertos += 1
+                    return dict(item[1])
+                del self._itens[chave]
+                self.expirados += 1
+            self.falhas += 1
+            versao = self._versao
+        registro = carregar()  # Fora do lock: consulta o banco
+        if registro is None:
+            return None
+        with self._lock:
+            # Se algo foi invalidado durante a consulta, o registro lido pode
+            # ser anterior à gravação: é entregue, mas não guardado
+            if versao == self._versao and self.max_itens > 0:
+                self._itens[chave] = (agora, dict(registro))
+                self._itens.move_to_end(chave)
+                while len(self._itens) > self.max_itens:
+                    self._itens.popitem(last=False)
+                    self.descartes += 1
+        return dict(registro)
+
+    def invalidar(self, chave):
+        """Descarta o registro da chave (chamado pelos controllers ao gravar ou excluir)."""
+        with self._lock:
+            self._versao += 1
+            self.invalidacoes += 1
+            self._itens.pop(chave, None)
+
+    def invalidar_tipo(self, tipo):
+        """Descarta todos os registros do tipo (ex.: 'pet')."""
+        with self._lock:
+            self._versao += 1
+            self.invalidacoes += 1
+            for chave in [c for c in self._itens if c[0] == tipo]:
+                del self._itens[chave]
+
+    def limpar(self):
+        """Descarta todos os registros (os contadores são mantidos)."""
+        with self._lock:
+            self._versao += 1
+            self._itens.clear()
+
+    def estatisticas(self):
+        """
+        Retorna um dicionário com itens, max_itens, ttl, acertos, falhas,
+        expirados, descartes, invalidacoes e taxa_acertos.
+        """
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "max_itens": self.max_itens,
+                "ttl": self.ttl,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "expirados": self.expirados,
+                "descartes": self.descartes,
+                "invalidacoes": self.invalidacoes,
+                "taxa_acertos": self.acertos / consultas if consultas else 0.0,
+            }
+
+
+cache_entidades = CacheEntidades(obter_configuracao()['cache_entidades_ttl'],
+                                 obter_configuracao()['cache_entidades_itens'])
@@ -1,55 +1,476 @@
 # -*- coding: utf-8 -*-
 # ==============================================================================
 # Nome do Script: conexao_db.py - Gerenciamento de Conexão com o Banco de Dados
-# Descrição: Este script lê as configurações de conexão em arquivo .con e
-#            estabelece a conexão com o banco de dados MySQL.
+# Descrição: Este script usa as configurações de conexão do arquivo .con
+#            (lidas e mantidas em cache por model.configuracao) e mantém um
+#            pool de conexões reutilizáveis com o banco de dados (MySQL ou,
+#            com backend='sqlite', um arquivo SQLite local).
 #
 # Autor: Nome do aluno
-# Data de Criação: 
-# Hora de Criação: 
+# Data de Criação:
+# Hora de Criação:
 #
 # Dependências:
 # - mysql-connector-python: Para conectar ao MySQL.
 # - os: Para manipulação de caminhos de arquivos.
+# - model.configuracao: Para leitura validada e em cache do conexao.con.
+# - model.backend_sqlite: Para o backend SQLite embarcado.
+# - model.instrumentacao: Para medir o desempenho de cada comando SQL.
+# - threading, collections, time: Para o pool de conexões thread-safe.
 #
 # Uso: Tenha o arquivo 'conexao.con' na mesma pasta deste script.
+#      Prefira o gerenciador de contexto conexao():
+#          with conexao() as conn:
+#              cursor = conn.cursor()
+#      Para gravar vários registros com um único commit:
+#          with unidade_de_trabalho():
+#              deletar_aluno("1"); deletar_aluno("2")
+#      Para avisar caches e telas só depois que a gravação valer:
+#          apos_commit(cache_entidades.invalidar, ("aluno", "1"))
 # ==============================================================================
 
-# model/conexao_db.py
-# Conexão com o MySQL lendo as configurações do arquivo conexao.con
-
 # model/conexao_db.py
 import mysql.connector
 import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from model.configuracao import PARAMETROS, carregar_configuracao, obter_configuracao
+from model.backend_sqlite import ERROS_DESCARTE as ERROS_DESCARTE_SQLITE, abrir_conexao_sqlite
+from model.instrumentacao import CursorInstrumentado
+
+# Valores padrão do pool, usados quando o conexao.con não os define
+POOL_TAMANHO_PADRAO = PARAMETROS['pool_tamanho'][1]
+POOL_MAX_OCIOSO_PADRAO = PARAMETROS['pool_max_ocioso'][1]  # segundos parada no pool
+POOL_TIMEOUT_PADRAO = PARAMETROS['pool_timeout'][1]        # segundos de espera por conexão livre
+POOL_VERIFICAR_APOS = 30  # conexões paradas há mais tempo que isso recebem um ping
+
+# Parâmetros que, se alterados no conexao.con, exigem um pool novo
+PARAMETROS_CONEXAO = ('backend', 'sqlite_arquivo', 'host', 'port', 'database', 'user', 'password', 'pool_tamanho',
+                      'pool_max_ocioso', 'pool_timeout', 'connect_timeout',
+                      'read_timeout', 'compressao')
+
+
+class PoolEsgotadoError(Exception):
+    """Nenhuma conexão ficou livre dentro do tempo de espera configurado."""
+
 
 def ler_conexao(arquivo='conexao.con'):
-    """Lê as configurações de conexão a partir do arquivo .con dentro da mesma pasta."""
+    """
+    Retorna as configurações de conexão do arquivo .con dentro da mesma pasta.
+
+    O arquivo padrão é lido uma única vez e mantido em cache (ver
+    model.configuracao); outros arquivos são lidos a cada chamada.
+    """
+    if arquivo == 'conexao.con':
+        return dict(obter_configuracao())
     # Descobre o diretório onde este script (conexao_db.py) está localizado
     pasta_atual = os.path.dirname(__file__)
-    # Junta esse diretório com o nome do arquivo
-    caminho_completo = os.path.join(pasta_atual, arquivo)
+    return carregar_configuracao(os.path.join(pasta_atual, arquivo))
 
-    config = {}
-    with open(caminho_completo, 'r', encoding='utf-8') as f:
-        for linha in f:
-            if '=' in linha:
-                chave, valor = linha.strip().strip(';').split('=')
-                config[chave.strip()] = valor.strip().strip("'")
-    return config
 
-def obter_conexao():
-    """Estabelece a conexão com o banco de dados usando as configurações lidas."""
-    config = ler_conexao()  # por padrão, 'conexao.con'
+def _abrir_conexao_mysql(config, **opcoes):
+    """
+    Abre uma conexão física nova com o MySQL (handshake TCP + autenticação).
+
+    A conexão é aberta em modo autocommit para que as leituras não deixem
+    transações (e snapshots) abertas enquanto a conexão aguarda no pool.
+    Opções extras do mysql-connector (ex.: allow_local_infile) podem ser
+    passadas por palavra-chave.
+    """
     try:
         conn = mysql.connector.connect(
             host=config['host'],
             port=config['port'],
             database=config['database'],
             user=config['user'],
-            password=config['password']
+            password=config['password'],
+            connection_timeout=config['connect_timeout'],
+            read_timeout=config['read_timeout'],
+            compress=config['compressao'],
+            autocommit=True,
+            **opcoes
         )
         return conn
     except mysql.connector.Error as e:
         print(f"Erro de conexão: {e}")
         raise
 
+
+# Funções que abrem uma conexão física para cada backend suportado
+BACKENDS = {
+    'mysql': _abrir_conexao_mysql,
+    'sqlite': abrir_conexao_sqlite,
+}
+
+# Erros que indicam uma conexão falha, em qualquer backend: conexao() a
+# descarta em vez de devolvê-la ao pool
+ERROS_DESCARTE_MYSQL = (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError)
+ERROS_DESCARTE = ERROS_DESCARTE_MYSQL + ERROS_DESCARTE_SQLITE
+
+
+def _abrir_conexao(config):
+    """Abre uma conexão física com o backend escolhido no conexao.con."""
+    try:
+        abrir = BACKENDS[config['backend']]
+    except KeyError:
+        raise ValueError(
+            f"Backend desconhecido no conexao.con: {config['backend']!r} "
+            f"(use um de: {', '.join(BACKENDS)})"
+        ) from None
+    return abrir(config)
+
+
+def backend_atual():
+    """Retorna o nome do backend configurado ('mysql' ou 'sqlite')."""
+    return obter_configuracao()['backend']
+
+
+class ConexaoPool:
+    """
+    Conexão emprestada do pool.
+
+    Repassa todos os atributos para a conexão física (commit, rollback...).
+    Os cursores criados são instrumentados (ver model.instrumentacao) e o
+    close(), em vez de encerrar o socket, devolve a conexão ao pool.
+    """
+
+    def __init__(self, pool, conn_fisica):
+        self._pool = pool
+        self._conn = conn_fisica
+        self.descartar = False  # Marcado quando a conexão não deve voltar ao pool
+        self.em_unidade = False  # True enquanto uma unidade de trabalho usa a conexão
+
+    def __getattr__(self, nome):
+        return getattr(self._conn, nome)
+
+    def commit(self):
+        """
+        Confirma a transação, exceto dentro de uma unidade de trabalho:
+        nesse caso o commit fica para o fim da unidade (ver unidade_de_trabalho()).
+        """
+        if not self.em_unidade:
+            self._conn.commit()
+
+    def cursor(self, *args, **kwargs):
+        """Cria um cursor da conexão física que mede cada comando executado."""
+        return CursorInstrumentado(self._conn.cursor(*args, **kwargs))
+
+    def cursor_preparado(self, sql, dictionary=False):
+        """
+        Retorna o cursor preparado no servidor para o comando 'sql'.
+
+        O comando é preparado (parse + plano) uma única vez por conexão
+        física; enquanto a conexão viver no pool, as próximas chamadas
+        reutilizam o mesmo cursor e enviam apenas os parâmetros. O cursor
+        não deve ser fechado por quem o usa e seu resultado deve ser lido
+        por completo antes da próxima execução.
+        """
+        cache = getattr(self._conn, '_cursores_preparados', None)
+        if cache is None:
+            cache = {}
+            setattr(self._conn, '_cursores_preparados', cache)
+        chave = (sql, dictionary)
+        cursor = cache.get(chave)
+        if cursor is None:
+            cursor = cache[chave] = CursorInstrumentado(
+                self._conn.cursor(prepared=True, dictionary=dictionary)
+            )
+        return cursor
+
+    def descartar_preparado(self, sql, dictionary=False):
+        """Remove do cache um cursor preparado que ficou em estado inválido."""
+        cache = getattr(self._conn, '_cursores_preparados', None) or {}
+        cursor = cache.pop((sql, dictionary), None)
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    def close(self):
+        """Devolve a conexão ao pool (chamadas repetidas são ignoradas)."""
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        self._pool.devolver(conn, descartar=self.descartar)
+
+
+class PoolConexoes:
+    """
+    Pool limitado e thread-safe de conexões com o banco de dados.
+
+    Mantém no máximo 'tamanho' conexões abertas. Conexões devolvidas ficam
+    ociosas numa pilha (a mais recente é reutilizada primeiro) e são
+    descartadas quando passam de 'max_ocioso' segundos paradas. Quando todas
+    estão emprestadas, emprestar() aguarda até 'timeout' segundos.
+
+    Parâmetros:
+        fabrica: Função sem argumentos que abre uma conexão física nova.
+        tamanho (int): Número máximo de conexões abertas ao mesmo tempo.
+        max_ocioso (float): Tempo máximo, em segundos, de uma conexão ociosa.
+        timeout (float): Tempo máximo, em segundos, de espera por uma conexão.
+    """
+
+    def __init__(self, fabrica, tamanho=POOL_TAMANHO_PADRAO,
+                 max_ocioso=POOL_MAX_OCIOSO_PADRAO, timeout=POOL_TIMEOUT_PADRAO):
+        self._fabrica = fabrica
+        self.tamanho = max(1, int(tamanho))
+        self.max_ocioso = float(max_ocioso)
+        self.timeout = float(timeout)
+        self._ociosas = deque()  # Itens (conexao, instante_devolucao)
+        self._abertas = 0
+        self._encerrado = False
+        self._cond = threading.Condition()
+
+    def emprestar(self):
+        """
+        Retira uma conexão do pool, abrindo uma nova se houver vaga.
+
+        Returns:
+            ConexaoPool: Conexão emprestada; chame close() para devolvê-la.
+
+        Raises:
+            PoolEsgotadoError: Se nenhuma conexão ficar livre a tempo.
+        """
+        prazo = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                while self._ociosas:
+                    conn, devolvida = self._ociosas.pop()
+                    parada = time.monotonic() - devolvida
+                    if parada > self.max_ocioso:
+                        self._fechar(conn)
+                        continue
+                    # Só faz ping em conexões paradas há algum tempo, para não
+                    # pagar uma ida ao servidor a cada empréstimo
+                    if parada > POOL_VERIFICAR_APOS and not self._esta_viva(conn):
+                        self._fechar(conn)
+                        continue
+                    return ConexaoPool(self, conn)
+                if self._abertas < self.tamanho:
+                    self._abertas += 1  # Reserva a vaga antes de abrir fora do lock
+                    break
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    raise PoolEsgotadoError(
+                        f"Nenhuma conexão livre após {self.timeout:g}s (pool de {self.tamanho})."
+                    )
+                self._cond.wait(restante)
+
+        try:
+            return ConexaoPool(self, self._fabrica())
+        except Exception:
+            with self._cond:
+                self._abertas -= 1
+                self._cond.notify()
+            raise
+
+    def devolver(self, conn, descartar=False):
+        """
+        Devolve uma conexão física ao pool.
+
+        Transações esquecidas abertas são desfeitas. Conexões marcadas para
+        descarte (ou que falharem ao limpar o estado) são fechadas.
+        """
+        if not descartar:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except Exception:
+                descartar = True
+        with self._cond:
+            if descartar or self._encerrado:
+                self._fechar(conn)
+            else:
+                self._ociosas.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def fechar_todas(self):
+        """
+        Fecha todas as conexões ociosas e encerra o pool.
+
+        Conexões ainda emprestadas são fechadas quando forem devolvidas.
+        """
+        with self._cond:
+            self._encerrado = True
+            while self._ociosas:
+                conn, _ = self._ociosas.pop()
+                self._fechar(conn)
+            self._cond.notify_all()
+
+    def _fechar(self, conn):
+        # Chamado sempre com o lock adquirido
+        self._abertas -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _esta_viva(conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+
+_pool = None
+_pool_config = None
+_pool_lock = threading.Lock()
+_local = threading.local()  # Unidade de trabalho ativa (e ações após o COMMIT) em cada thread
+
+
+def _mesma_conexao(config_a, config_b):
+    return all(config_a.get(p) == config_b.get(p) for p in PARAMETROS_CONEXAO)
+
+
+def obter_pool():
+    """
+    Retorna o pool global, criando-o a partir das configurações em cache.
+
+    Se os parâmetros de conexão mudarem no conexao.con, um pool novo é
+    criado e as conexões ociosas do anterior são fechadas.
+    """
+    global _pool, _pool_config
+    config = obter_configuracao()
+    if _pool is None or (config is not _pool_config and not _mesma_conexao(config, _pool_config)):
+        with _pool_lock:
+            if _pool is None or not _mesma_conexao(config, _pool_config):
+                antigo = _pool
+                _pool = PoolConexoes(
+                    lambda: _abrir_conexao(config),
+                    tamanho=config['pool_tamanho'],
+                    max_ocioso=config['pool_max_ocioso'],
+                    timeout=config['pool_timeout']
+                )
+                if antigo is not None:
+                    antigo.fechar_todas()
+            _pool_config = config
+    return _pool
+
+
+def obter_conexao():
+    """
+    Empresta uma conexão do pool usando as configurações lidas.
+
+    A conexão deve ser devolvida com close(); prefira usar conexao(),
+    que garante a devolução mesmo em caso de erro.
+    """
+    return obter_pool().emprestar()
+
+
+@contextmanager
+def conexao():
+    """
+    Gerenciador de contexto que empresta uma conexão do pool e sempre a devolve.
+
+    Se a conexão falhar (ERROS_DESCARTE: erro de interface ou operacional
+    do MySQL ou do SQLite, como "database is locked"), ela é descartada em
+    vez de voltar ao pool. Dentro de unidade_de_trabalho(),
+    retorna a conexão da unidade, de modo que todas as gravações feitas
+    pelos controllers entram na mesma transação.
+
+    Exemplo:
+        with conexao() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT 1")
+    """
+    atual = getattr(_local, 'unidade', None)
+    if atual is not None:
+        yield atual
+        return
+    conn = obter_conexao()
+    try:
+        yield conn
+    except ERROS_DESCARTE:
+        conn.descartar = True
+        raise
+    finally:
+        conn.close()
+
+
+@contextmanager
+def unidade_de_trabalho():
+    """
+    Agrupa várias gravações dos controllers em uma única transação.
+
+    Todas as chamadas a conexao() feitas na mesma thread dentro do bloco
+    recebem a mesma conexão; os conn.commit() dos controllers são adiados
+    e um único COMMIT é executado ao final. Se qualquer exceção ocorrer,
+    tudo é desfeito com ROLLBACK. Unidades aninhadas participam da externa.
+    As ações registradas com apos_commit() rodam depois do COMMIT da
+    unidade mais externa e são descartadas no ROLLBACK.
+
+    Exemplo:
+        with unidade_de_trabalho():
+            for matricula in matriculas:
+                deletar_aluno(matricula)
+
+    Yields:
+        ConexaoPool: A conexão usada pela unidade.
+    """
+    atual = getattr(_local, 'unidade', None)
+    if atual is not None:
+        yield atual
+        return
+    pendentes = []
+    with conexao() as conn:
+        conn.start_transaction()
+        conn.em_unidade = True
+        _local.unidade = conn
+        _local.apos_commit = pendentes
+        try:
+            yield conn
+            conn.em_unidade = False
+            conn.commit()
+        except BaseException:
+            conn.em_unidade = False
+            conn.rollback()
+            raise
+        finally:
+            _local.unidade = None
+            _local.apos_commit = None
+    # Fora da unidade: as ações podem abrir conexões e transações próprias
+    for funcao, args, kwargs in pendentes:
+        funcao(*args, **kwargs)
+
+
+def apos_commit(funcao, *args, **kwargs):
+    """
+    Executa funcao(*args, **kwargs) quando as gravações em andamento valerem.
+
+    Dentro de unidade_de_trabalho(), a chamada é adiada para depois do
+    COMMIT da unidade mais externa (e descartada se ela terminar em
+    ROLLBACK); fora dela, as gravações já foram confirmadas e a função é
+    chamada na hora. Usada pelos controllers para descartar caches e
+    publicar eventos, para que outra thread não leia e guarde um registro
+    ainda não confirmado.
+    """
+    pendentes = getattr(_local, 'apos_commit', None)
+    if getattr(_local, 'unidade', None) is None or pendentes is None:
+        funcao(*args, **kwargs)
+    else:
+        pendentes.append((funcao, args, kwargs))
+
+
+@contextmanager
+def conexao_dedicada(**opcoes):
+    """
+    Abre uma conexão MySQL exclusiva, fora do pool, com opções especiais.
+
+    Usada por operações raras que precisam de configurações que não devem
+    valer para as conexões compartilhadas (ex.: allow_local_infile=True
+    para LOAD DATA LOCAL INFILE). A conexão é fechada ao sair do bloco.
+    """
+    config = obter_configuracao()
+    if config['backend'] != 'mysql':
+        raise ValueError("Conexões dedicadas só estão disponíveis no backend MySQL.")
+    conn = _abrir_conexao_mysql(config, **opcoes)
+    try:
+        yield conn
+    finally:
+        conn.close()
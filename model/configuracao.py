@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: configuracao.py - Leitura e cache das configurações do sistema
+# Descrição: Este script lê o arquivo conexao.con uma única vez, valida e
+#            converte cada parâmetro para o tipo correto e mantém o resultado
+#            em memória. O arquivo só é relido quando sua data de modificação
+#            muda. Variáveis de ambiente podem sobrescrever qualquer parâmetro.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - os, threading: Para acesso ao arquivo, ao ambiente e controle de concorrência.
+#
+# Uso: from model.configuracao import obter_configuracao
+#      config = obter_configuracao()
+#      config['pool_tamanho']  # -> int
+#
+#      Para sobrescrever um parâmetro pelo ambiente, use o prefixo EXEMPLO_DB_
+#      com o nome do parâmetro em maiúsculas, por exemplo:
+#      EXEMPLO_DB_PASSWORD=segredo  EXEMPLO_DB_POOL_TAMANHO=10
+# ==============================================================================
+
+import os
+import threading
+from types import MappingProxyType
+
+ARQUIVO_PADRAO = os.path.join(os.path.dirname(__file__), 'conexao.con')
+PREFIXO_AMBIENTE = 'EXEMPLO_DB_'
+
+VERDADEIROS = ('1', 'true', 'sim', 's', 'yes', 'on')
+FALSOS = ('0', 'false', 'nao', 'não', 'n', 'no', 'off', '')
+
+
+def _bool(valor):
+    """Converte textos como 'sim', 'true' ou '1' em booleano."""
+    texto = str(valor).strip().lower()
+    if texto in VERDADEIROS:
+        return True
+    if texto in FALSOS:
+        return False
+    raise ValueError(f"valor booleano inválido: {valor!r}")
+
+
+FORMATOS_FOTO = ('jpeg', 'webp')
+
+
+def _formato_foto(valor):
+    """Aceita 'jpeg' (ou 'jpg') e 'webp', o formato em que as fotos são gravadas."""
+    texto = str(valor).strip().lower()
+    texto = 'jpeg' if texto == 'jpg' else texto
+    if texto not in FORMATOS_FOTO:
+        raise ValueError(f"formato de foto inválido: {valor!r} (use jpeg ou webp)")
+    return texto
+
+
+# Parâmetros conhecidos: nome -> (conversor, valor padrão)
+PARAMETROS = {
+    # Conexão ('mysql' ou 'sqlite')
+    'backend': (str, 'mysql'),
+    'sqlite_arquivo': (str, 'exemplo.db'),
+    'host': (str, 'localhost'),
+    'port': (int, 3306),
+    'database': (str, ''),
+    'user': (str, ''),
+    'password': (str, ''),
+    # Pool de conexões
+    'pool_tamanho': (int, 5),
+    'pool_max_ocioso': (float, 300.0),
+    'pool_timeout': (float, 10.0),
+    # Desempenho da conexão
+    'connect_timeout': (int, 10),
+    'read_timeout': (int, 30),
+    'compressao': (_bool, False),
+    'prepared_statements': (_bool, True),
+    # Comandos mais lentos que isso (ms) vão para logs/consultas_lentas.csv (-1 desliga)
+    'consulta_lenta_ms': (float, 200.0),
+    # Tempo de vida (segundos) dos caches em memória
+    'cache_entidades_ttl': (float, 60.0),
+    'cache_navegacao_ttl': (float, 30.0),
+    # Alunos e pets lidos pela chave mantidos em memória pelos controllers
+    'cache_entidades_itens': (int, 500),
+    # Fotos: grava também uma versão média (além da miniatura 120x160)
+    'foto_versao_media': (_bool, True),
+    # Fotos escolhidas nos formulários: lado maior (pixels), formato e qualidade (1-100)
+    'foto_dimensao_maxima': (int, 1600),
+    'foto_formato': (_formato_foto, 'jpeg'),
+    'foto_qualidade': (int, 85),
+    # Memória máxima (MB) das imagens decodificadas mantidas em cache pelas telas
+    'cache_imagens_mb': (float, 64.0),
+}
+
+
+class ConfiguracaoInvalidaError(ValueError):
+    """Um parâmetro do conexao.con (ou do ambiente) tem valor inválido."""
+
+
+def interpretar_linha(linha):
+    """
+    Interpreta uma linha no formato chave='valor'; do arquivo .con.
+
+    Divide apenas no primeiro '=', de modo que senhas contendo '=' ou ';'
+    são preservadas. Linhas vazias e comentários (#) retornam None.
+
+    Returns:
+        tuple or None: (chave, valor) em texto, ou None se a linha não tiver parâmetro.
+    """
+    linha = linha.strip()
+    if not linha or linha.startswith('#') or '=' not in linha:
+        return None
+    chave, _, valor = linha.partition('=')
+    valor = valor.strip()
+    if valor.endswith(';'):
+        valor = valor[:-1].rstrip()
+    # Remove um único par de aspas ao redor do valor
+    if len(valor) >= 2 and valor[0] == valor[-1] and valor[0] in ("'", '"'):
+        valor = valor[1:-1]
+    return chave.strip(), valor
+
+
+def _converter(chave, valor):
+    if chave not in PARAMETROS:
+        return valor  # Parâmetros desconhecidos são mantidos como texto
+    conversor = PARAMETROS[chave][0]
+    try:
+        return conversor(valor)
+    except (TypeError, ValueError) as e:
+        raise ConfiguracaoInvalidaError(f"Parâmetro '{chave}' inválido no conexao.con: {e}") from e
+
+
+def carregar_configuracao(caminho=ARQUIVO_PADRAO, ambiente=None):
+    """
+    Lê, valida e converte as configurações do arquivo e do ambiente.
+
+    A ordem de precedência é: variável de ambiente > arquivo > valor padrão.
+
+    Args:
+        caminho (str): Caminho do arquivo .con.
+        ambiente (dict): Variáveis de ambiente (padrão: os.environ).
+
+    Returns:
+        dict: Parâmetros já convertidos para seus tipos.
+
+    Raises:
+        ConfiguracaoInvalidaError: Se algum parâmetro não puder ser convertido.
+    """
+    ambiente = os.environ if ambiente is None else ambiente
+    brutos = {}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for linha in f:
+            par = interpretar_linha(linha)
+            if par:
+                brutos[par[0]] = par[1]
+
+    for nome, valor in ambiente.items():
+        if nome.startswith(PREFIXO_AMBIENTE):
+            brutos[nome[len(PREFIXO_AMBIENTE):].lower()] = valor
+
+    config = {chave: padrao for chave, (_, padrao) in PARAMETROS.items()}
+    for chave, valor in brutos.items():
+        config[chave] = _converter(chave, valor)
+    return config
+
+
+class _CacheConfiguracao:
+    """Guarda a última configuração lida e a data de modificação do arquivo."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._mtime = None
+        self._config = None
+        self._lock = threading.Lock()
+
+    def obter(self):
+        mtime = os.stat(self.caminho).st_mtime_ns
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._config = MappingProxyType(carregar_configuracao(self.caminho))
+                    self._mtime = mtime
+        return self._config
+
+    def invalidar(self):
+        with self._lock:
+            self._mtime = None
+
+
+_cache = _CacheConfiguracao(ARQUIVO_PADRAO)
+
+
+def obter_configuracao():
+    """
+    Retorna as configurações em cache, relendo o arquivo só se ele mudou.
+
+    Returns:
+        Mapping: Parâmetros somente leitura (a mesma instância enquanto o
+                 arquivo não for alterado).
+    """
+    return _cache.obter()
+
+
+def recarregar_configuracao():
+    """Força a releitura do arquivo e do ambiente e retorna o resultado."""
+    _cache.invalidar()
+    return _cache.obter()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: eventos.py - Avisos entre as camadas do sistema
+# Descrição: Este script permite que os controllers avisem que algo mudou no
+#            banco (ex.: a foto de um aluno foi trocada) sem conhecer quem
+#            precisa saber disso, como os caches em memória das views. Quem se
+#            interessa assina o evento; o controller apenas o publica.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - threading: Biblioteca padrão.
+# - logger: Para registro de erros dos assinantes.
+#
+# Uso: assinar(FOTO_ALTERADA, funcao)          # funcao(**dados)
+#      publicar(FOTO_ALTERADA, entidade="aluno", chave="2024001",
+#               hash_anterior="...", hash_novo="...")
+# ==============================================================================
+
+# model/eventos.py
+# Publicação e assinatura de eventos
+
+import threading
+
+from logger import log_event
+
+# Foto de um registro gravada, trocada ou removida. Dados: entidade ('aluno'
+# ou 'pet'), chave, hash_anterior e hash_novo (None quando não há foto).
+FOTO_ALTERADA = "foto_alterada"
+
+_assinantes = {}
+_lock = threading.Lock()
+
+
+def assinar(evento, funcao):
+    """Registra 'funcao' para ser chamada, com os dados por palavra-chave, a cada publicação."""
+    with _lock:
+        _assinantes.setdefault(evento, []).append(funcao)
+
+
+def cancelar_assinatura(evento, funcao):
+    """Remove uma assinatura feita com assinar() (ignora se não existir)."""
+    with _lock:
+        if funcao in _assinantes.get(evento, []):
+            _assinantes[evento].remove(funcao)
+
+
+def publicar(evento, **dados):
+    """
+    Chama os assinantes do evento na thread atual.
+
+    O erro de um assinante é registrado no log e não impede os demais nem
+    desfaz a operação que publicou o evento.
+    """
+    with _lock:
+        assinantes = list(_assinantes.get(evento, []))
+    for funcao in assinantes:
+        try:
+            funcao(**dados)
+        except Exception as e:
+            log_event("eventos", f"ERRO assinante de {evento}: {e}")
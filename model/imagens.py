@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: imagens.py - Preparação e versões reduzidas das fotos
+# Descrição: Este script prepara o arquivo escolhido pelo usuário antes de
+#            gravá-lo (gira conforme a orientação EXIF, remove os metadados,
+#            limita a resolução e recodifica em JPEG ou WebP) e gera, a partir
+#            dele, as versões gravadas junto na tabela 'midias': a miniatura
+#            de 120x160 exibida nos formulários e uma versão média. Assim a
+#            foto original (muitas vezes com vários megapixels) não precisa
+#            ser lida e redimensionada a cada abertura de um formulário.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - PIL (Pillow): Para decodificar, redimensionar e codificar as imagens.
+# - io: Biblioteca padrão.
+#
+# Uso: conteudo, relatorio = normalizar_foto(arquivo, 1600, "jpeg", 85)
+#      miniatura, media = gerar_variantes(conteudo)
+# ==============================================================================
+
+# model/imagens.py
+# Miniatura e versão média das fotos
+
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+TAMANHO_MINIATURA = (120, 160)  # Foto 3×4 exibida nos formulários
+TAMANHO_MEDIO = (480, 640)      # Limite da versão média (mantém a proporção)
+QUALIDADE_JPEG = 85
+COR_FUNDO = (255, 255, 255)     # Substitui a transparência nas fotos em JPEG
+
+
+def _sem_transparencia(img):
+    if img.mode in ("RGB", "L"):
+        return img
+    if img.mode in ("RGBA", "LA", "P") and ("A" in img.getbands() or "transparency" in img.info):
+        img = img.convert("RGBA")
+        fundo = Image.new("RGB", img.size, COR_FUNDO)
+        fundo.paste(img, mask=img.getchannel("A"))
+        return fundo
+    return img.convert("RGB")  # JPEG não tem transparência
+
+
+def _codificar_jpeg(img, qualidade=QUALIDADE_JPEG):
+    saida = BytesIO()
+    # Sem exif= nem icc_profile=, nenhum metadado do arquivo de origem é gravado
+    _sem_transparencia(img).save(saida, format="JPEG", quality=qualidade, optimize=True, progressive=True)
+    return saida.getvalue()
+
+
+def _codificar_webp(img, qualidade):
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+    saida = BytesIO()
+    img.save(saida, format="WEBP", quality=qualidade, method=6)
+    return saida.getvalue()
+
+
+def normalizar_foto(conteudo, dimensao_maxima=1600, formato="jpeg", qualidade=QUALIDADE_JPEG):
+    """
+    Prepara uma foto escolhida pelo usuário para ser gravada.
+
+    A imagem é girada conforme a orientação EXIF da câmera, reduzida (com a
+    proporção original) para que o lado maior tenha no máximo
+    'dimensao_maxima' pixels e recodificada em 'formato' sem os metadados
+    (EXIF, GPS, perfil de cor). Se a foto já estiver no formato pedido, sem
+    metadados, dentro do limite e a recodificação a deixar maior, o arquivo
+    original é mantido.
+
+    Args:
+        conteudo (bytes): Arquivo escolhido (JPEG, PNG, ...).
+        dimensao_maxima (int): Maior largura ou altura permitida, em pixels.
+        formato (str): 'jpeg' ou 'webp'.
+        qualidade (int): Qualidade da compressão, de 1 a 100.
+
+    Returns:
+        tuple: (bytes, relatorio), em que relatorio é um dicionário com
+               bytes_originais, bytes_finais, bytes_economizados, tamanho
+               (largura, altura) e formato.
+
+    Raises:
+        OSError: Se o conteúdo não for uma imagem válida.
+    """
+    qualidade = min(100, max(1, int(qualidade)))
+    limite = (dimensao_maxima, dimensao_maxima)
+    with Image.open(BytesIO(conteudo)) as original:
+        formato_original = (original.format or "").lower()
+        tamanho_original = original.size
+        com_metadados = any(chave in original.info for chave in ("exif", "icc_profile", "xmp", "comment"))
+        original.draft("RGB", limite)  # JPEG: decodifica já reduzido, se couber
+        img = ImageOps.exif_transpose(original)
+        img.load()
+    if img.width > dimensao_maxima or img.height > dimensao_maxima:
+        img.thumbnail(limite, Image.LANCZOS)
+    reduzida = img.size != tamanho_original
+
+    if formato == "webp":
+        final = _codificar_webp(img, qualidade)
+    else:
+        final = _codificar_jpeg(img, qualidade)
+    if (formato_original == formato and not com_metadados and not reduzida
+            and len(final) >= len(conteudo)):
+        final = conteudo  # Já estava otimizada: recodificar só perderia qualidade
+
+    relatorio = {
+        "bytes_originais": len(conteudo),
+        "bytes_finais": len(final),
+        "bytes_economizados": len(conteudo) - len(final),
+        "tamanho": img.size,
+        "formato": formato,
+    }
+    return final, relatorio
+
+
+def gerar_miniatura(conteudo, tamanho=TAMANHO_MINIATURA):
+    """
+    Retorna a miniatura (JPEG) da foto, no mesmo tamanho usado pelos
+    formulários para exibi-la.
+    """
+    with Image.open(BytesIO(conteudo)) as img:
+        img.draft("RGB", tamanho)  # JPEG: decodifica já reduzido, bem mais rápido
+        return _codificar_jpeg(img.resize(tamanho, Image.LANCZOS))
+
+
+def gerar_media(conteudo, tamanho=TAMANHO_MEDIO):
+    """
+    Retorna a versão média (JPEG) da foto, limitada a 'tamanho' e com a
+    proporção original, ou None se a foto já for desse tamanho ou menor
+    (a original serve como versão média).
+    """
+    with Image.open(BytesIO(conteudo)) as img:
+        if img.width <= tamanho[0] and img.height <= tamanho[1]:
+            return None
+        img.draft("RGB", tamanho)
+        img.thumbnail(tamanho, Image.LANCZOS)
+        return _codificar_jpeg(img)
+
+
+def gerar_variantes(conteudo, com_media=True):
+    """
+    Gera as versões reduzidas de uma foto.
+
+    Args:
+        conteudo (bytes): Arquivo original da foto.
+        com_media (bool): Se False, gera apenas a miniatura.
+
+    Returns:
+        tuple: (miniatura, media) em JPEG; media é None quando não gerada.
+
+    Raises:
+        OSError: Se o conteúdo não for uma imagem válida.
+    """
+    miniatura = gerar_miniatura(conteudo)
+    media = gerar_media(conteudo) if com_media else None
+    return miniatura, media
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: instrumentacao.py - Medição de desempenho das consultas SQL
+# Descrição: Este script envolve os cursores entregues pelo pool de conexões e
+#            mede cada comando executado: texto SQL (sem valores), tempo total,
+#            linhas retornadas e bytes lidos. Mantém em memória um histograma
+#            de latência por comando (p50/p95/p99) e grava os comandos mais
+#            lentos que o limite configurado em logs/consultas_lentas.csv.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - os, re, math, time, threading, datetime: Biblioteca padrão.
+# - model.configuracao: Para o limite de consulta lenta (consulta_lenta_ms).
+#
+# Uso: A instrumentação é automática para todo cursor obtido por conexao().
+#      Para consultar as estatísticas:
+#          from model.instrumentacao import obter_estatisticas
+#          for linha in obter_estatisticas(): print(linha)
+#      Ou, pela interface, menu 'Ferramentas' > 'Estatísticas de Consultas'.
+# ==============================================================================
+
+import datetime
+import math
+import os
+import re
+import threading
+import time
+
+from model.configuracao import obter_configuracao
+
+ARQUIVO_CONSULTAS_LENTAS = os.path.join(os.getcwd(), "logs", "consultas_lentas.csv")
+
+# Literais de texto e números são trocados por '?' para que comandos iguais
+# com valores diferentes sejam agrupados e nenhum dado seja registrado
+_LITERAL_TEXTO = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_LITERAL_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_ESPACOS = re.compile(r"\s+")
+
+
+def normalizar_sql(sql):
+    """
+    Remove valores literais e espaços extras do comando SQL.
+
+    Os parâmetros passados separadamente (%s) nunca aparecem no texto;
+    literais escritos diretamente no SQL são substituídos por '?'.
+    """
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    sql = _LITERAL_TEXTO.sub("?", sql)
+    sql = _LITERAL_NUMERO.sub("?", sql)
+    return _ESPACOS.sub(" ", sql).strip()
+
+
+def _tamanho_valor(valor):
+    """Estimativa do tamanho em bytes de um valor retornado pelo banco."""
+    if valor is None:
+        return 0
+    if isinstance(valor, (bytes, bytearray, memoryview)):
+        return len(valor)
+    if isinstance(valor, str):
+        return len(valor.encode("utf-8"))
+    return 8  # números e datas
+
+
+def tamanho_linha(linha):
+    """Estimativa do tamanho em bytes de uma linha (tupla ou dicionário)."""
+    if linha is None:
+        return 0
+    valores = linha.values() if isinstance(linha, dict) else linha
+    return sum(_tamanho_valor(v) for v in valores)
+
+
+class Histograma:
+    """
+    Histograma de latências com faixas em progressão geométrica.
+
+    Cada faixa é 10% maior que a anterior, então os percentis têm erro
+    máximo de 10% usando memória fixa, sem guardar cada medição.
+    """
+
+    MINIMO_MS = 0.01
+    FATOR = 1.1
+
+    def __init__(self):
+        self.faixas = {}
+        self.total = 0
+        self.soma_ms = 0.0
+        self.maximo_ms = 0.0
+
+    def registrar(self, ms):
+        indice = 0 if ms <= self.MINIMO_MS else int(math.log(ms / self.MINIMO_MS, self.FATOR)) + 1
+        self.faixas[indice] = self.faixas.get(indice, 0) + 1
+        self.total += 1
+        self.soma_ms += ms
+        self.maximo_ms = max(self.maximo_ms, ms)
+
+    def percentil(self, p):
+        """Retorna o limite superior (ms) da faixa que contém o percentil p (0-100)."""
+        if not self.total:
+            return 0.0
+        alvo = math.ceil(self.total * p / 100)
+        acumulado = 0
+        for indice in sorted(self.faixas):
+            acumulado += self.faixas[indice]
+            if acumulado >= alvo:
+                return min(self.MINIMO_MS * self.FATOR ** indice, self.maximo_ms)
+        return self.maximo_ms
+
+
+class EstatisticaComando:
+    """Totais acumulados de um comando SQL normalizado."""
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.histograma = Histograma()
+        self.linhas = 0
+        self.bytes = 0
+
+    def como_dict(self):
+        h = self.histograma
+        return {
+            "sql": self.sql,
+            "execucoes": h.total,
+            "media_ms": h.soma_ms / h.total if h.total else 0.0,
+            "p50_ms": h.percentil(50),
+            "p95_ms": h.percentil(95),
+            "p99_ms": h.percentil(99),
+            "max_ms": h.maximo_ms,
+            "linhas": self.linhas,
+            "bytes": self.bytes,
+        }
+
+
+class RegistroConsultas:
+    """Armazena, de forma thread-safe, as estatísticas de todos os comandos."""
+
+    def __init__(self, arquivo_lentas=ARQUIVO_CONSULTAS_LENTAS):
+        self.arquivo_lentas = arquivo_lentas
+        self._comandos = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, sql, ms, linhas, nbytes):
+        """
+        Registra uma execução e grava no log de lentas se passar do limite.
+
+        Args:
+            sql (str): Comando já normalizado.
+            ms (float): Tempo total (execução + leitura) em milissegundos.
+            linhas (int): Linhas retornadas (ou afetadas, em comandos de escrita).
+            nbytes (int): Bytes lidos do banco (estimativa).
+        """
+        with self._lock:
+            estat = self._comandos.get(sql)
+            if estat is None:
+                estat = self._comandos[sql] = EstatisticaComando(sql)
+            estat.histograma.registrar(ms)
+            estat.linhas += linhas
+            estat.bytes += nbytes
+        limite = obter_configuracao()["consulta_lenta_ms"]
+        if limite >= 0 and ms >= limite:
+            self._gravar_lenta(sql, ms, linhas, nbytes)
+
+    def _gravar_lenta(self, sql, ms, linhas, nbytes):
+        agora = datetime.datetime.now()
+        linha = (f"{agora:%Y-%m-%d};{agora:%H:%M:%S};{ms:.2f};{linhas};{nbytes};"
+                 f"{sql.replace(';', ',')}\n")
+        try:
+            os.makedirs(os.path.dirname(self.arquivo_lentas), exist_ok=True)
+            with open(self.arquivo_lentas, "a", encoding="utf-8") as f:
+                f.write(linha)
+        except OSError:
+            pass  # A medição nunca deve derrubar uma consulta
+
+    def estatisticas(self):
+        """Retorna a lista de estatísticas, da maior para a menor latência p95."""
+        with self._lock:
+            dados = [e.como_dict() for e in self._comandos.values()]
+        return sorted(dados, key=lambda d: d["p95_ms"], reverse=True)
+
+    def zerar(self):
+        with self._lock:
+            self._comandos.clear()
+
+
+registro = RegistroConsultas()
+
+
+class CursorInstrumentado:
+    """
+    Cursor que mede o tempo e o volume de cada comando executado.
+
+    A medição de um comando começa no execute() e termina no próximo
+    execute() ou no close(), somando o tempo gasto lendo as linhas.
+    Todos os demais atributos são repassados ao cursor original.
+    """
+
+    def __init__(self, cursor, registro_consultas=None):
+        self._cursor = cursor
+        self._registro = registro_consultas or registro
+        self._sql = None
+        self._ms = 0.0
+        self._linhas = 0
+        self._bytes = 0
+
+    def __getattr__(self, nome):
+        return getattr(self._cursor, nome)
+
+    def __iter__(self):
+        while True:
+            linha = self.fetchone()
+            if linha is None:
+                return
+            yield linha
+
+    def _medir(self, funcao, *args):
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args)
+        finally:
+            self._ms += (time.perf_counter() - inicio) * 1000
+
+    def _iniciar(self, sql):
+        self._finalizar()
+        self._sql = normalizar_sql(sql)
+
+    def _finalizar(self):
+        if self._sql is None:
+            return
+        linhas = self._linhas
+        if not linhas:
+            # Comandos de escrita: conta as linhas afetadas
+            try:
+                linhas = max(self._cursor.rowcount or 0, 0)
+            except Exception:
+                linhas = 0
+        self._registro.registrar(self._sql, self._ms, linhas, self._bytes)
+        self._sql, self._ms, self._linhas, self._bytes = None, 0.0, 0, 0
+
+    def execute(self, sql, params=(), *args, **kwargs):
+        self._iniciar(sql)
+        return self._medir(lambda: self._cursor.execute(sql, params, *args, **kwargs))
+
+    def executemany(self, sql, lista_params, *args, **kwargs):
+        self._iniciar(sql)
+        return self._medir(lambda: self._cursor.executemany(sql, lista_params, *args, **kwargs))
+
+    def fetchone(self):
+        linha = self._medir(self._cursor.fetchone)
+        if linha is not None:
+            self._linhas += 1
+            self._bytes += tamanho_linha(linha)
+        return linha
+
+    def fetchmany(self, size=1):
+        linhas = self._medir(self._cursor.fetchmany, size)
+        self._linhas += len(linhas)
+        self._bytes += sum(tamanho_linha(l) for l in linhas)
+        return linhas
+
+    def fetchall(self):
+        linhas = self._medir(self._cursor.fetchall)
+        self._linhas += len(linhas)
+        self._bytes += sum(tamanho_linha(l) for l in linhas)
+        return linhas
+
+    def concluir(self):
+        """Encerra a medição do comando atual sem fechar o cursor (cursores reutilizados)."""
+        self._finalizar()
+
+    def close(self):
+        self._finalizar()
+        return self._cursor.close()
+
+
+def obter_estatisticas():
+    """
+    Retorna as estatísticas de todos os comandos executados neste processo.
+
+    Returns:
+        list[dict]: Um dicionário por comando com as chaves: sql, execucoes,
+                    media_ms, p50_ms, p95_ms, p99_ms, max_ms, linhas e bytes.
+    """
+    return registro.estatisticas()
+
+
+def zerar_estatisticas():
+    """Descarta todas as estatísticas acumuladas."""
+    registro.zerar()
+
+
+def formatar_estatisticas(estatisticas=None):
+    """Formata as estatísticas como uma tabela de texto (para console ou log)."""
+    estatisticas = obter_estatisticas() if estatisticas is None else estatisticas
+    linhas = [f"{'exec':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'linhas':>8} {'bytes':>10}  sql"]
+    for e in estatisticas:
+        linhas.append(
+            f"{e['execucoes']:>6} {e['p50_ms']:>9.2f} {e['p95_ms']:>9.2f} {e['p99_ms']:>9.2f} "
+            f"{e['max_ms']:>9.2f} {e['linhas']:>8} {e['bytes']:>10}  {e['sql']}"
+        )
+    return "\n".join(linhas)
@@ -0,0 +1,541 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: migracoes.py - Conversão de bancos criados por versões anteriores
+# Descrição: Este script converte os dados de um banco existente para a
+#            estrutura atual das tabelas. Cada migração pode ser executada
+#            mais de uma vez (o que já foi convertido é ignorado) e grava em
+#            lotes, cada um com o seu COMMIT, de modo que uma execução
+#            interrompida continua de onde parou.
+#
+#            fotos: move as fotos das colunas LONGBLOB alunos.foto e pets.foto
+#                   para a tabela 'midias' (uma cópia por conteúdo, pelo
+#                   SHA-256) e grava a referência na coluna foto_hash.
+#            miniaturas: gera a miniatura 120x160 e a versão média das fotos
+#                   gravadas antes delas existirem, em vários processos.
+#            cpf_pets: troca pets.cpf de int para varchar(11), como alunos.cpf,
+#                   devolve os zeros à esquerda perdidos e cria o índice
+#                   único de alunos.cpf e a chave estrangeira entre as tabelas.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - argparse, hashlib, re, time: Biblioteca padrão.
+# - concurrent.futures: Para gerar as miniaturas em paralelo.
+# - model.conexao_db: Para obter conexões do pool e saber o backend (MySQL/SQLite).
+# - model.configuracao: Para a opção foto_versao_media.
+# - model.imagens: Para gerar a miniatura e a versão média.
+# - model.repositorios: Para gravar as fotos na tabela 'midias'.
+# - logger: Para registro de eventos do sistema.
+#
+# Uso: A partir da raiz do projeto, com o conexao.con configurado:
+#      $ python -m model.migracoes fotos
+#      $ python -m model.migracoes fotos --lote 20 --remover-coluna
+#      $ python -m model.migracoes miniaturas --processos 4
+#      $ python -m model.migracoes cpf_pets --verificar
+#      $ python -m model.migracoes cpf_pets --anular-orfaos
+# ==============================================================================
+
+# model/migracoes.py
+# Migrações de dados entre versões do banco
+
+import argparse
+import hashlib
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from model.configuracao import obter_configuracao
+from model.conexao_db import backend_atual, conexao, unidade_de_trabalho
+from model.imagens import gerar_variantes
+from model.repositorios import MidiaRepository
+from logger import log_event
+
+TAMANHO_LOTE_PADRAO = 50  # Fotos por lote (cada uma pode ter vários MB)
+
+# Tabelas com foto: (tabela, chave primária, índice da coluna foto_hash)
+TABELAS_COM_FOTO = (
+    ("alunos", "matricula", "idx_alunos_foto_hash"),
+    ("pets", "Id", "idx_pets_foto_hash"),
+)
+
+TAMANHO_LOTE_CPF = 1000  # Pets por lote na conversão do CPF (linhas pequenas)
+MAX_EXEMPLOS_CPF = 20    # Pets sem dono e CPFs repetidos listados no resultado
+
+# pets.cpf como em pets.sql / sqlite_schema.sql (mesmo tipo e collation de alunos.cpf)
+SQL_CPF_PETS_MYSQL = "ALTER TABLE pets MODIFY cpf varchar(11) COLLATE utf8mb4_general_ci DEFAULT NULL"
+SQL_FK_CPF_PETS_MYSQL = ("ALTER TABLE pets ADD CONSTRAINT fk_pets_alunos_cpf FOREIGN KEY (cpf) "
+                         "REFERENCES alunos (cpf) ON DELETE SET NULL ON UPDATE CASCADE")
+DEFINICAO_CPF_PETS_SQLITE = ("cpf varchar(11) DEFAULT NULL COLLATE NOCASE "
+                             "REFERENCES alunos (cpf) ON DELETE SET NULL ON UPDATE CASCADE")
+
+SQL_CRIAR_MIDIAS = ("CREATE TABLE IF NOT EXISTS midias (hash char(64) NOT NULL, tamanho int NOT NULL, "
+                    "conteudo longblob NOT NULL, miniatura longblob, media longblob, PRIMARY KEY (hash))")
+
+
+def colunas_da_tabela(conn, tabela):
+    """Retorna os nomes das colunas de 'tabela' (funciona no MySQL e no SQLite)."""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT * FROM {tabela} LIMIT 0")
+    cursor.fetchall()
+    colunas = cursor.column_names
+    cursor.close()
+    return colunas
+
+
+def _executar(conn, sql):
+    cursor = conn.cursor()
+    cursor.execute(sql)
+    cursor.close()
+
+
+def _preparar_estrutura_fotos(conn):
+    """Cria a tabela 'midias' e as colunas foto_hash (com índice) que faltarem."""
+    _preparar_estrutura_miniaturas(conn)
+    for tabela, _, indice in TABELAS_COM_FOTO:
+        if "foto_hash" not in colunas_da_tabela(conn, tabela):
+            log_event("migracoes", f"fotos: criando {tabela}.foto_hash")
+            _executar(conn, f"ALTER TABLE {tabela} ADD COLUMN foto_hash char(64) DEFAULT NULL")
+            _executar(conn, f"CREATE INDEX {indice} ON {tabela} (foto_hash)")
+
+
+def _mover_lote(tabela, chave, ultima, tamanho_lote):
+    """
+    Move as fotos do próximo lote (chaves maiores que 'ultima') e retorna
+    (quantidade, bytes, última chave), em uma transação.
+    """
+    with unidade_de_trabalho() as conn:
+        cursor = conn.cursor()
+        filtro = "foto IS NOT NULL" if ultima is None else f"foto IS NOT NULL AND {chave} > %s"
+        cursor.execute(
+            f"SELECT {chave}, foto FROM {tabela} WHERE {filtro} ORDER BY {chave} LIMIT %s",
+            (tamanho_lote,) if ultima is None else (ultima, tamanho_lote)
+        )
+        linhas = cursor.fetchall()
+        cursor.close()
+
+        midias = MidiaRepository(conn)
+        total_bytes = 0
+        for valor_chave, foto in linhas:
+            foto = bytes(foto)
+            hash_midia = hashlib.sha256(foto).hexdigest()
+            if not midias.existe(hash_midia):
+                midias.inserir(hash_midia, foto)
+            cursor = conn.cursor()
+            cursor.execute(f"UPDATE {tabela} SET foto_hash = %s, foto = NULL WHERE {chave} = %s",
+                           (hash_midia, valor_chave))
+            cursor.close()
+            total_bytes += len(foto)
+    return len(linhas), total_bytes, (linhas[-1][0] if linhas else ultima)
+
+
+def migrar_fotos(tamanho_lote=TAMANHO_LOTE_PADRAO, remover_coluna=False, ao_progresso=None):
+    """
+    Move as fotos guardadas nas colunas 'foto' de alunos e pets para a
+    tabela 'midias', deixando nos registros apenas o hash (foto_hash).
+
+    Registros já convertidos ficam com foto NULL e não são lidos de novo.
+    Fotos idênticas são gravadas uma única vez. As miniaturas não são
+    geradas aqui: rode gerar_miniaturas() em seguida.
+
+    Args:
+        tamanho_lote (int): Fotos movidas por transação.
+        remover_coluna (bool): Ao final, apaga as colunas 'foto' (já vazias).
+        ao_progresso: Callback(tabela, movidas) chamado após cada lote.
+
+    Returns:
+        dict: Chaves alunos e pets (fotos movidas), bytes e segundos.
+    """
+    log_event("migracoes", "migrar_fotos")
+    inicio = time.perf_counter()
+    resultado = {"alunos": 0, "pets": 0, "bytes": 0}
+    with conexao() as conn:
+        _preparar_estrutura_fotos(conn)
+
+    for tabela, chave, _ in TABELAS_COM_FOTO:
+        with conexao() as conn:
+            if "foto" not in colunas_da_tabela(conn, tabela):
+                continue  # Banco criado já sem a coluna antiga
+        ultima = None
+        while True:
+            quantidade, total_bytes, ultima = _mover_lote(tabela, chave, ultima, max(1, int(tamanho_lote)))
+            if not quantidade:
+                break
+            resultado[tabela] += quantidade
+            resultado["bytes"] += total_bytes
+            if ao_progresso:
+                ao_progresso(tabela, resultado[tabela])
+        if remover_coluna:
+            with conexao() as conn:
+                _executar(conn, f"ALTER TABLE {tabela} DROP COLUMN foto")
+
+    resultado["segundos"] = time.perf_counter() - inicio
+    log_event("migracoes", f"migrar_fotos: {resultado['alunos']} alunos, {resultado['pets']} pets, "
+                           f"{resultado['bytes']} bytes")
+    return resultado
+
+
+def _preparar_estrutura_miniaturas(conn):
+    """Cria as colunas miniatura e media em tabelas 'midias' anteriores a elas."""
+    _executar(conn, SQL_CRIAR_MIDIAS)
+    colunas = colunas_da_tabela(conn, "midias")
+    for coluna in ("miniatura", "media"):
+        if coluna not in colunas:
+            log_event("migracoes", f"miniaturas: criando midias.{coluna}")
+            _executar(conn, f"ALTER TABLE midias ADD COLUMN {coluna} longblob")
+
+
+def _gerar_variantes_seguro(conteudo, com_media):
+    # Roda nos processos auxiliares; uma foto inválida não interrompe o lote
+    try:
+        return gerar_variantes(conteudo, com_media)
+    except Exception:
+        return None
+
+
+def gerar_miniaturas(tamanho_lote=TAMANHO_LOTE_PADRAO, processos=None, ao_progresso=None):
+    """
+    Gera a miniatura e a versão média das fotos que ainda não as têm.
+
+    As fotos são lidas em lotes (na ordem do hash, continuando do último
+    lido); a decodificação e o redimensionamento de cada lote são
+    distribuídos entre 'processos' processos, e o resultado é gravado em
+    uma transação por lote.
+
+    Args:
+        tamanho_lote (int): Fotos lidas e gravadas por vez.
+        processos (int): Processos de trabalho (padrão: um por núcleo).
+        ao_progresso: Callback(geradas, falhas) chamado após cada lote.
+
+    Returns:
+        dict: Chaves geradas, falhas (conteúdo que não é imagem válida) e segundos.
+    """
+    log_event("migracoes", "gerar_miniaturas")
+    inicio = time.perf_counter()
+    resultado = {"geradas": 0, "falhas": 0}
+    com_media = obter_configuracao()['foto_versao_media']
+    tamanho_lote = max(1, int(tamanho_lote))
+    with conexao() as conn:
+        _preparar_estrutura_miniaturas(conn)
+
+    ultimo = ""
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        while True:
+            with conexao() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT hash, conteudo FROM midias WHERE miniatura IS NULL AND hash > %s "
+                    "ORDER BY hash LIMIT %s", (ultimo, tamanho_lote)
+                )
+                lote = cursor.fetchall()
+                cursor.close()
+            if not lote:
+                break
+            ultimo = lote[-1][0]
+            variantes = executor.map(_gerar_variantes_seguro, [bytes(c) for _, c in lote],
+                                     [com_media] * len(lote))
+            with unidade_de_trabalho() as conn:
+                midias = MidiaRepository(conn)
+                for (hash_midia, _), gerado in zip(lote, variantes):
+                    if gerado is None:
+                        resultado["falhas"] += 1
+                        continue
+                    midias.gravar_variantes(hash_midia, *gerado)
+                    resultado["geradas"] += 1
+            if ao_progresso:
+                ao_progresso(resultado["geradas"], resultado["falhas"])
+
+    resultado["segundos"] = time.perf_counter() - inicio
+    log_event("migracoes", f"gerar_miniaturas: {resultado['geradas']} geradas, "
+                           f"{resultado['falhas']} falhas")
+    return resultado
+
+
+def _consultar(conn, sql, params=()):
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    linhas = cursor.fetchall()
+    cursor.close()
+    return linhas
+
+
+def _cpf_pets_eh_texto(conn):
+    """Retorna True se pets.cpf já for varchar (e não int)."""
+    if backend_atual() == "sqlite":
+        tipo = next(linha[2] for linha in _consultar(conn, "PRAGMA table_info(pets)") if linha[1] == "cpf")
+    else:
+        tipo = _consultar(conn, "SELECT DATA_TYPE FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = "
+                                "DATABASE() AND TABLE_NAME = 'pets' AND COLUMN_NAME = 'cpf'")[0][0]
+    return "char" in str(tipo).lower()
+
+
+def _cpf_alunos_unico(conn):
+    """Retorna True se alunos.cpf tiver um índice único só dele (exigido pela chave estrangeira)."""
+    if backend_atual() == "sqlite":
+        for indice in _consultar(conn, "PRAGMA index_list(alunos)"):
+            if indice[2] and [c[2] for c in _consultar(conn, f"PRAGMA index_info('{indice[1]}')")] == ["cpf"]:
+                return True
+        return False
+    return bool(_consultar(conn, "SELECT INDEX_NAME FROM information_schema.STATISTICS "
+                                 "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'alunos' AND NON_UNIQUE = 0 "
+                                 "GROUP BY INDEX_NAME HAVING GROUP_CONCAT(COLUMN_NAME) = 'cpf'"))
+
+
+def _fk_cpf_pets_existe(conn):
+    if backend_atual() == "sqlite":
+        return any(linha[2] == "alunos" and linha[3] == "cpf"
+                   for linha in _consultar(conn, "PRAGMA foreign_key_list(pets)"))
+    return bool(_consultar(conn, "SELECT 1 FROM information_schema.KEY_COLUMN_USAGE WHERE TABLE_SCHEMA = "
+                                 "DATABASE() AND TABLE_NAME = 'pets' AND COLUMN_NAME = 'cpf' "
+                                 "AND REFERENCED_TABLE_NAME = 'alunos'"))
+
+
+def _indice_existe(conn, tabela, indice):
+    if backend_atual() == "sqlite":
+        return any(linha[1] == indice for linha in _consultar(conn, f"PRAGMA index_list({tabela})"))
+    return bool(_consultar(conn, "SELECT 1 FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = "
+                                 "DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s", (tabela, indice)))
+
+
+def _cpfs_repetidos(conn):
+    """Retorna até MAX_EXEMPLOS_CPF (cpf, quantidade) de CPFs usados por mais de um aluno."""
+    return [tuple(linha) for linha in _consultar(
+        conn, "SELECT cpf, COUNT(*) FROM alunos WHERE cpf IS NOT NULL GROUP BY cpf "
+              "HAVING COUNT(*) > 1 ORDER BY cpf LIMIT %s", (MAX_EXEMPLOS_CPF,))]
+
+
+def _converter_lote_cpf(ultimo, tamanho_lote, gravar, anular_orfaos):
+    """
+    Lê o próximo lote de pets com CPF (Id maior que 'ultimo') e calcula o
+    CPF de cada um no formato de alunos.cpf; se 'gravar', grava as
+    alterações em uma transação.
+
+    O valor lido de uma coluna int perdeu os zeros à esquerda (01234567890
+    virou 1234567890): vale o texto igual a um alunos.cpf ou, se não houver,
+    o texto completado com zeros até 11 dígitos. Pets cujo CPF não pertence
+    a nenhum aluno são órfãos: ficam como estão ou, com 'anular_orfaos',
+    sem dono (cpf NULL).
+
+    Returns:
+        tuple: (lidos, convertidos, órfãos [(Id, cpf)], último Id lido).
+    """
+    with unidade_de_trabalho() as conn:
+        linhas = _consultar(conn, "SELECT Id, cpf FROM pets WHERE cpf IS NOT NULL AND Id > %s "
+                                  "ORDER BY Id LIMIT %s", (ultimo, tamanho_lote))
+        if not linhas:
+            return 0, 0, [], ultimo
+        candidatos = set()
+        for _, cpf in linhas:
+            texto = str(cpf).strip()
+            candidatos.update((texto, texto.zfill(11)) if texto.isdigit() else (texto,))
+        candidatos = sorted(candidatos)
+        marcadores = ", ".join(["%s"] * len(candidatos))
+        cadastrados = {linha[0] for linha in _consultar(
+            conn, f"SELECT cpf FROM alunos WHERE cpf IN ({marcadores})", candidatos)}
+
+        alteracoes, orfaos = [], []
+        for pet_id, cpf in linhas:
+            texto = str(cpf).strip()
+            if texto in cadastrados:
+                novo = texto
+            elif texto.isdigit() and texto.zfill(11) in cadastrados:
+                novo = texto.zfill(11)
+            else:
+                orfaos.append((pet_id, texto))
+                novo = None if anular_orfaos else texto
+            if novo != cpf:  # Inclui o int de uma coluna ainda não convertida
+                alteracoes.append((novo, pet_id))
+        if gravar and alteracoes:
+            cursor = conn.cursor()
+            cursor.executemany("UPDATE pets SET cpf = %s WHERE Id = %s", alteracoes)
+            cursor.close()
+    convertidos = sum(1 for novo, _ in alteracoes if novo is not None)
+    return len(linhas), convertidos, orfaos, linhas[-1][0]
+
+
+def _percorrer_cpfs_pets(resultado, tamanho_lote, gravar, anular_orfaos, ao_progresso):
+    """Passa _converter_lote_cpf() por todos os pets, acumulando as contagens em 'resultado'."""
+    resultado.update(pets=0, convertidos=0, orfaos=0, exemplos_orfaos=[])
+    ultimo = 0
+    while True:
+        lidos, convertidos, orfaos, ultimo = _converter_lote_cpf(ultimo, tamanho_lote, gravar, anular_orfaos)
+        if not lidos:
+            break
+        resultado["pets"] += lidos
+        resultado["convertidos"] += convertidos
+        resultado["orfaos"] += len(orfaos)
+        resultado["exemplos_orfaos"].extend(orfaos[:MAX_EXEMPLOS_CPF - len(resultado["exemplos_orfaos"])])
+        if ao_progresso:
+            ao_progresso(resultado["pets"], resultado["convertidos"], resultado["orfaos"])
+
+
+def _recriar_pets_sqlite(conn):
+    """
+    Recria a tabela pets com cpf varchar(11) e a chave estrangeira.
+
+    O SQLite não altera o tipo de uma coluna nem acrescenta chaves
+    estrangeiras: a tabela é copiada para uma nova, com a definição de
+    pets.cpf trocada, e os índices são recriados (procedimento da
+    documentação do ALTER TABLE do SQLite). As chaves estrangeiras ficam
+    desligadas durante a cópia, pois os CPFs só são corrigidos em seguida.
+    """
+    sql_tabela = _consultar(conn, "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'pets'")[0][0]
+    sql_indices = [linha[0] for linha in _consultar(
+        conn, "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'pets' AND sql IS NOT NULL")]
+    sql_nova = re.sub(r"\bcpf\b[^,]*?(?=,|\)\s*$)", DEFINICAO_CPF_PETS_SQLITE, sql_tabela, count=1)
+    sql_nova = re.sub(r"^CREATE TABLE( IF NOT EXISTS)?\s+\"?pets\"?", "CREATE TABLE pets_nova", sql_nova)
+    colunas = colunas_da_tabela(conn, "pets")
+    valores = ", ".join("CAST(cpf AS TEXT)" if coluna == "cpf" else coluna for coluna in colunas)
+    _executar(conn, "PRAGMA foreign_keys=OFF")
+    try:
+        conn.start_transaction()
+        try:
+            _executar(conn, sql_nova)
+            _executar(conn, f"INSERT INTO pets_nova ({', '.join(colunas)}) SELECT {valores} FROM pets")
+            _executar(conn, "DROP TABLE pets")
+            _executar(conn, "ALTER TABLE pets_nova RENAME TO pets")
+            for sql in sql_indices:
+                _executar(conn, sql)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    finally:
+        _executar(conn, "PRAGMA foreign_keys=ON")
+
+
+def migrar_cpf_pets(tamanho_lote=TAMANHO_LOTE_CPF, verificar=False, anular_orfaos=False, ao_progresso=None):
+    """
+    Converte pets.cpf de int para varchar(11), o mesmo tipo de alunos.cpf,
+    para que a junção pets.cpf = alunos.cpf use os índices, e cria a chave
+    estrangeira fk_pets_alunos_cpf.
+
+    Primeiro todos os pets são verificados, em lotes, sem gravar nada: a
+    chave estrangeira exige que alunos.cpf não se repita e que todo pet com
+    CPF tenha um aluno com esse CPF. Havendo pendências (ou com
+    verificar=True), nada é alterado. Depois, a coluna é convertida, os
+    CPFs são corrigidos em lotes (cada um com o seu COMMIT) e são criados o
+    índice único de alunos.cpf e a chave estrangeira. Pode ser executada de
+    novo: o que já estiver convertido é mantido.
+
+    Args:
+        tamanho_lote (int): Pets lidos e gravados por transação.
+        verificar (bool): Apenas verifica e informa o que seria feito.
+        anular_orfaos (bool): Deixa sem dono (cpf NULL) os pets cujo CPF não
+                              pertence a nenhum aluno, em vez de parar.
+        ao_progresso: Callback(pets, convertidos, orfaos) chamado após cada lote.
+
+    Returns:
+        dict: Chaves pets (com CPF), convertidos, orfaos, exemplos_orfaos
+              (lista de (Id, cpf)), cpfs_repetidos (lista de (cpf, alunos)),
+              pendencias (motivos pelos quais nada foi alterado), estrutura
+              (alterações feitas nas tabelas) e segundos.
+    """
+    log_event("migracoes", "migrar_cpf_pets" + (" (verificação)" if verificar else ""))
+    inicio = time.perf_counter()
+    tamanho_lote = max(1, int(tamanho_lote))
+    resultado = {"pendencias": [], "estrutura": []}
+    with conexao() as conn:
+        resultado["cpfs_repetidos"] = _cpfs_repetidos(conn)
+    _percorrer_cpfs_pets(resultado, tamanho_lote, False, anular_orfaos, ao_progresso)
+
+    if resultado["cpfs_repetidos"]:
+        resultado["pendencias"].append("há CPFs repetidos em alunos; corrija-os antes de criar o índice único")
+    if resultado["orfaos"] and not anular_orfaos:
+        resultado["pendencias"].append("há pets com CPF sem aluno; cadastre os alunos ou use --anular-orfaos")
+    if verificar or resultado["pendencias"]:
+        resultado["segundos"] = time.perf_counter() - inicio
+        return resultado
+
+    with conexao() as conn:
+        if not _cpf_alunos_unico(conn):
+            _executar(conn, "CREATE UNIQUE INDEX uq_alunos_cpf ON alunos (cpf)")
+            resultado["estrutura"].append("índice único uq_alunos_cpf")
+        if backend_atual() == "sqlite":
+            if not (_cpf_pets_eh_texto(conn) and _fk_cpf_pets_existe(conn)):
+                _recriar_pets_sqlite(conn)
+                resultado["estrutura"].append("pets recriada com cpf varchar(11) e chave estrangeira")
+        elif not _cpf_pets_eh_texto(conn):
+            _executar(conn, SQL_CPF_PETS_MYSQL)
+            resultado["estrutura"].append("pets.cpf alterado para varchar(11)")
+
+    _percorrer_cpfs_pets(resultado, tamanho_lote, True, anular_orfaos, ao_progresso)
+
+    with conexao() as conn:
+        if backend_atual() == "mysql":
+            if not _indice_existe(conn, "pets", "idx_pets_cpf"):
+                _executar(conn, "CREATE INDEX idx_pets_cpf ON pets (cpf, Id)")
+                resultado["estrutura"].append("índice idx_pets_cpf")
+            if not _fk_cpf_pets_existe(conn):
+                _executar(conn, SQL_FK_CPF_PETS_MYSQL)
+                resultado["estrutura"].append("chave estrangeira fk_pets_alunos_cpf")
+        elif not _indice_existe(conn, "pets", "idx_pets_cpf_id"):
+            _executar(conn, "CREATE INDEX idx_pets_cpf_id ON pets (cpf, Id)")
+            resultado["estrutura"].append("índice idx_pets_cpf_id")
+
+    resultado["segundos"] = time.perf_counter() - inicio
+    log_event("migracoes", f"migrar_cpf_pets: {resultado['convertidos']} convertidos, "
+                           f"{resultado['orfaos']} órfãos, "
+                           f"estrutura: {', '.join(resultado['estrutura']) or 'sem alterações'}")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Converte um banco existente para a estrutura atual.")
+    subparsers = parser.add_subparsers(dest="migracao", required=True)
+    fotos = subparsers.add_parser("fotos", help="move as fotos de alunos e pets para a tabela midias")
+    fotos.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO, help="fotos por transação")
+    fotos.add_argument("--remover-coluna", action="store_true",
+                       help="apaga as colunas 'foto' antigas ao final")
+    miniaturas = subparsers.add_parser("miniaturas", help="gera as miniaturas das fotos que não as têm")
+    miniaturas.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO, help="fotos por transação")
+    miniaturas.add_argument("--processos", type=int, default=None,
+                            help="processos em paralelo (padrão: um por núcleo)")
+    cpf_pets = subparsers.add_parser("cpf_pets", help="converte pets.cpf para varchar(11) e cria a "
+                                                      "chave estrangeira para alunos.cpf")
+    cpf_pets.add_argument("--lote", type=int, default=TAMANHO_LOTE_CPF, help="pets por transação")
+    cpf_pets.add_argument("--verificar", action="store_true", help="apenas verifica, sem alterar nada")
+    cpf_pets.add_argument("--anular-orfaos", action="store_true",
+                          help="deixa sem dono os pets cujo CPF não pertence a nenhum aluno")
+    args = parser.parse_args()
+
+    if args.migracao == "cpf_pets":
+        def mostrar_cpf(pets, convertidos, orfaos):
+            print(f"\r{pets} pets lidos, {orfaos} sem aluno", end="", flush=True)
+
+        resultado = migrar_cpf_pets(args.lote, args.verificar, args.anular_orfaos, ao_progresso=mostrar_cpf)
+        print()
+        for cpf, quantidade in resultado["cpfs_repetidos"]:
+            print(f"CPF {cpf} usado por {quantidade} alunos")
+        for pet_id, cpf in resultado["exemplos_orfaos"]:
+            print(f"Pet {pet_id}: CPF {cpf} sem aluno")
+        for pendencia in resultado["pendencias"]:
+            print(f"Nada foi alterado: {pendencia}.")
+        for alteracao in resultado["estrutura"]:
+            print(f"Criado/alterado: {alteracao}")
+        print(f"{resultado['pets']} pets com CPF, {resultado['convertidos']} "
+              f"{'a corrigir' if args.verificar or resultado['pendencias'] else 'corrigidos'}, "
+              f"{resultado['orfaos']} sem aluno ({resultado['segundos']:.1f}s).")
+        if resultado["pendencias"]:
+            raise SystemExit(1)
+    elif args.migracao == "miniaturas":
+        def mostrar_miniaturas(geradas, falhas):
+            print(f"\r{geradas} miniaturas geradas, {falhas} falhas", end="", flush=True)
+
+        resultado = gerar_miniaturas(args.lote, args.processos, ao_progresso=mostrar_miniaturas)
+        print()
+        print(f"{resultado['geradas']} miniaturas geradas, {resultado['falhas']} fotos inválidas "
+              f"({resultado['segundos']:.1f}s).")
+    elif args.migracao == "fotos":
+        def mostrar(tabela, movidas):
+            print(f"\r{tabela}: {movidas} fotos movidas", end="", flush=True)
+
+        resultado = migrar_fotos(args.lote, args.remover_coluna, ao_progresso=mostrar)
+        print()
+        print(f"{resultado['alunos']} fotos de alunos e {resultado['pets']} de pets movidas "
+              f"({resultado['bytes']} bytes, {resultado['segundos']:.1f}s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: paginacao.py - Paginação por chave (keyset) para as tabelas
+# Descrição: Este script monta consultas paginadas que continuam a partir da
+#            última linha vista (WHERE coluna > valor ... LIMIT n) em vez de
+#            usar OFFSET. O custo de cada página é o mesmo na primeira e na
+#            milésima página, pois o banco vai direto ao ponto de partida pelo
+#            índice. A posição é devolvida como um token opaco (cursor) para
+#            a página seguinte e para a anterior. Um salto para uma posição
+#            distante parte do cursor mais próximo já conhecido e pula apenas
+#            as linhas entre ele e o destino (OFFSET a partir do cursor); sem
+#            cursor, o OFFSET conta desde o início e custa proporcional à posição.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - base64, datetime, json: Biblioteca padrão.
+#
+# Uso: Os controllers expõem funções prontas (ver obter_pagina_alunos e
+#      obter_pagina_pets). Exemplo:
+#          pagina = obter_pagina_alunos(tamanho_pagina=50, ordenar_por="nome")
+#          proxima = obter_pagina_alunos(50, "nome", cursor=pagina["proxima"])
+# ==============================================================================
+
+import base64
+import datetime
+import json
+
+TAMANHO_PAGINA_PADRAO = 50
+TAMANHO_PAGINA_MAXIMO = 1000
+
+
+class CursorPaginacaoInvalidoError(ValueError):
+    """Lançada quando o token de página é inválido ou de outra ordenação."""
+
+
+def _valor_json(valor):
+    if isinstance(valor, (datetime.date, datetime.datetime)):
+        return valor.isoformat()
+    return valor
+
+
+def criar_cursor(sentido, coluna, ordem, valor, chave):
+    """
+    Codifica a posição de uma linha como token de página.
+
+    Args:
+        sentido (str): 'depois' (página seguinte) ou 'antes' (página anterior).
+        coluna (str): Coluna de ordenação.
+        ordem (str): 'asc' ou 'desc'.
+        valor: Valor da coluna de ordenação na linha de referência.
+        chave: Chave primária da linha de referência (desempate).
+    """
+    dados = [sentido, coluna, ordem, _valor_json(valor), _valor_json(chave)]
+    texto = json.dumps(dados, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(texto).decode("ascii")
+
+
+def ler_cursor(token):
+    """Decodifica um token criado por criar_cursor: (sentido, coluna, ordem, valor, chave)."""
+    try:
+        sentido, coluna, ordem, valor, chave = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except Exception:
+        raise CursorPaginacaoInvalidoError(f"Cursor de paginação inválido: {token!r}") from None
+    if sentido not in ("depois", "antes"):
+        raise CursorPaginacaoInvalidoError(f"Cursor de paginação inválido: {token!r}")
+    return sentido, coluna, ordem, valor, chave
+
+
+def _condicao(coluna, chave, valor, id_ref, maior):
+    """
+    Condição SQL para as linhas depois (maior=True) ou antes (maior=False) da
+    linha de referência, na ordem crescente (coluna, chave).
+
+    Valores NULL vêm antes de qualquer outro valor, como no ORDER BY ... ASC
+    do MySQL e do SQLite.
+    """
+    if coluna == chave:
+        return (f"{chave} > %s" if maior else f"{chave} < %s"), [id_ref]
+    if maior:
+        if valor is None:
+            return f"(({coluna} IS NULL AND {chave} > %s) OR {coluna} IS NOT NULL)", [id_ref]
+        return f"({coluna} > %s OR ({coluna} = %s AND {chave} > %s))", [valor, valor, id_ref]
+    if valor is None:
+        return f"({coluna} IS NULL AND {chave} < %s)", [id_ref]
+    return f"({coluna} IS NULL OR {coluna} < %s OR ({coluna} = %s AND {chave} < %s))", [valor, valor, id_ref]
+
+
+def paginar(conn, tabela, colunas, chave, ordenacoes, ordenar_por=None, ordem="asc",
+            tamanho_pagina=TAMANHO_PAGINA_PADRAO, cursor=None, filtro=None, parametros=(),
+            deslocamento=0):
+    """
+    Retorna uma página de 'tabela' ordenada por 'ordenar_por' e pela chave primária.
+
+    Args:
+        conn: Conexão emprestada do pool.
+        tabela (str): Nome da tabela.
+        colunas (tuple[str]): Colunas retornadas (deve incluir a chave e a
+                              coluna de ordenação).
+        chave (str): Chave primária, usada como desempate.
+        ordenacoes (tuple[str]): Colunas aceitas em 'ordenar_por' (lista branca;
+                                 nomes de coluna não podem ser parâmetros SQL).
+        ordenar_por (str): Coluna de ordenação (padrão: a chave primária).
+        ordem (str): 'asc' ou 'desc'.
+        tamanho_pagina (int): Linhas por página (1 a 1000).
+        cursor (str): Token 'proxima' ou 'anterior' de uma página anterior;
+                      None para a primeira página.
+        filtro (str): Condição SQL adicional (com %s), combinada com AND.
+        parametros (tuple): Valores dos %s de 'filtro'.
+        deslocamento (int): Linhas puladas (OFFSET) a partir do cursor, no
+                            sentido dele, ou desde o início, sem cursor. Serve
+                            apenas para saltar direto a uma posição, como ao
+                            arrastar a barra de rolagem; o custo cresce com as
+                            linhas puladas, então o salto deve partir do cursor
+                            mais próximo do destino. A navegação página a
+                            página deve usar os cursores sem deslocamento.
+
+    Returns:
+        dict: {"itens": list[dict], "proxima": token ou None,
+               "anterior": token ou None}.
+
+    Raises:
+        ValueError: Coluna ou ordem não permitidas.
+        CursorPaginacaoInvalidoError: Token inválido ou de outra ordenação.
+    """
+    ordenar_por = ordenar_por or chave
+    ordem = (ordem or "asc").lower()
+    if ordenar_por not in ordenacoes:
+        raise ValueError(f"Ordenação não permitida: {ordenar_por!r}")
+    if ordem not in ("asc", "desc"):
+        raise ValueError(f"Ordem inválida: {ordem!r}")
+    tamanho_pagina = max(1, min(int(tamanho_pagina), TAMANHO_PAGINA_MAXIMO))
+
+    condicoes = [f"({filtro})"] if filtro else []
+    params = list(parametros)
+    sentido = "depois"
+    if cursor:
+        sentido, coluna_cursor, ordem_cursor, valor, id_ref = ler_cursor(cursor)
+        if (coluna_cursor, ordem_cursor) != (ordenar_por, ordem):
+            raise CursorPaginacaoInvalidoError("O cursor pertence a outra ordenação.")
+        # 'depois' em ordem crescente (ou 'antes' em decrescente) = linhas maiores
+        maior = (sentido == "depois") == (ordem == "asc")
+        condicao, valores = _condicao(ordenar_por, chave, valor, id_ref, maior)
+        condicoes.append(condicao)
+        params.extend(valores)
+
+    # Para a página anterior a leitura é feita no sentido inverso e depois invertida
+    crescente = (ordem == "asc") == (sentido == "depois")
+    direcao = "ASC" if crescente else "DESC"
+    ordem_sql = f"{chave} {direcao}" if ordenar_por == chave else f"{ordenar_por} {direcao}, {chave} {direcao}"
+    sql = f"SELECT {', '.join(colunas)} FROM {tabela}"
+    if condicoes:
+        sql += " WHERE " + " AND ".join(condicoes)
+    sql += f" ORDER BY {ordem_sql} LIMIT %s"
+    params.append(tamanho_pagina + 1)  # Uma linha a mais indica se há outra página
+    deslocamento = max(0, int(deslocamento))
+    if deslocamento:
+        sql += " OFFSET %s"
+        params.append(deslocamento)
+
+    cur = conn.cursor(dictionary=True)
+    cur.execute(sql, tuple(params))
+    itens = cur.fetchall()
+    cur.close()
+
+    ha_mais = len(itens) > tamanho_pagina
+    itens = itens[:tamanho_pagina]
+    if sentido == "antes":
+        itens.reverse()
+    if not itens:
+        return {"itens": [], "proxima": None, "anterior": None}
+
+    def token(sentido_token, linha):
+        return criar_cursor(sentido_token, ordenar_por, ordem, linha[ordenar_por], linha[chave])
+
+    if sentido == "depois":
+        proxima = token("depois", itens[-1]) if ha_mais else None
+        anterior = token("antes", itens[0]) if cursor or deslocamento else None
+    else:
+        proxima = token("depois", itens[-1])
+        anterior = token("antes", itens[0]) if ha_mais else None
+    return {"itens": itens, "proxima": proxima, "anterior": anterior}
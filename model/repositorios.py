@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: repositorios.py - Repositórios com comandos preparados
+# Descrição: Este script concentra os comandos SQL mais executados do sistema
+#            (busca por chave, login, INSERT, UPDATE e DELETE) em classes de
+#            repositório. Com prepared_statements='sim' no conexao.con, cada
+#            comando é preparado no servidor uma vez por conexão do pool e as
+#            execuções seguintes enviam apenas os parâmetros.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - model.configuracao: Para ler a opção prepared_statements.
+#
+# Uso: Os repositórios recebem uma conexão já emprestada do pool:
+#          with conexao() as conn:
+#              aluno = AlunoRepository(conn).por_matricula("2024001")
+#      Os controllers expõem funções simples que fazem exatamente isso.
+# ==============================================================================
+
+from model.configuracao import obter_configuracao
+
+
+class Repositorio:
+    """
+    Base dos repositórios: executa comandos com ou sem preparo no servidor.
+
+    Parâmetros:
+        conn: Conexão emprestada do pool (ver model.conexao_db.conexao()).
+        preparado (bool): Força o uso (ou não) de comandos preparados. Se
+                          omitido, segue a opção prepared_statements do conexao.con.
+    """
+
+    def __init__(self, conn, preparado=None):
+        self.conn = conn
+        if preparado is None:
+            preparado = obter_configuracao()['prepared_statements']
+        self.preparado = preparado
+
+    def _executar(self, sql, params, dictionary=False, ler=False):
+        """
+        Executa um comando e, se 'ler' for True, retorna todas as linhas.
+
+        Para comandos de escrita retorna o cursor já executado (rowcount e
+        lastrowid continuam disponíveis).
+        """
+        if self.preparado:
+            cursor = self.conn.cursor_preparado(sql, dictionary)
+            try:
+                cursor.execute(sql, params)
+                resultado = cursor.fetchall() if ler else cursor
+                cursor.concluir()
+            except Exception:
+                # Um cursor preparado com erro não deve ser reutilizado
+                self.conn.descartar_preparado(sql, dictionary)
+                raise
+            return resultado
+
+        cursor = self.conn.cursor(dictionary=dictionary)
+        try:
+            cursor.execute(sql, params)
+            resultado = cursor.fetchall() if ler else cursor
+        except Exception:
+            cursor.close()
+            raise
+        if ler:
+            cursor.close()
+        return resultado
+
+    def _buscar_um(self, sql, params):
+        linhas = self._executar(sql, params, dictionary=True, ler=True)
+        return linhas[0] if linhas else None
+
+    def _escrever(self, sql, params):
+        """Executa um comando de escrita e retorna (linhas_afetadas, ultimo_id)."""
+        cursor = self._executar(sql, params)
+        resultado = (cursor.rowcount, cursor.lastrowid)
+        if not self.preparado:
+            cursor.close()
+        return resultado
+
+
+class AlunoRepository(Repositorio):
+    """Comandos de leitura e escrita da tabela 'alunos'."""
+
+    # A foto fica na tabela 'midias'; o aluno guarda apenas o hash (ver MidiaRepository)
+    SQL_POR_MATRICULA = ("SELECT matricula, nome, cpf, curso, idade, sexo, observacao, foto_hash "
+                         "FROM alunos WHERE matricula = %s")
+    SQL_LISTAGEM = "SELECT matricula, nome, cpf, curso, idade, sexo FROM alunos WHERE matricula = %s"
+    SQL_HASH_FOTO = "SELECT foto_hash FROM alunos WHERE matricula = %s"
+    SQL_INSERIR = ("INSERT INTO alunos (matricula, nome, curso, idade, foto_hash, sexo) "
+                   "VALUES (%s, %s, %s, %s, %s, %s)")
+    SQL_ATUALIZAR = "UPDATE alunos SET nome=%s, curso=%s, idade=%s, sexo=%s, foto_hash=%s WHERE matricula=%s"
+    SQL_EXCLUIR = "DELETE FROM alunos WHERE matricula = %s"
+
+    def por_matricula(self, matricula):
+        """Retorna o aluno (dict, com foto_hash e sem a foto) com a matrícula informada, ou None."""
+        return self._buscar_um(self.SQL_POR_MATRICULA, (matricula,))
+
+    def hash_foto(self, matricula):
+        """Retorna o hash da foto do aluno (None se não houver foto ou aluno)."""
+        linha = self._buscar_um(self.SQL_HASH_FOTO, (matricula,))
+        return linha["foto_hash"] if linha else None
+
+    def linha_listagem(self, matricula):
+        """Retorna apenas as colunas exibidas nas grades (sem a foto), ou None."""
+        return self._buscar_um(self.SQL_LISTAGEM, (matricula,))
+
+    def inserir(self, dados):
+        """Insere um aluno novo a partir do dicionário de dados."""
+        return self._escrever(self.SQL_INSERIR, (
+            dados["matricula"], dados["nome"], dados["curso"], dados["idade"],
+            dados["foto_hash"], dados["sexo"]
+        ))
+
+    def atualizar(self, dados):
+        """Atualiza o aluno identificado por dados['matricula']."""
+        return self._escrever(self.SQL_ATUALIZAR, (
+            dados["nome"], dados["curso"], dados["idade"], dados["sexo"],
+            dados["foto_hash"], dados["matricula"]
+        ))
+
+    def excluir(self, matricula):
+        """Remove o aluno com a matrícula informada."""
+        return self._escrever(self.SQL_EXCLUIR, (matricula,))
+
+
+class PetRepository(Repositorio):
+    """Comandos de leitura e escrita da tabela 'pets'."""
+
+    SQL_POR_ID = "SELECT Id, apelido, raca, data_nascimento, cpf, foto_hash FROM pets WHERE id = %s"
+    SQL_LISTAGEM = "SELECT Id, apelido, raca, data_nascimento, cpf FROM pets WHERE Id = %s"
+    # Resolvido pelo índice idx_pets_cpf (cpf, Id), já na ordem do Id
+    SQL_POR_CPF = "SELECT Id, apelido, raca, data_nascimento, cpf FROM pets WHERE cpf = %s ORDER BY Id"
+    SQL_HASH_FOTO = "SELECT foto_hash FROM pets WHERE id = %s"
+    SQL_INSERIR = ("INSERT INTO pets (apelido, raca, data_nascimento, cpf, foto_hash) "
+                   "VALUES (%s, %s, %s, %s, %s)")
+    SQL_ATUALIZAR = "UPDATE pets SET apelido=%s, raca=%s, data_nascimento=%s, cpf=%s, foto_hash=%s WHERE id=%s"
+    SQL_EXCLUIR = "DELETE FROM pets WHERE id = %s"
+
+    def por_id(self, pet_id):
+        """Retorna o pet (dict, com foto_hash e sem a foto) com o ID informado, ou None."""
+        return self._buscar_um(self.SQL_POR_ID, (pet_id,))
+
+    def hash_foto(self, pet_id):
+        """Retorna o hash da foto do pet (None se não houver foto ou pet)."""
+        linha = self._buscar_um(self.SQL_HASH_FOTO, (pet_id,))
+        return linha["foto_hash"] if linha else None
+
+    def linha_listagem(self, pet_id):
+        """Retorna apenas as colunas exibidas nas grades (sem a foto), ou None."""
+        return self._buscar_um(self.SQL_LISTAGEM, (pet_id,))
+
+    def por_cpf(self, cpf):
+        """Retorna os pets do dono (colunas das grades, sem a foto), ordenados pelo Id."""
+        return self._executar(self.SQL_POR_CPF, (cpf,), dictionary=True, ler=True)
+
+    def inserir(self, dados):
+        """Insere um pet novo; retorna (linhas_afetadas, id_gerado)."""
+        return self._escrever(self.SQL_INSERIR, (
+            dados["apelido"], dados["raca"], dados["data_nascimento"], dados["cpf"], dados["foto_hash"]
+        ))
+
+    def atualizar(self, dados):
+        """Atualiza o pet identificado por dados['id']."""
+        return self._escrever(self.SQL_ATUALIZAR, (
+            dados["apelido"], dados["raca"], dados["data_nascimento"], dados["cpf"],
+            dados["foto_hash"], dados["id"]
+        ))
+
+    def excluir(self, pet_id):
+        """Remove o pet com o ID informado."""
+        return self._escrever(self.SQL_EXCLUIR, (pet_id,))
+
+
+class MidiaRepository(Repositorio):
+    """
+    Comandos da tabela 'midias', que guarda o conteúdo das fotos endereçado
+    pelo SHA-256 (hash). Arquivos iguais são gravados uma única vez.
+    """
+
+    # Versões de cada mídia: a original, a miniatura 120x160 e a média (que,
+    # se não foi gerada por a foto já ser pequena, é a própria original)
+    SQL_POR_HASH = {
+        "original": "SELECT conteudo AS dados FROM midias WHERE hash = %s",
+        "miniatura": "SELECT miniatura AS dados FROM midias WHERE hash = %s",
+        "media": "SELECT COALESCE(media, conteudo) AS dados FROM midias WHERE hash = %s",
+    }
+    # Mesmo hash = mesmo conteúdo: uma foto já gravada não é enviada de novo
+    SQL_INSERIR = {
+        "mysql": ("INSERT IGNORE INTO midias (hash, tamanho, conteudo, miniatura, media) "
+                  "VALUES (%s, %s, %s, %s, %s)"),
+        "sqlite": ("INSERT OR IGNORE INTO midias (hash, tamanho, conteudo, miniatura, media) "
+                   "VALUES (%s, %s, %s, %s, %s)"),
+    }
+    SQL_GRAVAR_VARIANTES = "UPDATE midias SET miniatura = %s, media = %s WHERE hash = %s"
+    SQL_EXISTE = "SELECT hash FROM midias WHERE hash = %s"
+    # Só apaga a mídia que nenhum aluno ou pet referencia mais
+    SQL_EXCLUIR_ORFA = ("DELETE FROM midias WHERE hash = %s "
+                        "AND NOT EXISTS (SELECT 1 FROM alunos WHERE foto_hash = %s) "
+                        "AND NOT EXISTS (SELECT 1 FROM pets WHERE foto_hash = %s)")
+
+    def conteudo(self, hash_midia, versao="original"):
+        """
+        Retorna os bytes da mídia com o hash informado, ou None.
+
+        'versao' é 'original', 'miniatura' ou 'media'. A miniatura é None
+        enquanto não for gerada (fotos gravadas antes dela existir).
+        """
+        linha = self._buscar_um(self.SQL_POR_HASH[versao], (hash_midia,))
+        return linha["dados"] if linha else None
+
+    def existe(self, hash_midia):
+        """Retorna True se a mídia já estiver gravada."""
+        return bool(self._executar(self.SQL_EXISTE, (hash_midia,), ler=True))
+
+    def inserir(self, hash_midia, conteudo, miniatura=None, media=None):
+        """Grava a mídia e suas versões, se ainda não existir uma com o mesmo hash."""
+        sql = self.SQL_INSERIR[obter_configuracao()['backend']]
+        return self._escrever(sql, (hash_midia, len(conteudo), conteudo, miniatura, media))
+
+    def gravar_variantes(self, hash_midia, miniatura, media):
+        """Grava a miniatura e a versão média de uma mídia já existente."""
+        return self._escrever(self.SQL_GRAVAR_VARIANTES, (miniatura, media, hash_midia))
+
+    def excluir_se_orfa(self, hash_midia):
+        """Remove a mídia se nenhum registro apontar mais para ela."""
+        return self._escrever(self.SQL_EXCLUIR_ORFA, (hash_midia, hash_midia, hash_midia))
+
+
+class UserRepository(Repositorio):
+    """Comandos de autenticação da tabela 'users'."""
+
+    SQL_LOGIN = "SELECT login FROM users WHERE login = %s AND pswd = %s"
+    SQL_EXISTE = "SELECT login FROM users WHERE login = %s"
+    SQL_INSERIR = "INSERT INTO users (login, pswd) VALUES (%s, %s)"
+
+    def autenticar(self, login, senha_hash):
+        """Retorna True se existir usuário com o login e o hash de senha informados."""
+        return bool(self._executar(self.SQL_LOGIN, (login, senha_hash), ler=True))
+
+    def existe(self, login):
+        """Retorna True se o login já estiver cadastrado."""
+        return bool(self._executar(self.SQL_EXISTE, (login,), ler=True))
+
+    def inserir(self, login, senha_hash):
+        """Cadastra um novo usuário com o hash de senha informado."""
+        return self._escrever(self.SQL_INSERIR, (login, senha_hash))
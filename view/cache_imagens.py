@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: cache_imagens.py - Cache em memória das imagens exibidas
+# Descrição: Este script guarda as imagens já decodificadas (PIL) e prontas
+#            para exibição (PhotoImage), para que abrir de novo o mesmo aluno
+#            ou pet, ou redesenhar o papel de parede, não leia nem decodifique
+#            a imagem outra vez. As imagens menos usadas recentemente são
+#            descartadas quando a memória ocupada passa do limite definido em
+#            cache_imagens_mb no conexao.con. As fotos são identificadas pelo
+#            hash do conteúdo; quando um controller troca ou remove a foto de
+#            um registro, as imagens daquele registro são descartadas.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - PIL: Para decodificar as imagens e criar os PhotoImage.
+# - collections, io, threading: Biblioteca padrão.
+# - controller.midia_controller: Para ler as miniaturas das fotos.
+# - model.configuracao: Para o limite de memória (cache_imagens_mb).
+# - model.eventos: Para saber quando uma foto foi trocada.
+# - view.executor_db: Para ler e decodificar as fotos fora da thread da interface.
+#
+# Uso: photo = foto_para_exibicao(aluno["foto_hash"], entidade=("aluno", matricula))
+#      carregar_foto_em_segundo_plano(form, aluno["foto_hash"], ("aluno", matricula),
+#                                     ao_concluir=mostrar_foto)
+#      cache_imagens.estatisticas()  # acertos, falhas, bytes...
+# ==============================================================================
+
+# view/cache_imagens.py
+# Cache LRU de imagens decodificadas com limite de memória
+
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from PIL import Image, ImageTk
+
+from controller.midia_controller import carregar_miniatura
+from model.configuracao import obter_configuracao
+from model.eventos import FOTO_ALTERADA, assinar
+from view.executor_db import executar_em_segundo_plano
+
+
+def _tamanho_imagem(img):
+    # Memória aproximada dos pixels: largura × altura × canais
+    return img.width * img.height * len(img.getbands())
+
+
+def _tamanho_photo(img):
+    return img.width * img.height * 4  # O Tk guarda os pixels em RGBA
+
+
+class _Item:
+    __slots__ = ("imagem", "photo", "bytes")
+
+    def __init__(self, imagem):
+        self.imagem = imagem
+        self.photo = None
+        self.bytes = _tamanho_imagem(imagem)
+
+
+class CacheImagens:
+    """
+    Cache LRU de imagens com limite total de memória.
+
+    Cada item guarda a imagem PIL decodificada e, depois de exibida pela
+    primeira vez, o PhotoImage correspondente. Itens podem ser associados a
+    um registro (ex.: ('aluno', '2024001')) para serem descartados juntos
+    quando a foto dele mudar.
+
+    Parâmetros:
+        limite_bytes (int): Memória máxima ocupada pelas imagens guardadas.
+    """
+
+    def __init__(self, limite_bytes):
+        self.limite_bytes = int(limite_bytes)
+        self.bytes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self._itens = OrderedDict()   # chave -> _Item, do menos para o mais usado
+        self._por_entidade = {}       # entidade -> chaves associadas
+        self._lock = threading.Lock()
+
+    def imagem(self, chave, carregar, entidade=None):
+        """
+        Retorna a imagem PIL da chave, chamando carregar() apenas se ela não
+        estiver no cache.
+
+        Args:
+            chave: Identificação da imagem (ex.: ('midia', hash, 'miniatura')).
+            carregar: Função sem argumentos que retorna a imagem PIL (ou None).
+            entidade: Registro dono da imagem (ex.: ('pet', 12)), opcional.
+
+        Returns:
+            PIL.Image.Image or None: A imagem, ou None se carregar() retornar None.
+        """
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                if entidade is not None:
+                    self._por_entidade.setdefault(entidade, set()).add(chave)
+                return item.imagem
+            self.falhas += 1
+        imagem = carregar()  # Fora do lock: pode consultar o banco e decodificar
+        if imagem is None:
+            return None
+        imagem.load()
+        with self._lock:
+            if chave not in self._itens:
+                self._guardar(chave, _Item(imagem), entidade)
+        return imagem
+
+    def photo(self, chave, carregar, entidade=None, imagem=None):
+        """
+        Retorna a imagem da chave pronta para exibição (PhotoImage).
+
+        Deve ser chamada na thread da interface. O PhotoImage é criado uma
+        única vez e reutilizado enquanto o item estiver no cache. 'imagem' é
+        a imagem PIL já obtida com imagem() (ex.: em segundo plano), para não
+        consultar o cache de novo.
+        """
+        if imagem is None:
+            imagem = self.imagem(chave, carregar, entidade)
+        if imagem is None:
+            return None
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item.photo is not None:
+                return item.photo
+        photo = ImageTk.PhotoImage(imagem)
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item.photo is None:
+                item.photo = photo
+                item.bytes += _tamanho_photo(imagem)
+                self.bytes += _tamanho_photo(imagem)
+                self._aplicar_limite()
+        return photo
+
+    def _guardar(self, chave, item, entidade):
+        # Chamado com o lock adquirido
+        if item.bytes > self.limite_bytes:
+            return  # Maior que o cache inteiro: não vale a pena guardar
+        self._itens[chave] = item
+        self.bytes += item.bytes
+        if entidade is not None:
+            self._por_entidade.setdefault(entidade, set()).add(chave)
+        self._aplicar_limite()
+
+    def _aplicar_limite(self):
+        # Descarta os itens usados há mais tempo até caber no limite
+        while self.bytes > self.limite_bytes and self._itens:
+            chave, item = self._itens.popitem(last=False)
+            self.bytes -= item.bytes
+            self.descartes += 1
+            self._desassociar(chave)
+
+    def _desassociar(self, chave):
+        for entidade, chaves in list(self._por_entidade.items()):
+            chaves.discard(chave)
+            if not chaves:
+                del self._por_entidade[entidade]
+
+    def invalidar(self, chave):
+        """Descarta a imagem da chave, se estiver no cache."""
+        with self._lock:
+            item = self._itens.pop(chave, None)
+            if item is not None:
+                self.bytes -= item.bytes
+                self._desassociar(chave)
+
+    def invalidar_entidade(self, entidade):
+        """Descarta todas as imagens associadas ao registro."""
+        with self._lock:
+            for chave in self._por_entidade.pop(entidade, ()):
+                item = self._itens.pop(chave, None)
+                if item is not None:
+                    self.bytes -= item.bytes
+
+    def limpar(self):
+        """Descarta todas as imagens (os contadores são mantidos)."""
+        with self._lock:
+            self._itens.clear()
+            self._por_entidade.clear()
+            self.bytes = 0
+
+    def estatisticas(self):
+        """Retorna um dicionário com itens, bytes, limite_bytes, acertos, falhas, descartes e taxa_acertos."""
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "bytes": self.bytes,
+                "limite_bytes": self.limite_bytes,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "descartes": self.descartes,
+                "taxa_acertos": self.acertos / consultas if consultas else 0.0,
+            }
+
+
+cache_imagens = CacheImagens(obter_configuracao()['cache_imagens_mb'] * 1024 * 1024)
+
+
+def _foto_alterada(entidade, chave, hash_anterior=None, hash_novo=None):
+    # Assinante de FOTO_ALTERADA: a imagem antiga do registro não será mais exibida
+    cache_imagens.invalidar_entidade((entidade, chave))
+    if hash_anterior:
+        cache_imagens.invalidar(("midia", hash_anterior, "miniatura"))
+
+
+assinar(FOTO_ALTERADA, _foto_alterada)
+
+
+def _decodificar(conteudo):
+    return Image.open(BytesIO(conteudo)) if conteudo else None
+
+
+def _carregar_miniatura(hash_midia):
+    return lambda: _decodificar(carregar_miniatura(hash_midia))
+
+
+def miniatura_decodificada(hash_midia, entidade=None):
+    """
+    Retorna a miniatura 120x160 da foto já decodificada (PIL), usando o
+    cache. Pode ser chamada fora da thread da interface.
+    """
+    if not hash_midia:
+        return None
+    return cache_imagens.imagem(("midia", hash_midia, "miniatura"), _carregar_miniatura(hash_midia), entidade)
+
+
+def foto_para_exibicao(hash_midia, entidade=None, imagem=None):
+    """
+    Retorna o PhotoImage da miniatura 120x160 da foto, usando o cache.
+
+    Deve ser chamada na thread da interface; se a miniatura ainda não estiver
+    no cache, ela é lida do banco aqui mesmo (veja carregar_foto_em_segundo_plano).
+
+    Args:
+        hash_midia (str): Valor de foto_hash do registro (None é aceito).
+        entidade (tuple): Registro dono da foto, ex.: ('aluno', matricula).
+        imagem: Miniatura já decodificada por miniatura_decodificada(), opcional.
+
+    Returns:
+        ImageTk.PhotoImage or None: A miniatura, ou None se não houver foto.
+    """
+    if not hash_midia:
+        return None
+    return cache_imagens.photo(("midia", hash_midia, "miniatura"), _carregar_miniatura(hash_midia),
+                               entidade, imagem)
+
+
+def carregar_foto_em_segundo_plano(widget, hash_midia, entidade, ao_concluir, ao_falhar=None):
+    """
+    Lê e decodifica a miniatura da foto em uma thread de trabalho e entrega
+    o PhotoImage (ou None, se não houver foto) a ao_concluir na thread da
+    interface, onde o PhotoImage precisa ser criado.
+
+    Args:
+        widget: Formulário que exibirá a foto (se for fechado antes, nada é entregue).
+        hash_midia (str): Valor de foto_hash do registro.
+        entidade (tuple): Registro dono da foto, ex.: ('pet', 12).
+        ao_concluir: Callback(photo) chamado na thread da interface.
+        ao_falhar: Callback(exceção), opcional.
+    """
+    def decodificada(imagem):
+        ao_concluir(foto_para_exibicao(hash_midia, entidade, imagem) if imagem is not None else None)
+
+    executar_em_segundo_plano(widget, miniatura_decodificada, hash_midia, entidade,
+                              ao_concluir=decodificada, ao_falhar=ao_falhar)
+
+
+def imagem_de_arquivo(caminho):
+    """Retorna a imagem PIL de um arquivo (ex.: o papel de parede), decodificada uma única vez."""
+    return cache_imagens.imagem(("arquivo", caminho), lambda: Image.open(caminho))
+
+
+def photo_redimensionada(imagem, largura, altura):
+    """
+    Retorna o PhotoImage da imagem redimensionada para largura × altura.
+
+    O resultado não entra no cache: cada tamanho de janela gera uma imagem
+    do tamanho da tela, que tomaria o espaço das fotos dos formulários.
+    Quem exibe guarda apenas o PhotoImage atual.
+    """
+    return ImageTk.PhotoImage(imagem.resize((largura, altura), Image.LANCZOS))
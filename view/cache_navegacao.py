@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: cache_navegacao.py - Cache dos registros vizinhos na navegação
+# Descrição: Este script guarda em memória os dados de detalhe (ex.: os pets)
+#            do registro exibido e dos seus vizinhos em uma navegação
+#            Anterior/Próximo, e os busca em segundo plano antes de o usuário
+#            chegar neles. Assim, avançar ou voltar exibe o detalhe na hora.
+#            Só é mantida uma pequena janela ao redor da posição atual; os
+#            dados mais antigos que cache_navegacao_ttl (conexao.con) são
+#            buscados de novo.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - time: Biblioteca padrão.
+# - model.configuracao: Para o tempo de vida dos dados (cache_navegacao_ttl).
+# - view.executor_db: Para buscar os dados sem congelar a interface.
+#
+# Uso: cache = CacheNavegacao(self, obter_pets_por_cpf)
+#      cache.obter(cpf, ao_concluir=self._exibir_pets)
+#      cache.manter_janela([cpf_anterior, cpf, cpf_seguinte])
+# ==============================================================================
+
+# view/cache_navegacao.py
+# Cache com pré-carregamento para navegação registro a registro
+
+import time
+
+from model.configuracao import obter_configuracao
+from view.executor_db import executar_em_segundo_plano
+
+
+class CacheNavegacao:
+    """
+    Cache dos resultados de 'carregar(chave)' para uma navegação sequencial.
+
+    Todos os métodos devem ser chamados na thread da interface (os
+    resultados das buscas em segundo plano também chegam nela), por isso não
+    há travas.
+
+    Parâmetros:
+        widget: Janela dona das buscas (se fechada, as respostas são descartadas).
+        carregar: Função(chave) que consulta o banco (ex.: obter_pets_por_cpf).
+        ttl (float): Segundos em que um resultado é considerado atual
+                     (padrão: cache_navegacao_ttl do conexao.con).
+    """
+
+    def __init__(self, widget, carregar, ttl=None):
+        self.widget = widget
+        self.carregar = carregar
+        self.ttl = obter_configuracao()['cache_navegacao_ttl'] if ttl is None else ttl
+        self.acertos = 0
+        self.falhas = 0
+        self._itens = {}       # chave -> (instante da leitura, resultado)
+        self._pendentes = {}   # chave -> callbacks [(ao_concluir, ao_falhar)] aguardando a busca
+        self._janela = None    # Chaves mantidas (None: sem limite)
+
+    def _atual(self, chave):
+        item = self._itens.get(chave)
+        return item is not None and time.monotonic() - item[0] < self.ttl
+
+    def obter(self, chave, ao_concluir, ao_falhar=None):
+        """
+        Entrega o resultado da chave a ao_concluir: na hora, se estiver no
+        cache, ou quando a busca em segundo plano terminar.
+
+        Returns:
+            bool: True se o resultado veio do cache.
+        """
+        if self._atual(chave):
+            self.acertos += 1
+            ao_concluir(self._itens[chave][1])
+            return True
+        self.falhas += 1
+        self._buscar(chave, (ao_concluir, ao_falhar))
+        return False
+
+    def pre_carregar(self, chaves):
+        """Busca em segundo plano, na ordem dada, as chaves que ainda não estão no cache."""
+        for chave in chaves:
+            if not self._atual(chave):
+                self._buscar(chave)
+
+    def _buscar(self, chave, callbacks=None):
+        aguardando = self._pendentes.get(chave)
+        if aguardando is not None:  # Já em andamento (ex.: pré-carregamento)
+            if callbacks:
+                aguardando.append(callbacks)
+            return
+        self._pendentes[chave] = [callbacks] if callbacks else []
+        executar_em_segundo_plano(
+            self.widget, self.carregar, chave,
+            ao_concluir=lambda resultado: self._concluida(chave, resultado),
+            ao_falhar=lambda erro: self._falhou(chave, erro)
+        )
+
+    def _concluida(self, chave, resultado):
+        aguardando = self._pendentes.pop(chave, [])
+        if self._janela is None or chave in self._janela:
+            self._itens[chave] = (time.monotonic(), resultado)
+        for ao_concluir, _ in aguardando:
+            ao_concluir(resultado)
+
+    def _falhou(self, chave, erro):
+        # Falhas de pré-carregamento são ignoradas: a chave é buscada de novo ao ser exibida
+        for _, ao_falhar in self._pendentes.pop(chave, []):
+            if ao_falhar:
+                ao_falhar(erro)
+
+    def manter_janela(self, chaves):
+        """Descarta os resultados cujas chaves não estão em 'chaves' (a janela ao redor da posição atual)."""
+        self._janela = set(chaves)
+        for chave in [c for c in self._itens if c not in self._janela]:
+            del self._itens[chave]
+
+    def invalidar(self, chave=None):
+        """Descarta o resultado da chave (ou todos, sem chave); a próxima leitura consulta o banco."""
+        if chave is None:
+            self._itens.clear()
+        else:
+            self._itens.pop(chave, None)
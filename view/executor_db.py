@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: executor_db.py - Execução de consultas fora da thread da interface
+# Descrição: Este script executa chamadas aos controllers em um pool de threads
+#            e entrega os resultados de volta à thread do Tk através de uma fila
+#            lida periodicamente com after(), evitando que a interface congele
+#            enquanto o banco de dados responde.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - concurrent.futures: Para o pool de threads de trabalho.
+# - queue: Para a fila de resultados (thread-safe) lida pela thread do Tk.
+# - tkinter.messagebox: Para exibir erros não tratados pela view.
+# - logger: Para registro de eventos do sistema.
+#
+# Uso: from view.executor_db import executar_em_segundo_plano
+#      executar_em_segundo_plano(self, obter_alunos, ao_concluir=self._preencher)
+# ==============================================================================
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+from logger import log_event
+
+INTERVALO_FILA_MS = 25  # Frequência com que a thread do Tk verifica resultados prontos
+MAX_THREADS = 4
+
+
+class ExecutorDB:
+    """
+    Executa funções de acesso a dados em threads de trabalho e devolve os
+    resultados para a thread do Tk.
+
+    Os callbacks ao_concluir/ao_falhar sempre rodam na thread do Tk (via
+    after()), portanto podem atualizar widgets livremente. Se o widget dono
+    da tarefa já tiver sido fechado, os callbacks são descartados.
+
+    Parâmetros:
+        max_threads (int): Número de threads de trabalho.
+    """
+
+    def __init__(self, max_threads=MAX_THREADS):
+        self._threads = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="db")
+        self._prontos = queue.Queue()
+        self._pendentes = 0  # Só é alterado na thread do Tk
+        self._raiz = None
+
+    def executar(self, widget, funcao, *args, ao_concluir=None, ao_falhar=None, **kwargs):
+        """
+        Agenda funcao(*args, **kwargs) em uma thread de trabalho.
+
+        Args:
+            widget: Widget Tk dono da tarefa (deve ser chamado na thread do Tk).
+            funcao: Função a executar (ex.: uma função de controller).
+            ao_concluir: Callback(resultado) chamado na thread do Tk.
+            ao_falhar: Callback(exceção) chamado na thread do Tk. Se omitido,
+                       o erro é exibido em uma caixa de mensagem.
+
+        Returns:
+            concurrent.futures.Future: Futuro da tarefa agendada.
+        """
+        if self._raiz is None:
+            self._raiz = widget._root()
+        futuro = self._threads.submit(funcao, *args, **kwargs)
+        futuro.add_done_callback(lambda f: self._prontos.put((widget, f, ao_concluir, ao_falhar)))
+        self._pendentes += 1
+        if self._pendentes == 1:
+            self._raiz.after(INTERVALO_FILA_MS, self._processar_fila)
+        return futuro
+
+    def _processar_fila(self):
+        """Entrega os resultados prontos aos callbacks (roda na thread do Tk)."""
+        while True:
+            try:
+                widget, futuro, ao_concluir, ao_falhar = self._prontos.get_nowait()
+            except queue.Empty:
+                break
+            self._pendentes -= 1
+            if futuro.cancelled() or not self._existe(widget):
+                continue
+            erro = futuro.exception()
+            try:
+                if erro is None:
+                    if ao_concluir:
+                        ao_concluir(futuro.result())
+                elif ao_falhar:
+                    ao_falhar(erro)
+                else:
+                    self._erro_padrao(erro)
+            except Exception as e:
+                log_event("executor_db", f"ERRO no callback: {e}")
+        if self._pendentes > 0:
+            self._raiz.after(INTERVALO_FILA_MS, self._processar_fila)
+
+    @staticmethod
+    def _existe(widget):
+        try:
+            return bool(widget.winfo_exists())
+        except Exception:
+            return False
+
+    @staticmethod
+    def _erro_padrao(erro):
+        log_event("executor_db", f"ERRO: {erro}")
+        messagebox.showerror("Erro ao acessar o banco de dados", str(erro))
+
+    def encerrar(self):
+        """Encerra as threads de trabalho sem aguardar tarefas pendentes."""
+        self._threads.shutdown(wait=False, cancel_futures=True)
+
+
+executor = ExecutorDB()
+
+
+def executar_em_segundo_plano(widget, funcao, *args, ao_concluir=None, ao_falhar=None, **kwargs):
+    """Atalho para executor.executar() usando o executor global da aplicação."""
+    return executor.executar(widget, funcao, *args, ao_concluir=ao_concluir,
+                             ao_falhar=ao_falhar, **kwargs)
@@ -12,6 +12,9 @@
 # - customtkinter: Para criação da interface gráfica.
 # - PIL: Para manipulação e redimensionamento de imagens.
 # - controller.aluno_controller: Para operações de banco de dados de alunos.
+# - controller.midia_controller: Para preparar a foto escolhida antes de gravá-la.
+# - view.cache_imagens: Para carregar a miniatura da foto gravada em segundo plano (com cache).
+# - view.executor_db: Para carregar, gravar e excluir o aluno sem bloquear a interface.
 #
 # Uso: Abra a grade de alunos e clique em 'Adicionar' ou 'Editar' para usar este formulário.
 # ==============================================================================
@@ -27,6 +30,9 @@ if root_dir not in sys.path:
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 from controller.aluno_controller import salvar_aluno, obter_aluno_por_matricula, deletar_aluno
+from controller.midia_controller import preparar_foto, resumo_preparacao
+from view.cache_imagens import carregar_foto_em_segundo_plano
+from view.executor_db import executar_em_segundo_plano
 from PIL import Image, ImageTk
 from io import BytesIO
 from logger import log_event
@@ -40,7 +46,9 @@ class FormAlunos(ctk.CTkToplevel):
     Parâmetros:
         master: Janela principal que chama este formulário.
         matricula: Matrícula do aluno para edição (opcional).
-        atualizar_callback: Função callback para atualizar a lista após salvar/editar.
+        atualizar_callback: Função callback(acao, matricula, linha) chamada após
+                            salvar ou excluir, com acao 'inserido', 'alterado'
+                            ou 'excluido', para a grade atualizar só esta linha.
     """
 
     def __init__(self, master=None, matricula=None, atualizar_callback=None):
@@ -55,8 +63,10 @@ class FormAlunos(ctk.CTkToplevel):
         self.resizable(False, False)
         self.matricula = matricula
         self.atualizar_callback = atualizar_callback
-        self.foto_bytes = None
+        self.foto_bytes = None  # Foto nova escolhida (gravada ao salvar)
+        self.foto_hash = None   # Foto já gravada do aluno (tabela midias)
         self._photo_image = None  # Referência para ImageTk
+        self._ocupado = False     # Gravação ou exclusão em andamento
 
         # Torna este form modal
         self.transient(master)
@@ -95,6 +105,10 @@ class FormAlunos(ctk.CTkToplevel):
         self.photo_label = ctk.CTkLabel(self, text="Sem foto", width=120, height=160)
         self.photo_label.pack(padx=20, pady=(0, 10))
 
+        # Resultado da preparação da foto escolhida (tamanho antes e depois)
+        self.lbl_foto_info = ctk.CTkLabel(self, text="", font=("Arial", 11))
+        self.lbl_foto_info.pack(padx=20)
+
         self.botao_foto = ctk.CTkButton(self, text="Selecionar Foto", command=self.selecionar_foto)
         self.botao_foto.pack(pady=(0, 20))
 
@@ -114,13 +128,17 @@ class FormAlunos(ctk.CTkToplevel):
         self.botao_limpar = ctk.CTkButton(botoes_frame, text="Limpar", width=80, command=self.limpar_campos)
         self.botao_limpar.grid(row=0, column=3, padx=5)
 
-        self.botao_cancelar = ctk.CTkButton(botoes_frame, text="Cancelar", width=80, command=self.destroy)
+        self.botao_cancelar = ctk.CTkButton(botoes_frame, text="Cancelar", width=80, command=self.fechar)
         self.botao_cancelar.grid(row=0, column=4, padx=5)
+        self.protocol("WM_DELETE_WINDOW", self.fechar)
+
+        # Indicador de operação em andamento ("Carregando...", "Salvando...", "Excluindo...")
+        self.label_status = ctk.CTkLabel(self, text="")
+        self.label_status.pack(pady=(0, 5))
 
-        # Se for edição (já recebeu matrícula), carrega dados
+        # Se for edição (já recebeu matrícula), carrega dados em segundo plano
         if self.matricula:
             self.carregar_dados()
-            self.entry_matricula.configure(state="disabled")
         else:
             # Novo cadastro: desabilita botão Excluir
             self.botao_excluir.configure(state="disabled")
@@ -144,51 +162,100 @@ class FormAlunos(ctk.CTkToplevel):
     def selecionar_foto(self):
         """
         Permite ao usuário selecionar uma foto 3x4 do aluno.
-        Redimensiona, exibe e armazena a foto em memória.
+        A foto é preparada (orientação, metadados, resolução e compressão),
+        exibida e mantida em memória até salvar.
         """
         log_event("form_alunos", "selecionar_foto")
         caminho = filedialog.askopenfilename(
-            filetypes=[("Imagens", "*.jpg *.jpeg *.png")],
+            filetypes=[("Imagens", "*.jpg *.jpeg *.png *.webp *.bmp")],
             title="Selecione uma foto 3×4"
         )
         if not caminho:
             return
         try:
-            img = Image.open(caminho)
+            conteudo, relatorio = preparar_foto(caminho)
+            img = Image.open(BytesIO(conteudo))
             img = img.resize((120, 160), Image.LANCZOS)
             self._photo_image = ImageTk.PhotoImage(img)
             self.photo_label.configure(image=self._photo_image, text="")
-            with open(caminho, "rb") as f:
-                self.foto_bytes = f.read()
+            self.lbl_foto_info.configure(text=resumo_preparacao(relatorio))
+            self.foto_bytes = conteudo
         except Exception as e:
             messagebox.showerror("Erro", f"Falha ao processar imagem: {e}")
             self.foto_bytes = None
 
     def carregar_dados(self):
         """
-        Carrega os dados do aluno selecionado para edição, preenchendo os campos do formulário.
-        Também carrega a foto do aluno, se existir.
+        Carrega os dados do aluno selecionado para edição em segundo plano.
+        Até a resposta chegar, os campos e botões ficam desabilitados e o status
+        mostra "Carregando..." (apenas Cancelar continua ativo).
         """
         log_event("form_alunos", "carregar_dados")
-        aluno = obter_aluno_por_matricula(self.matricula)
+        self._habilitar_campos(False)
+        self._ocupar("Carregando...", permite_fechar=True)
+        executar_em_segundo_plano(
+            self, obter_aluno_por_matricula, self.matricula,
+            ao_concluir=self._dados_carregados,
+            ao_falhar=self._falha_carregar
+        )
+
+    def _dados_carregados(self, aluno):
+        """
+        Preenche os campos com o aluno lido e reabilita o formulário.
+        Os campos vêm de uma consulta sem a foto; a foto, se existir, é lida e
+        decodificada em segundo plano (veja _foto_carregada).
+        """
+        self._habilitar_campos(True)
+        self._liberar()
         if not aluno:
+            self.label_status.configure(text="Aluno não encontrado.")
             return
+        self.entry_matricula.configure(state="normal")
         self.entry_matricula.insert(0, aluno["matricula"])
+        self.entry_matricula.configure(state="disabled")
         self.entry_nome.insert(0, aluno["nome"])
         self.entry_curso.insert(0, aluno["curso"])
         self.entry_idade.insert(0, aluno["idade"])
         self.option_sexo.set(aluno.get("sexo", ""))
-        foto_bytes = aluno.get("foto", None)
-        if foto_bytes:
-            try:
-                img = Image.open(BytesIO(foto_bytes))
-                img = img.resize((120, 160), Image.LANCZOS)
-                self._photo_image = ImageTk.PhotoImage(img)
-                self.photo_label.configure(image=self._photo_image, text="")
-                self.foto_bytes = foto_bytes
-            except Exception as e:
-                messagebox.showwarning("Aviso", f"Falha ao exibir foto salva: {e}")
-                self.foto_bytes = None
+        self.foto_hash = aluno.get("foto_hash")
+        if self.foto_hash:
+            # Apenas a miniatura 120x160 gravada com a foto, reaproveitada do cache
+            # se este aluno (ou a mesma foto) já foi aberto
+            self.photo_label.configure(text="Carregando foto...")
+            hash_midia = self.foto_hash
+            carregar_foto_em_segundo_plano(
+                self, hash_midia, ("aluno", self.matricula),
+                ao_concluir=lambda photo: self._foto_carregada(hash_midia, photo),
+                ao_falhar=self._foto_falhou
+            )
+
+    def _falha_carregar(self, erro):
+        """Mantém o formulário desabilitado (só Cancelar) e exibe o erro da leitura."""
+        log_event("form_alunos", f"ERRO ao carregar aluno: {erro}")
+        self.label_status.configure(text="Falha ao carregar aluno.")
+        messagebox.showerror("Erro", f"Falha ao carregar aluno: {erro}")
+
+    def _habilitar_campos(self, habilitar):
+        """Habilita ou desabilita os campos (a matrícula de um aluno gravado não muda)."""
+        estado = "normal" if habilitar else "disabled"
+        for campo in (self.entry_nome, self.entry_curso, self.option_sexo, self.entry_idade):
+            campo.configure(state=estado)
+        self.entry_matricula.configure(state=estado if not self.matricula else "disabled")
+
+    def _foto_carregada(self, hash_midia, photo):
+        """Exibe a foto lida em segundo plano, se o usuário não a trocou nesse meio-tempo."""
+        if self.foto_bytes is not None or self.foto_hash != hash_midia:
+            return
+        self._photo_image = photo
+        if photo:
+            self.photo_label.configure(image=self._photo_image, text="")
+        else:
+            self.photo_label.configure(text="Sem foto")
+
+    def _foto_falhou(self, erro):
+        log_event("form_alunos", f"ERRO ao carregar foto: {erro}")
+        if self.foto_bytes is None:
+            self.photo_label.configure(text="Foto indisponível")
 
     def salvar(self):
         """
@@ -211,20 +278,12 @@ class FormAlunos(ctk.CTkToplevel):
             "curso": curso,
             "idade": idade,
             "sexo": self.option_sexo.get(),
-            "foto": self.foto_bytes
+            "foto": self.foto_bytes,
+            "foto_hash": self.foto_hash
         }
 
-        try:
-            salvar_aluno(dados)
-            messagebox.showinfo("Sucesso", "Dados do aluno salvos com sucesso.")
-            if not self.matricula:
-                self.entry_matricula.configure(state="disabled")
-                self.matricula = matricula
-                self.botao_excluir.configure(state="normal")
-            if self.atualizar_callback:
-                self.atualizar_callback()
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao salvar aluno: {e}")
+        self._gravar(dados, not self.matricula, "Dados do aluno salvos com sucesso.",
+                     "Falha ao salvar aluno")
 
     def excluir(self):
         """
@@ -236,14 +295,20 @@ class FormAlunos(ctk.CTkToplevel):
         resposta = messagebox.askyesno("Confirmar Exclusão", "Deseja realmente excluir este aluno?")
         if not resposta:
             return
-        try:
-            deletar_aluno(self.matricula)
-            messagebox.showinfo("Sucesso", "Aluno excluído com sucesso.")
-            if self.atualizar_callback:
-                self.atualizar_callback()
-            self.destroy()
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao excluir aluno: {e}")
+        self._ocupar("Excluindo...")
+        executar_em_segundo_plano(
+            self, deletar_aluno, self.matricula,
+            ao_concluir=self._excluido,
+            ao_falhar=lambda erro: self._falha(erro, "Falha ao excluir aluno")
+        )
+
+    def _excluido(self, matricula):
+        """Avisa a grade e fecha o formulário após a exclusão em segundo plano."""
+        self._ocupado = False
+        messagebox.showinfo("Sucesso", "Aluno excluído com sucesso.")
+        if self.atualizar_callback:
+            self.atualizar_callback("excluido", matricula, None)
+        self.destroy()
 
     def limpar_campos(self):
         """
@@ -257,7 +322,9 @@ class FormAlunos(ctk.CTkToplevel):
         self.entry_idade.delete(0, "end")
         self.option_sexo.set("")
         self.photo_label.configure(image=None, text="Sem foto")
+        self.lbl_foto_info.configure(text="")
         self.foto_bytes = None
+        self.foto_hash = None
         self._photo_image = None
         self.botao_excluir.configure(state="disabled")
         self.matricula = None
@@ -299,17 +366,11 @@ class FormAlunos(ctk.CTkToplevel):
             "curso": curso,
             "idade": idade,
             "sexo": sexo,
-            "foto": self.foto_bytes
+            "foto": self.foto_bytes,
+            "foto_hash": self.foto_hash
         }
 
-        try:
-            salvar_aluno(dados)
-            messagebox.showinfo("Sucesso", "Aluno inserido com sucesso.")
-            self.matricula = matricula
-            if self.atualizar_callback:
-                self.atualizar_callback()
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao inserir aluno: {e}")
+        self._gravar(dados, True, "Aluno inserido com sucesso.", "Falha ao inserir aluno")
 
     def _salvar_existente(self):
         """
@@ -330,13 +391,73 @@ class FormAlunos(ctk.CTkToplevel):
             "curso": curso,
             "idade": idade,
             "sexo": sexo,
-            "foto": self.foto_bytes
+            "foto": self.foto_bytes,
+            "foto_hash": self.foto_hash
         }
 
-        try:
-            salvar_aluno(dados)
-            messagebox.showinfo("Sucesso", "Aluno atualizado com sucesso.")
-            if self.atualizar_callback:
-                self.atualizar_callback()
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao atualizar aluno: {e}")
+        self._gravar(dados, False, "Aluno atualizado com sucesso.", "Falha ao atualizar aluno")
+
+    def _gravar(self, dados, novo, sucesso, falha):
+        """
+        Grava o aluno em segundo plano (salvar_aluno), com os botões desabilitados
+        e "Salvando..." no status até o banco responder.
+
+        Args:
+            dados (dict): Campos do aluno.
+            novo (bool): True para INSERT, False para UPDATE.
+            sucesso (str): Mensagem exibida ao concluir.
+            falha (str): Início da mensagem de erro.
+        """
+        self._ocupar("Salvando...")
+        executar_em_segundo_plano(
+            self, salvar_aluno, dados, novo=novo,
+            ao_concluir=lambda resultado: self._gravado(resultado, novo, sucesso),
+            ao_falhar=lambda erro: self._falha(erro, falha)
+        )
+
+    def _gravado(self, resultado, novo, sucesso):
+        """Conclui a gravação: trava a matrícula de um aluno novo e atualiza a grade."""
+        matricula, linha = resultado
+        if novo:
+            self.matricula = matricula
+            self.entry_matricula.configure(state="disabled")
+        self._liberar()
+        messagebox.showinfo("Sucesso", sucesso)
+        if self.atualizar_callback:
+            self.atualizar_callback("inserido" if novo else "alterado", matricula, linha)
+
+    def _falha(self, erro, mensagem):
+        """Reabilita os botões e exibe o erro da gravação ou exclusão."""
+        log_event("form_alunos", f"ERRO: {mensagem}: {erro}")
+        self._liberar()
+        messagebox.showerror("Erro", f"{mensagem}: {erro}")
+
+    def _ocupar(self, texto, permite_fechar=False):
+        """
+        Exibe o texto no status e desabilita os botões enquanto o banco responde.
+        Com permite_fechar (leitura), Cancelar continua ativo.
+        """
+        self._ocupado = not permite_fechar
+        self.label_status.configure(text=texto)
+        for botao in (self.botao_foto, self.botao_inserir, self.botao_atualizar,
+                      self.botao_excluir, self.botao_limpar):
+            botao.configure(state="disabled")
+        self.botao_cancelar.configure(state="normal" if permite_fechar else "disabled")
+
+    def _liberar(self):
+        """Limpa o status e reabilita os botões (Excluir só para aluno já gravado)."""
+        self._ocupado = False
+        self.label_status.configure(text="")
+        for botao in (self.botao_foto, self.botao_inserir, self.botao_atualizar,
+                      self.botao_limpar, self.botao_cancelar):
+            botao.configure(state="normal")
+        self.botao_excluir.configure(state="normal" if self.matricula else "disabled")
+
+    def fechar(self):
+        """
+        Fecha o formulário. Durante uma gravação ou exclusão a janela fica aberta,
+        para que o retorno do banco ainda atualize a grade.
+        """
+        if self._ocupado:
+            return
+        self.destroy()
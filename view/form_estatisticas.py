@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: form_estatisticas.py - Estatísticas de desempenho das consultas
+# Descrição: Este script exibe uma grade com a latência (p50/p95/p99/máx),
+#            o número de execuções, as linhas e os bytes lidos de cada comando
+#            SQL executado desde a abertura do sistema.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - customtkinter: Para criação da interface gráfica.
+# - tkinter.ttk: Para widget Treeview.
+# - model.instrumentacao: Para obter as estatísticas coletadas.
+# - view.cache_imagens: Para exibir o uso do cache de imagens.
+# - model.cache_entidades: Para exibir o uso do cache de alunos e pets.
+# - logger: Para registro de logs de eventos.
+#
+# Uso: Execute a partir da janela principal no menu 'Ferramentas'.
+# ==============================================================================
+
+# view/form_estatisticas.py
+# Grade com as estatísticas de desempenho das consultas SQL
+
+import customtkinter as ctk
+from tkinter import ttk
+from model.cache_entidades import cache_entidades
+from model.instrumentacao import obter_estatisticas, zerar_estatisticas, formatar_estatisticas
+from view.cache_imagens import cache_imagens
+from logger import log_event
+
+COLUNAS = (
+    ("execucoes", "Execuções", 80),
+    ("p50_ms", "p50 (ms)", 80),
+    ("p95_ms", "p95 (ms)", 80),
+    ("p99_ms", "p99 (ms)", 80),
+    ("max_ms", "Máx (ms)", 80),
+    ("linhas", "Linhas", 80),
+    ("bytes", "Bytes", 90),
+    ("sql", "Comando SQL", 500),
+)
+
+
+class FormEstatisticas(ctk.CTkToplevel):
+    """
+    Janela modal que lista as estatísticas de cada comando SQL executado,
+    ordenadas da maior para a menor latência p95.
+
+    Parâmetros:
+        master: Janela principal que chama este formulário.
+    """
+
+    def __init__(self, master=None):
+        """
+        Inicializa a grade de estatísticas e os botões Atualizar,
+        Zerar, Imprimir e Fechar.
+        """
+        super().__init__(master)
+        log_event("form_estatisticas", "__init__")
+        self.title("Estatísticas de Consultas")
+        self.geometry("1000x400")
+
+        ctk.CTkLabel(self, text="Desempenho das Consultas SQL", font=("Arial", 16)).pack(pady=10)
+
+        # ─── Treeview com uma linha por comando SQL ─────────────────────
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in COLUNAS], show="headings")
+        for coluna, titulo, largura in COLUNAS:
+            self.tree.heading(coluna, text=titulo)
+            self.tree.column(coluna, width=largura, anchor="w" if coluna == "sql" else "e")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Uso do cache de imagens decodificadas (fotos e papel de parede)
+        self.lbl_cache_imagens = ctk.CTkLabel(self, text="")
+        self.lbl_cache_imagens.pack()
+
+        # Uso do cache de alunos e pets lidos pela chave (formulários)
+        self.lbl_cache_entidades = ctk.CTkLabel(self, text="")
+        self.lbl_cache_entidades.pack()
+
+        # ─── Botões de ação ──────────────────────────────────────────────
+        frame = ctk.CTkFrame(self)
+        frame.pack(pady=10)
+        ctk.CTkButton(frame, text="Atualizar", command=self.atualizar).pack(side="left", padx=5)
+        ctk.CTkButton(frame, text="Zerar", command=self.zerar).pack(side="left", padx=5)
+        ctk.CTkButton(frame, text="Imprimir", command=self.imprimir).pack(side="left", padx=5)
+        ctk.CTkButton(frame, text="Fechar", command=self.destroy).pack(side="left", padx=5)
+
+        self.atualizar()
+        self._center_window()
+
+    def _center_window(self):
+        """
+        Centraliza a janela no centro da tela do usuário.
+        """
+        self.update_idletasks()
+        w = 1000
+        h = 400
+        sw = self.winfo_screenwidth()
+        sh = self.winfo_screenheight()
+        x = (sw // 2) - (w // 2)
+        y = (sh // 2) - (h // 2)
+        self.geometry(f"{w}x{h}+{x}+{y}")
+
+    def atualizar(self):
+        """
+        Recarrega as estatísticas em memória e atualiza a Treeview.
+        """
+        self.tree.delete(*self.tree.get_children())
+        for estat in obter_estatisticas():
+            valores = []
+            for coluna, _, _ in COLUNAS:
+                valor = estat[coluna]
+                valores.append(f"{valor:.2f}" if isinstance(valor, float) else valor)
+            self.tree.insert("", "end", values=valores)
+
+        cache = cache_imagens.estatisticas()
+        self.lbl_cache_imagens.configure(
+            text=f"Cache de imagens: {cache['itens']} imagens, "
+                 f"{cache['bytes'] / 1048576:.1f} de {cache['limite_bytes'] / 1048576:.0f} MB, "
+                 f"{cache['acertos']} acertos, {cache['falhas']} falhas "
+                 f"({cache['taxa_acertos']:.0%}), {cache['descartes']} descartes"
+        )
+        cache = cache_entidades.estatisticas()
+        self.lbl_cache_entidades.configure(
+            text=f"Cache de alunos e pets: {cache['itens']} de {cache['max_itens']} registros, "
+                 f"{cache['acertos']} acertos, {cache['falhas']} falhas "
+                 f"({cache['taxa_acertos']:.0%}), {cache['expirados']} expirados, "
+                 f"{cache['descartes']} descartes, {cache['invalidacoes']} invalidações"
+        )
+
+    def zerar(self):
+        """
+        Descarta as estatísticas acumuladas e limpa a grade.
+        """
+        log_event("form_estatisticas", "zerar")
+        zerar_estatisticas()
+        self.atualizar()
+
+    def imprimir(self):
+        """
+        Imprime a tabela de estatísticas no console (saída padrão).
+        """
+        log_event("form_estatisticas", "imprimir")
+        print(formatar_estatisticas())
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: form_exportacao.py - Progresso da exportação de alunos para CSV
+# Descrição: Este script exibe uma janela com a barra de progresso da
+#            exportação de alunos, que roda em segundo plano, e permite
+#            cancelá-la.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - customtkinter: Para criação da interface gráfica.
+# - tkinter.messagebox: Para exibir mensagens de sucesso ou erro.
+# - threading: Para sinalizar o cancelamento à thread da exportação.
+# - controller.exportacao_controller: Para a exportação em lotes.
+# - view.executor_db: Para exportar sem congelar a interface.
+# - logger: Para registro de logs de eventos.
+#
+# Uso: Aberto pelo menu 'Relatórios' > 'Exportar Alunos para CSV' (ou
+#      'Exportar Alunos e Pets para CSV'), após a escolha do arquivo de destino.
+# ==============================================================================
+
+# view/form_exportacao.py
+# Janela de progresso da exportação de alunos
+
+import threading
+import customtkinter as ctk
+from tkinter import messagebox
+from controller.exportacao_controller import exportar_alunos_csv, ExportacaoCanceladaError
+from view.executor_db import executar_em_segundo_plano
+from logger import log_event
+
+INTERVALO_PROGRESSO_MS = 200
+
+
+class FormExportacao(ctk.CTkToplevel):
+    """
+    Janela modal que exporta os alunos para o arquivo informado e mostra o
+    progresso. Fechar a janela durante a exportação também a cancela.
+
+    Parâmetros:
+        master: Janela principal que chama este formulário.
+        caminho (str): Arquivo de destino (compactado com gzip se terminar em '.gz').
+        exportar: Função de exportação (exportar_alunos_csv ou exportar_alunos_pets_csv).
+        titulo (str): Título da janela.
+    """
+
+    def __init__(self, master=None, caminho="alunos_exportados.csv", exportar=exportar_alunos_csv,
+                 titulo="Exportar Alunos para CSV"):
+        """
+        Inicializa a barra de progresso e o botão Cancelar e inicia a exportação.
+        """
+        super().__init__(master)
+        log_event("form_exportacao", f"__init__ {caminho}")
+        self.title(titulo)
+        self.geometry("460x200")
+        self._cancelar = threading.Event()
+        self._progresso = (0, 0)  # (linhas, total), escrito pela thread da exportação
+        self._exportando = True
+        self._id_progresso = None  # after() pendente de _mostrar_progresso
+
+        ctk.CTkLabel(self, text="Exportando alunos...", font=("Arial", 16)).pack(pady=10)
+        ctk.CTkLabel(self, text=caminho, wraplength=420).pack(padx=20)
+        self.barra = ctk.CTkProgressBar(self)
+        self.barra.pack(fill="x", padx=20, pady=10)
+        self.barra.set(0)
+        self.label_status = ctk.CTkLabel(self, text="Iniciando...")
+        self.label_status.pack(pady=5)
+        self.botao = ctk.CTkButton(self, text="Cancelar", command=self.cancelar)
+        self.botao.pack(pady=10)
+        self.protocol("WM_DELETE_WINDOW", self.fechar)
+
+        self._center_window()
+        executar_em_segundo_plano(
+            self, exportar, caminho, ao_progresso=self._registrar_progresso,
+            cancelar=self._cancelar, ao_concluir=self._exportacao_concluida,
+            ao_falhar=self._exportacao_falhou
+        )
+        self._id_progresso = self.after(INTERVALO_PROGRESSO_MS, self._mostrar_progresso)
+
+    def _center_window(self):
+        """
+        Centraliza a janela no centro da tela do usuário.
+        """
+        self.update_idletasks()
+        w = 460
+        h = 200
+        sw = self.winfo_screenwidth()
+        sh = self.winfo_screenheight()
+        x = (sw // 2) - (w // 2)
+        y = (sh // 2) - (h // 2)
+        self.geometry(f"{w}x{h}+{x}+{y}")
+
+    def _registrar_progresso(self, linhas, total):
+        # Roda na thread da exportação: apenas guarda o progresso
+        self._progresso = (linhas, total)
+
+    def _mostrar_progresso(self):
+        """
+        Atualiza a barra e o texto enquanto a exportação estiver em andamento.
+        """
+        self._id_progresso = None
+        if not self._exportando:
+            return
+        linhas, total = self._progresso
+        if total:
+            self.barra.set(linhas / total)
+            self.label_status.configure(text=f"{linhas} de {total} alunos")
+        self._id_progresso = self.after(INTERVALO_PROGRESSO_MS, self._mostrar_progresso)
+
+    def cancelar(self):
+        """
+        Sinaliza o cancelamento; a exportação para ao fim do lote atual.
+        """
+        log_event("form_exportacao", "cancelar")
+        self._cancelar.set()
+        self.botao.configure(state="disabled", text="Cancelando...")
+
+    def fechar(self):
+        """
+        Fecha a janela, cancelando a exportação se ainda estiver em andamento.
+        """
+        self._cancelar.set()
+        self._parar_progresso()
+        self.destroy()
+
+    def _parar_progresso(self):
+        """
+        Encerra a atualização do progresso e cancela o after() pendente, que
+        do contrário rodaria sobre a janela já destruída.
+        """
+        self._exportando = False
+        if self._id_progresso is not None:
+            self.after_cancel(self._id_progresso)
+            self._id_progresso = None
+
+    def _exportacao_concluida(self, resultado):
+        """
+        Informa o total exportado e fecha a janela.
+        """
+        self._parar_progresso()
+        if not resultado["alunos"]:
+            messagebox.showinfo("Exportar CSV", "Não há alunos cadastrados para exportar.", parent=self)
+        else:
+            messagebox.showinfo(
+                "Exportar CSV",
+                f"{resultado['alunos']} alunos exportados para {resultado['caminho']} "
+                f"em {resultado['segundos']:.1f}s.", parent=self
+            )
+        log_event("main", "Exportação de alunos para CSV realizada com sucesso.")
+        self.destroy()
+
+    def _exportacao_falhou(self, erro):
+        """
+        Exibe o erro (ou o cancelamento) e fecha a janela.
+        """
+        self._parar_progresso()
+        if isinstance(erro, ExportacaoCanceladaError):
+            messagebox.showinfo("Exportar CSV", str(erro), parent=self)
+        else:
+            log_event("main", f"ERRO exportar_alunos_csv: {erro}")
+            messagebox.showerror("Erro ao exportar CSV", str(erro), parent=self)
+        self.destroy()
@@ -12,6 +12,7 @@
 # - customtkinter: Para criação da interface gráfica.
 # - matplotlib: Para geração de gráficos.
 # - controller.aluno_controller: Para obter dados de idades dos alunos.
+# - view.executor_db: Para consultar o banco sem congelar a interface.
 #
 # Uso: Execute a partir da janela principal para visualizar o gráfico de idades.
 # ==============================================================================
@@ -23,6 +24,7 @@ import customtkinter as ctk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 from controller.aluno_controller import obter_idades_alunos
+from view.executor_db import executar_em_segundo_plano
 
 class FormIdadeAlunos(ctk.CTkToplevel):
     """
@@ -38,16 +40,32 @@ class FormIdadeAlunos(ctk.CTkToplevel):
 
     def __init__(self, master=None):
         """
-        Inicializa o formulário de gráfico de idades, consulta os dados
-        do banco, classifica as idades em faixas etárias e renderiza
-        o gráfico de barras na janela.
+        Inicializa o formulário de gráfico de idades e consulta as idades
+        em segundo plano; o gráfico é desenhado quando os dados chegam.
         """
         super().__init__(master)
         self.title("Gráfico de Idades dos Alunos")
         self.geometry("600x400")
 
-        # Busca as idades de todos os alunos via controller
-        idades = obter_idades_alunos()
+        # Indicador de carregamento exibido até o gráfico ficar pronto
+        self.label_status = ctk.CTkLabel(self, text="Carregando dados...")
+        self.label_status.pack(pady=20)
+
+        # Centraliza a janela na tela
+        self._center_window()
+
+        # Busca as idades de todos os alunos via controller, fora da thread da interface
+        executar_em_segundo_plano(self, obter_idades_alunos, ao_concluir=self._desenhar_grafico)
+
+    def _desenhar_grafico(self, idades):
+        """
+        Classifica as idades em faixas etárias e renderiza o gráfico de
+        barras na janela.
+
+        Args:
+            idades (list[int]): Idades de todos os alunos cadastrados.
+        """
+        self.label_status.destroy()
 
         # Define as faixas etárias e inicializa contadores
         faixas = ["18-25", "26-30", "31-40", "41-50", "51+"]
@@ -80,9 +98,6 @@ class FormIdadeAlunos(ctk.CTkToplevel):
         canvas.get_tk_widget().pack(fill="both", expand=True)
         canvas.draw()
 
-        # Centraliza a janela na tela
-        self._center_window()
-
     def _center_window(self):
         """
         Centraliza a janela no centro da tela do usuário.
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: form_importacao.py - Importação de alunos ou pets a partir de CSV
+# Descrição: Este script exibe uma janela para escolher o arquivo CSV, o tamanho
+#            do lote e o método de gravação, executa a importação em segundo
+#            plano e mostra o progresso (linhas lidas, inseridas, duplicadas,
+#            rejeitadas e linhas por segundo) enquanto ela acontece.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - customtkinter: Para criação da interface gráfica.
+# - tkinter.filedialog, tkinter.messagebox: Para escolher o arquivo e exibir mensagens.
+# - controller.importacao_controller: Para a importação em lotes.
+# - view.executor_db: Para importar sem congelar a interface.
+# - logger: Para registro de logs de eventos.
+#
+# Uso: Execute a partir da janela principal no menu 'Arquivo'.
+# ==============================================================================
+
+# view/form_importacao.py
+# Janela de importação em massa de alunos ou pets
+
+import customtkinter as ctk
+from tkinter import filedialog, messagebox
+from controller.importacao_controller import importar_csv, TAMANHO_LOTE_PADRAO
+from view.executor_db import executar_em_segundo_plano
+from logger import log_event
+
+INTERVALO_PROGRESSO_MS = 200
+
+
+class FormImportacao(ctk.CTkToplevel):
+    """
+    Janela modal de importação de um arquivo CSV para a tabela de alunos
+    ou de pets.
+
+    Parâmetros:
+        master: Janela principal que chama este formulário.
+        tabela (str): 'alunos' ou 'pets'.
+        atualizar_callback: Função chamada após uma importação com linhas inseridas.
+    """
+
+    def __init__(self, master=None, tabela="alunos", atualizar_callback=None):
+        """
+        Inicializa os campos de arquivo, tamanho do lote e método de gravação,
+        a barra de progresso e os botões Importar e Fechar.
+        """
+        super().__init__(master)
+        log_event("form_importacao", f"__init__ {tabela}")
+        self.tabela = tabela
+        self.atualizar_callback = atualizar_callback
+        self._progresso = None   # Último resultado parcial (escrito pela thread da importação)
+        self._importando = False
+
+        self.title(f"Importar {tabela.capitalize()} de CSV")
+        self.geometry("520x330")
+
+        ctk.CTkLabel(self, text=f"Importação de {tabela.capitalize()}", font=("Arial", 16)).pack(pady=10)
+
+        # ─── Arquivo CSV ─────────────────────────────────────────────────
+        frame_arquivo = ctk.CTkFrame(self)
+        frame_arquivo.pack(fill="x", padx=20, pady=5)
+        self.entry_arquivo = ctk.CTkEntry(frame_arquivo, placeholder_text="Arquivo CSV")
+        self.entry_arquivo.pack(side="left", fill="x", expand=True, padx=5, pady=5)
+        ctk.CTkButton(frame_arquivo, text="Selecionar...", width=100,
+                      command=self.selecionar_arquivo).pack(side="left", padx=5)
+
+        # ─── Opções ──────────────────────────────────────────────────────
+        frame_opcoes = ctk.CTkFrame(self)
+        frame_opcoes.pack(fill="x", padx=20, pady=5)
+        ctk.CTkLabel(frame_opcoes, text="Linhas por lote:").pack(side="left", padx=5)
+        self.entry_lote = ctk.CTkEntry(frame_opcoes, width=80)
+        self.entry_lote.insert(0, str(TAMANHO_LOTE_PADRAO))
+        self.entry_lote.pack(side="left", padx=5, pady=5)
+        self.var_load_data = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(frame_opcoes, text="Usar LOAD DATA (MySQL)",
+                        variable=self.var_load_data).pack(side="left", padx=10)
+
+        # ─── Progresso ───────────────────────────────────────────────────
+        self.barra = ctk.CTkProgressBar(self, mode="indeterminate")
+        self.barra.pack(fill="x", padx=20, pady=10)
+        self.barra.set(0)
+        self.label_status = ctk.CTkLabel(self, text="", justify="left")
+        self.label_status.pack(padx=20, pady=5)
+
+        # ─── Botões de ação ──────────────────────────────────────────────
+        frame_botoes = ctk.CTkFrame(self)
+        frame_botoes.pack(pady=10)
+        self.botao_importar = ctk.CTkButton(frame_botoes, text="Importar", command=self.importar)
+        self.botao_importar.pack(side="left", padx=5)
+        ctk.CTkButton(frame_botoes, text="Fechar", command=self.destroy).pack(side="left", padx=5)
+
+        self._center_window()
+
+    def _center_window(self):
+        """
+        Centraliza a janela no centro da tela do usuário.
+        """
+        self.update_idletasks()
+        w = 520
+        h = 330
+        sw = self.winfo_screenwidth()
+        sh = self.winfo_screenheight()
+        x = (sw // 2) - (w // 2)
+        y = (sh // 2) - (h // 2)
+        self.geometry(f"{w}x{h}+{x}+{y}")
+
+    def selecionar_arquivo(self):
+        """
+        Abre o diálogo para escolher o arquivo CSV.
+        """
+        caminho = filedialog.askopenfilename(
+            parent=self, filetypes=[("Arquivos CSV", "*.csv"), ("Todos os arquivos", "*.*")]
+        )
+        if caminho:
+            self.entry_arquivo.delete(0, "end")
+            self.entry_arquivo.insert(0, caminho)
+
+    def importar(self):
+        """
+        Valida as opções e inicia a importação em segundo plano.
+        """
+        caminho = self.entry_arquivo.get().strip()
+        if not caminho:
+            messagebox.showwarning("Aviso", "Selecione o arquivo CSV.", parent=self)
+            return
+        try:
+            tamanho_lote = int(self.entry_lote.get())
+            if tamanho_lote < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showwarning("Aviso", "Informe um tamanho de lote válido.", parent=self)
+            return
+
+        log_event("form_importacao", f"importar {self.tabela} {caminho}")
+        self._importando = True
+        self._progresso = None
+        self.botao_importar.configure(state="disabled", text="Importando...")
+        self.label_status.configure(text="Iniciando...")
+        self.barra.start()
+        executar_em_segundo_plano(
+            self, importar_csv, caminho, self.tabela, tamanho_lote, self.var_load_data.get(),
+            ao_progresso=self._registrar_progresso,
+            ao_concluir=self._importacao_concluida, ao_falhar=self._importacao_falhou
+        )
+        self.after(INTERVALO_PROGRESSO_MS, self._mostrar_progresso)
+
+    def _registrar_progresso(self, parcial):
+        # Roda na thread da importação: apenas guarda o resultado parcial
+        self._progresso = parcial
+
+    def _mostrar_progresso(self):
+        """
+        Exibe o último resultado parcial enquanto a importação estiver em andamento.
+        """
+        if not self._importando:
+            return
+        if self._progresso:
+            self.label_status.configure(text=self._formatar(self._progresso))
+        self.after(INTERVALO_PROGRESSO_MS, self._mostrar_progresso)
+
+    @staticmethod
+    def _formatar(resultado):
+        return (f"Lidas: {resultado['lidas']}   Inseridas: {resultado['inseridas']}   "
+                f"Duplicadas: {resultado['duplicadas']}   Rejeitadas: {resultado['rejeitadas']}\n"
+                f"{resultado['linhas_por_segundo']:.0f} linhas/s "
+                f"({resultado['segundos']:.1f}s, {resultado['metodo']})")
+
+    def _finalizar(self):
+        self._importando = False
+        self.barra.stop()
+        self.botao_importar.configure(state="normal", text="Importar")
+
+    def _importacao_concluida(self, resultado):
+        """
+        Exibe o resumo da importação e atualiza a janela chamadora.
+        """
+        self._finalizar()
+        self.barra.set(1)
+        self.label_status.configure(text=self._formatar(resultado))
+        mensagem = f"{resultado['inseridas']} registro(s) importado(s)."
+        if resultado["rejeitadas"]:
+            mensagem += (f"\n{resultado['rejeitadas']} linha(s) rejeitada(s); "
+                         f"veja {resultado['arquivo_rejeitados']}.")
+        messagebox.showinfo("Importação concluída", mensagem, parent=self)
+        if resultado["inseridas"] and self.atualizar_callback:
+            self.atualizar_callback()
+
+    def _importacao_falhou(self, erro):
+        """
+        Exibe o erro ocorrido durante a importação.
+        """
+        self._finalizar()
+        self.barra.set(0)
+        log_event("form_importacao", f"ERRO importar: {erro}")
+        messagebox.showerror("Erro", f"Falha ao importar: {erro}", parent=self)
@@ -3,6 +3,8 @@
 # Nome do Script: form_mestre_detalhe.py - Formulário Mestre-Detalhe (Aluno/Pets)
 # Descrição: Este script exibe um formulário de navegação mestre-detalhe,
 #            mostrando os dados do aluno (mestre) e seus pets associados (detalhe).
+#            Os alunos são lidos em faixas ao redor do aluno exibido (consultas
+#            pela matrícula), nunca a tabela inteira.
 #
 # Autor: Nome do aluno
 # Data de Criação:
@@ -10,9 +12,11 @@
 #
 # Dependências:
 # - customtkinter: Para criação da interface gráfica.
-# - tkinter.ttk: Para widget Treeview na tabela de pets.
-# - controller.aluno_controller: Para obter a lista de alunos.
-# - controller.pet_controller: Para obter a lista de pets.
+# - controller.aluno_controller: Para obter as faixas de alunos pela matrícula.
+# - controller.pet_controller: Para obter os pets do aluno (consulta pelo CPF).
+# - view.grade_virtual: Para a tabela de pets.
+# - view.executor_db: Para consultar o banco sem congelar a interface.
+# - view.cache_navegacao: Para manter e pré-carregar os pets dos alunos vizinhos.
 #
 # Uso: Execute a partir da janela principal no menu 'Arquivo' > 'Mestre-Detalhe'.
 # ==============================================================================
@@ -22,9 +26,16 @@
 
 import customtkinter as ctk
 from tkinter import messagebox
-from controller.aluno_controller import obter_alunos
-from controller.pet_controller import obter_pets
-from tkinter import ttk
+from controller.aluno_controller import obter_alunos_vizinhos
+from controller.pet_controller import obter_pets_por_cpf
+from view.grade_virtual import GradeVirtual, fonte_lista
+from view.executor_db import executar_em_segundo_plano
+from view.cache_navegacao import CacheNavegacao
+
+RAIO_PRE_CARREGAMENTO = 2  # Alunos antes e depois do atual com os pets já carregados
+TAMANHO_FAIXA = 50         # Alunos lidos por consulta ao navegar
+MARGEM_FAIXA = 10          # Lê a faixa seguinte quando faltam menos alunos que isso
+MAX_ALUNOS_MEMORIA = 200   # Alunos mantidos em memória ao redor do atual
 
 
 class FormMestreDetalhe(ctk.CTkToplevel):
@@ -32,7 +43,11 @@ class FormMestreDetalhe(ctk.CTkToplevel):
     Janela modal que implementa o padrão mestre-detalhe.
 
     A seção mestre exibe os dados do aluno (nome, curso, CPF) em campos
-    somente leitura, com botões de navegação (Anterior/Próximo).
+    somente leitura, com botões de navegação (Primeiro/Anterior/Próximo/
+    Último) e um campo para saltar direto a uma matrícula. Apenas uma
+    faixa de alunos ao redor do atual fica em memória (self.alunos); as
+    faixas vizinhas são lidas em segundo plano antes de o usuário chegar
+    ao fim da faixa.
     A seção detalhe exibe uma Treeview com os pets associados ao aluno
     atual, filtrados pelo CPF do dono.
 
@@ -42,14 +57,21 @@ class FormMestreDetalhe(ctk.CTkToplevel):
 
     def __init__(self, master=None):
         """
-        Inicializa o formulário mestre-detalhe, carrega a lista de alunos,
-        monta os campos de exibição, botões de navegação e a tabela de pets.
+        Inicializa o formulário mestre-detalhe, monta os campos de exibição,
+        botões de navegação e a tabela de pets, e carrega a primeira faixa de alunos.
         """
         super().__init__(master)
         self.title("Aluno e seus Pets")
         self.geometry("800x500")
-        self.alunos = obter_alunos()  # Carrega todos os alunos do banco
-        self.indice = 0  # Índice do aluno atualmente exibido
+        self.alunos = []  # Faixa de alunos em memória, em ordem de matrícula
+        self.indice = 0  # Posição do aluno exibido dentro de self.alunos
+        self._sem_anteriores = True   # A faixa começa no primeiro aluno da tabela
+        self._sem_seguintes = True    # A faixa termina no último aluno da tabela
+        self._faixas_carregando = set()  # 'antes'/'depois' com consulta em andamento
+        self._passo_pendente = 0      # Movimento que aguarda a próxima faixa chegar
+        self._geracao = 0  # Descarta faixas pedidas antes de um salto
+        self._consulta_pets = 0  # Descarta respostas de alunos que já ficaram para trás
+        self.cache_pets = CacheNavegacao(self, obter_pets_por_cpf)  # CPF -> pets
 
         # ─── Seção Mestre: Campos do aluno (somente leitura) ─────────────
         ctk.CTkLabel(self, text="Nome:").pack(pady=(10, 0))
@@ -67,18 +89,38 @@ class FormMestreDetalhe(ctk.CTkToplevel):
         # ─── Botões de navegação entre alunos ────────────────────────────
         nav_frame = ctk.CTkFrame(self)
         nav_frame.pack(pady=10)
-        ctk.CTkButton(nav_frame, text="<< Anterior", command=self.anterior).pack(side="left", padx=10)
-        ctk.CTkButton(nav_frame, text="Próximo >>", command=self.proximo).pack(side="left", padx=10)
+        ctk.CTkButton(nav_frame, text="|<< Primeiro", width=100, command=self.primeiro).pack(side="left", padx=5)
+        ctk.CTkButton(nav_frame, text="<< Anterior", width=100, command=self.anterior).pack(side="left", padx=5)
+        ctk.CTkButton(nav_frame, text="Próximo >>", width=100, command=self.proximo).pack(side="left", padx=5)
+        ctk.CTkButton(nav_frame, text="Último >>|", width=100, command=self.ultimo).pack(side="left", padx=5)
+        self.entry_ir = ctk.CTkEntry(nav_frame, placeholder_text="Matrícula", width=120)
+        self.entry_ir.pack(side="left", padx=(20, 5))
+        self.entry_ir.bind("<Return>", lambda e: self.ir_para_matricula())
+        ctk.CTkButton(nav_frame, text="Ir", width=50, command=self.ir_para_matricula).pack(side="left", padx=5)
 
         # ─── Seção Detalhe: Tabela de Pets do aluno ─────────────────────
         ctk.CTkLabel(self, text="Pets do aluno:").pack(pady=(20, 0))
-        self.tree_pets = ttk.Treeview(self, columns=("id", "apelido", "raca", "data_nascimento"), show="headings")
-        for col in self.tree_pets["columns"]:
-            self.tree_pets.heading(col, text=col.capitalize())
-        self.tree_pets.pack(fill="both", expand=True, padx=20, pady=(5, 20))
+        carregar_vazia, contar_vazia = fonte_lista([])
+        self.grade_pets = GradeVirtual(
+            self,
+            colunas=[("Id", "Id", 60), ("apelido", "Apelido", 200), ("raca", "Raca", 200),
+                     ("data_nascimento", "Data_nascimento", 150)],
+            chave="Id",
+            carregar_pagina=carregar_vazia,
+            contar=contar_vazia,
+            ao_carregar=self._pets_carregados,
+            ao_falhar=self._falha_carregar
+        )
+        self.grade_pets.pack(fill="both", expand=True, padx=20, pady=(5, 5))
+        self.tree_pets = self.grade_pets.tree
+
+        # Indicador de carregamento (as consultas rodam em segundo plano)
+        self.label_status = ctk.CTkLabel(self, text="Carregando alunos...")
+        self.label_status.pack(pady=(0, 10))
 
         self._center_window()
-        self.mostrar_aluno()  # Exibe o primeiro aluno da lista
+        # Carrega a primeira faixa sem bloquear a janela; o primeiro aluno é exibido ao terminar
+        self.primeiro()
 
     def _center_window(self):
         """
@@ -93,6 +135,128 @@ class FormMestreDetalhe(ctk.CTkToplevel):
         y = (sh // 2) - (h // 2)
         self.geometry(f"{w}x{h}+{x}+{y}")
 
+    # ─── Faixas de alunos ────────────────────────────────────────────
+
+    def _saltar(self, matricula=None, sentido="depois", incluir=False):
+        """
+        Descarta a faixa atual e lê uma nova a partir de uma posição: o
+        início (matricula None, 'depois'), o fim (None, 'antes') ou uma matrícula.
+        """
+        self._geracao += 1
+        geracao = self._geracao
+        self._faixas_carregando.clear()
+        self._passo_pendente = 0
+        self.label_status.configure(text="Carregando alunos...")
+        executar_em_segundo_plano(
+            self, obter_alunos_vizinhos, matricula, sentido, TAMANHO_FAIXA, incluir,
+            ao_concluir=lambda alunos: self._salto_concluido(alunos, matricula, sentido, geracao),
+            ao_falhar=self._falha_carregar
+        )
+
+    def _salto_concluido(self, alunos, matricula, sentido, geracao):
+        """
+        Recebe a faixa lida por _saltar e exibe o aluno de destino.
+        """
+        if geracao != self._geracao:
+            return
+        if not alunos:
+            if matricula is None:
+                self.alunos = []
+                self.label_status.configure(text="Nenhum aluno cadastrado.")
+            else:
+                messagebox.showinfo("Aviso", f"Nenhum aluno com matrícula igual ou posterior a {matricula}.")
+                if self.alunos:
+                    self.mostrar_aluno()
+            return
+        fim_da_tabela = len(alunos) < TAMANHO_FAIXA
+        self.alunos = alunos
+        if sentido == "depois":
+            self.indice = 0
+            self._sem_anteriores = matricula is None
+            self._sem_seguintes = fim_da_tabela
+        else:
+            self.indice = len(alunos) - 1
+            self._sem_anteriores = fim_da_tabela
+            self._sem_seguintes = matricula is None
+        self.mostrar_aluno()
+
+    def _ler_faixa(self, sentido):
+        """
+        Lê em segundo plano os alunos logo antes ou depois da faixa em memória.
+        """
+        if sentido in self._faixas_carregando or not self.alunos:
+            return
+        self._faixas_carregando.add(sentido)
+        referencia = self.alunos[-1 if sentido == "depois" else 0]["matricula"]
+        geracao = self._geracao
+        executar_em_segundo_plano(
+            self, obter_alunos_vizinhos, referencia, sentido, TAMANHO_FAIXA,
+            ao_concluir=lambda alunos: self._faixa_lida(alunos, sentido, geracao),
+            ao_falhar=lambda erro: self._faixa_falhou(erro, sentido, geracao)
+        )
+
+    def _faixa_lida(self, alunos, sentido, geracao):
+        """
+        Junta a faixa lida à faixa em memória, descartando os alunos mais
+        distantes do atual além de MAX_ALUNOS_MEMORIA.
+        """
+        if geracao != self._geracao:
+            return
+        self._faixas_carregando.discard(sentido)
+        fim_da_tabela = len(alunos) < TAMANHO_FAIXA
+        # Não corta a borda oposta se a faixa dela ainda está a caminho: ela
+        # foi pedida a partir do aluno da borda e precisa encaixar ali
+        if sentido == "depois":
+            self.alunos.extend(alunos)
+            self._sem_seguintes = fim_da_tabela
+            excesso = len(self.alunos) - MAX_ALUNOS_MEMORIA
+            if excesso > 0 and "antes" not in self._faixas_carregando:
+                del self.alunos[:excesso]
+                self.indice -= excesso
+                self._sem_anteriores = False
+        else:
+            self.alunos[:0] = alunos
+            self.indice += len(alunos)
+            self._sem_anteriores = fim_da_tabela
+            excesso = len(self.alunos) - MAX_ALUNOS_MEMORIA
+            if excesso > 0 and "depois" not in self._faixas_carregando:
+                del self.alunos[-excesso:]
+                self._sem_seguintes = False
+
+        passo = self._passo_pendente
+        if passo and (passo > 0) == (sentido == "depois"):
+            # O movimento pendente é desta faixa; conta a partir da borda anterior
+            self._passo_pendente = 0
+            self.indice = len(self.alunos) - len(alunos) - 1 if passo > 0 else len(alunos)
+            self._mover(passo)
+        else:
+            # Os vizinhos do aluno atual podem ter acabado de chegar
+            self.cache_pets.pre_carregar(self._cpfs_vizinhos())
+
+    def _faixa_falhou(self, erro, sentido, geracao):
+        if geracao != self._geracao:
+            return
+        self._faixas_carregando.discard(sentido)
+        if (self._passo_pendente > 0) == (sentido == "depois"):
+            self._passo_pendente = 0  # O movimento aguardava esta faixa
+        self._falha_carregar(erro)
+
+    def _completar_faixa(self):
+        """
+        Pede a faixa seguinte (ou anterior) quando o aluno atual está perto da borda.
+        """
+        if not self._sem_seguintes and self.indice >= len(self.alunos) - MARGEM_FAIXA:
+            self._ler_faixa("depois")
+        if not self._sem_anteriores and self.indice < MARGEM_FAIXA:
+            self._ler_faixa("antes")
+
+    def _falha_carregar(self, erro):
+        """
+        Exibe o erro de carregamento no indicador de status e em uma mensagem.
+        """
+        self.label_status.configure(text="Falha ao carregar dados.")
+        messagebox.showerror("Erro", f"Falha ao carregar dados: {erro}")
+
     def mostrar_aluno(self):
         """
         Exibe os dados do aluno na posição atual do índice de navegação.
@@ -124,35 +288,119 @@ class FormMestreDetalhe(ctk.CTkToplevel):
 
         # Atualiza a tabela de pets filtrada pelo CPF do aluno
         self.mostrar_pets(aluno["cpf"])
+        self._completar_faixa()
 
     def mostrar_pets(self, cpf):
         """
-        Filtra e exibe na Treeview apenas os pets cujo CPF do dono
-        corresponde ao CPF do aluno atualmente selecionado.
+        Recarrega a tabela de pets com os pets cujo CPF do dono corresponde
+        ao CPF do aluno atualmente selecionado. Os pets são lidos em segundo
+        plano com uma única consulta pelo índice de pets.cpf, ou vêm na hora
+        do cache de navegação se já foram pré-carregados. Em seguida, os pets
+        dos alunos vizinhos são pré-carregados.
 
         Args:
             cpf (str): CPF do aluno para filtrar os pets associados.
         """
-        self.tree_pets.delete(*self.tree_pets.get_children())  # Limpa a tabela
-        for pet in obter_pets():
-            # Compara como string para garantir compatibilidade de tipos
-            if str(pet["cpf"]) == str(cpf):
-                self.tree_pets.insert("", "end", values=(pet["Id"], pet["apelido"], pet["raca"], pet["data_nascimento"]))
+        self.label_status.configure(text="Carregando pets...")
+        self._consulta_pets += 1
+        consulta = self._consulta_pets
+        inicio = max(0, self.indice - RAIO_PRE_CARREGAMENTO)
+        self.cache_pets.manter_janela(
+            a["cpf"] for a in self.alunos[inicio:self.indice + RAIO_PRE_CARREGAMENTO + 1]
+        )
+        self.cache_pets.obter(cpf, ao_concluir=lambda pets: self._exibir_pets(pets, consulta),
+                              ao_falhar=self._falha_carregar)
+        self.cache_pets.pre_carregar(self._cpfs_vizinhos())
+
+    def _cpfs_vizinhos(self):
+        """
+        CPFs dos alunos ao redor do atual, do mais próximo ao mais distante
+        (próximo, anterior, o seguinte ao próximo...).
+        """
+        cpfs = []
+        for distancia in range(1, RAIO_PRE_CARREGAMENTO + 1):
+            for indice in (self.indice + distancia, self.indice - distancia):
+                if 0 <= indice < len(self.alunos):
+                    cpfs.append(self.alunos[indice]["cpf"])
+        return cpfs
+
+    def _exibir_pets(self, pets, consulta):
+        """
+        Exibe na tabela os pets lidos, se o usuário ainda estiver no mesmo aluno.
+        """
+        if consulta != self._consulta_pets:
+            return  # Já navegou para outro aluno; a consulta dele está a caminho
+        self.grade_pets.definir_linhas(pets)
+
+    def _pets_carregados(self, total):
+        """
+        Atualiza o indicador de status após a recarga da tabela de pets.
+        """
+        if not self.alunos:
+            return
+        self.label_status.configure(
+            text=f"Matrícula {self.alunos[self.indice]['matricula']} - {total} pet(s)"
+        )
+
+    def _mover(self, passo):
+        """
+        Exibe o aluno 'passo' posições adiante (ou atrás, se negativo). Se
+        ele ainda não estiver em memória, é exibido assim que a faixa chegar.
+        """
+        novo = self.indice + passo
+        if 0 <= novo < len(self.alunos):
+            # Este movimento substitui um que ainda aguardava faixa (ex.: avançou
+            # além da borda e voltou antes de a faixa seguinte chegar)
+            self._passo_pendente = 0
+            self.indice = novo
+            self.mostrar_aluno()
+        elif passo > 0 and not self._sem_seguintes:
+            # Passos além do último aluno em memória; cliques repetidos se acumulam
+            if self._passo_pendente > 0:
+                self._passo_pendente += passo
+            else:
+                self._passo_pendente = novo - (len(self.alunos) - 1)
+            self._ler_faixa("depois")
+        elif passo < 0 and not self._sem_anteriores:
+            if self._passo_pendente < 0:
+                self._passo_pendente += passo
+            else:
+                self._passo_pendente = novo
+            self._ler_faixa("antes")
+        else:
+            self._passo_pendente = 0  # Início ou fim da tabela: nada a aguardar
 
     def proximo(self):
         """
-        Avança para o próximo aluno na lista, se não estiver no último.
+        Avança para o próximo aluno, se não estiver no último.
         Atualiza a exibição do mestre e detalhe.
         """
-        if self.indice < len(self.alunos) - 1:
-            self.indice += 1
-            self.mostrar_aluno()
+        self._mover(1)
 
     def anterior(self):
         """
-        Retorna ao aluno anterior na lista, se não estiver no primeiro.
+        Retorna ao aluno anterior, se não estiver no primeiro.
         Atualiza a exibição do mestre e detalhe.
         """
-        if self.indice > 0:
-            self.indice -= 1
-            self.mostrar_aluno()
+        self._mover(-1)
+
+    def primeiro(self):
+        """
+        Exibe o aluno de menor matrícula.
+        """
+        self._saltar(None, "depois")
+
+    def ultimo(self):
+        """
+        Exibe o aluno de maior matrícula.
+        """
+        self._saltar(None, "antes")
+
+    def ir_para_matricula(self):
+        """
+        Exibe o aluno com a matrícula digitada (ou, se ela não existir, o
+        aluno com a matrícula seguinte).
+        """
+        matricula = self.entry_ir.get().strip()
+        if matricula:
+            self._saltar(matricula, "depois", incluir=True)
@@ -12,6 +12,9 @@
 # - customtkinter: Para criação da interface gráfica.
 # - PIL: Para manipulação e redimensionamento de imagens.
 # - controller.pet_controller: Para operações de banco de dados de pets.
+# - controller.midia_controller: Para preparar a foto escolhida antes de gravá-la.
+# - view.cache_imagens: Para carregar a miniatura da foto gravada em segundo plano (com cache).
+# - view.executor_db: Para carregar, gravar e excluir o pet sem bloquear a interface.
 # - logger: Para registro de eventos do sistema.
 #
 # Uso: Abra a grade de pets e clique em 'Adicionar' ou 'Editar' para usar este formulário.
@@ -28,6 +31,9 @@ if root_dir not in sys.path:
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 from controller.pet_controller import salvar_pet, obter_pet_por_id, deletar_pet
+from controller.midia_controller import preparar_foto, resumo_preparacao
+from view.cache_imagens import carregar_foto_em_segundo_plano
+from view.executor_db import executar_em_segundo_plano
 from PIL import Image, ImageTk
 from io import BytesIO
 from logger import log_event
@@ -44,7 +50,9 @@ class FormPets(ctk.CTkToplevel):
     Parâmetros:
         master: Janela principal que chama este formulário.
         pet_id: ID do pet para edição (opcional, None para novo cadastro).
-        atualizar_callback: Função callback para atualizar a lista após salvar/editar.
+        atualizar_callback: Função callback(acao, pet_id, linha) chamada após
+                            salvar ou excluir, com acao 'inserido', 'alterado'
+                            ou 'excluido', para a grade atualizar só esta linha.
     """
 
     def __init__(self, master=None, pet_id=None, atualizar_callback=None):
@@ -59,8 +67,10 @@ class FormPets(ctk.CTkToplevel):
         self.resizable(False, False)
         self.pet_id = pet_id
         self.atualizar_callback = atualizar_callback
-        self.foto_bytes = None  # Armazena a foto em bytes para gravação no banco
+        self.foto_bytes = None  # Foto nova escolhida, em bytes, para gravação no banco
+        self.foto_hash = None   # Foto já gravada do pet (tabela midias)
         self._photo_image = None  # Referência para ImageTk (evita garbage collection)
+        self._ocupado = False     # Gravação ou exclusão em andamento
 
         # Torna este form modal (bloqueia interação com a janela pai)
         self.transient(master)
@@ -87,6 +97,10 @@ class FormPets(ctk.CTkToplevel):
         ctk.CTkLabel(self, text="Foto:", anchor="w").pack(fill="x", padx=20, pady=(10, 0))
         self.photo_label = ctk.CTkLabel(self, text="Sem foto", width=120, height=160)
         self.photo_label.pack(padx=20, pady=(0, 10))
+
+        # Resultado da preparação da foto escolhida (tamanho antes e depois)
+        self.lbl_foto_info = ctk.CTkLabel(self, text="", font=("Arial", 11))
+        self.lbl_foto_info.pack(padx=20)
         self.botao_foto = ctk.CTkButton(self, text="Selecionar Foto", command=self.selecionar_foto)
         self.botao_foto.pack(pady=(0, 20))
 
@@ -98,10 +112,15 @@ class FormPets(ctk.CTkToplevel):
         self.botao_salvar.grid(row=0, column=0, padx=5)
         self.botao_excluir = ctk.CTkButton(botoes_frame, text="Excluir", fg_color="red", command=self.excluir)
         self.botao_excluir.grid(row=0, column=1, padx=5)
-        self.botao_cancelar = ctk.CTkButton(botoes_frame, text="Cancelar", command=self.destroy)
+        self.botao_cancelar = ctk.CTkButton(botoes_frame, text="Cancelar", command=self.fechar)
         self.botao_cancelar.grid(row=0, column=2, padx=5)
+        self.protocol("WM_DELETE_WINDOW", self.fechar)
+
+        # Indicador de operação em andamento ("Carregando...", "Salvando...", "Excluindo...")
+        self.label_status = ctk.CTkLabel(self, text="")
+        self.label_status.pack(pady=(0, 5))
 
-        # Se for edição (já recebeu pet_id), carrega dados do banco
+        # Se for edição (já recebeu pet_id), carrega dados do banco em segundo plano
         if self.pet_id:
             self.carregar_dados()
         else:
@@ -127,52 +146,99 @@ class FormPets(ctk.CTkToplevel):
     def selecionar_foto(self):
         """
         Permite ao usuário selecionar uma foto do pet via diálogo de arquivo.
-        Redimensiona a imagem para 120x160, exibe no label e armazena os
-        bytes originais em self.foto_bytes para gravação no banco (LONGBLOB).
+        A foto é preparada (orientação, metadados, resolução e compressão),
+        exibida em 120x160 e guardada em self.foto_bytes para gravação no
+        banco (tabela midias).
         """
-        caminho = filedialog.askopenfilename(filetypes=[("Imagens", "*.jpg *.jpeg *.png")], title="Selecionar Foto")
+        caminho = filedialog.askopenfilename(filetypes=[("Imagens", "*.jpg *.jpeg *.png *.webp *.bmp")], title="Selecionar Foto")
         if not caminho:
             return
         try:
-            img = Image.open(caminho)
+            # Gira, remove metadados, limita a resolução e recodifica (conexao.con)
+            conteudo, relatorio = preparar_foto(caminho)
+            img = Image.open(BytesIO(conteudo))
             img = img.resize((120, 160), Image.LANCZOS)  # Redimensiona com filtro de alta qualidade
             self._photo_image = ImageTk.PhotoImage(img)
             self.photo_label.configure(image=self._photo_image, text="")
-            # Lê o arquivo original em bytes para armazenar no banco
-            with open(caminho, "rb") as f:
-                self.foto_bytes = f.read()
+            self.lbl_foto_info.configure(text=resumo_preparacao(relatorio))
+            self.foto_bytes = conteudo
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar imagem: {e}")
 
     def carregar_dados(self):
         """
-        Carrega os dados do pet selecionado para edição, preenchendo
-        os campos do formulário. Também carrega a foto do pet, se existir.
+        Carrega os dados do pet selecionado para edição em segundo plano.
+        Até a resposta chegar, os campos e botões ficam desabilitados e o status
+        mostra "Carregando..." (apenas Cancelar continua ativo).
+        """
+        self._habilitar_campos(False)
+        self._ocupar("Carregando...", permite_fechar=True)
+        executar_em_segundo_plano(
+            self, obter_pet_por_id, self.pet_id,
+            ao_concluir=self._dados_carregados,
+            ao_falhar=self._falha_carregar
+        )
+
+    def _dados_carregados(self, pet):
         """
-        pet = obter_pet_por_id(self.pet_id)
+        Preenche os campos com o pet lido e reabilita o formulário. Os campos
+        vêm de uma consulta sem a foto; a foto, se existir, é carregada em
+        segundo plano.
+        """
+        self._habilitar_campos(True)
+        self._liberar()
         if not pet:
+            self.label_status.configure(text="Pet não encontrado.")
             return
         self.entry_apelido.insert(0, pet["apelido"])
         self.entry_raca.insert(0, pet["raca"])
         self.entry_nascimento.insert(0, pet["data_nascimento"])
-        self.entry_cpf.insert(0, pet["cpf"])
-        # Carrega a foto armazenada no banco (LONGBLOB) se existir
-        foto = pet["foto"]
-        if foto:
-            try:
-                img = Image.open(BytesIO(foto))  # Converte bytes para imagem PIL
-                img = img.resize((120, 160), Image.LANCZOS)
-                self._photo_image = ImageTk.PhotoImage(img)
-                self.photo_label.configure(image=self._photo_image, text="")
-                self.foto_bytes = foto
-            except:
-                pass
+        self.entry_cpf.insert(0, pet["cpf"] or "")
+        # Carrega a miniatura 120x160 gravada com a foto (a original não é lida),
+        # reaproveitada do cache se este pet (ou a mesma foto) já foi aberto
+        self.foto_hash = pet["foto_hash"]
+        if self.foto_hash:
+            self.photo_label.configure(text="Carregando foto...")
+            hash_midia = self.foto_hash
+            carregar_foto_em_segundo_plano(
+                self, hash_midia, ("pet", self.pet_id),
+                ao_concluir=lambda photo: self._foto_carregada(hash_midia, photo),
+                ao_falhar=self._foto_falhou
+            )
+
+    def _falha_carregar(self, erro):
+        """Mantém o formulário desabilitado (só Cancelar) e exibe o erro da leitura."""
+        log_event("form_pets", f"ERRO ao carregar pet: {erro}")
+        self.label_status.configure(text="Falha ao carregar pet.")
+        messagebox.showerror("Erro", f"Falha ao carregar pet: {erro}")
+
+    def _habilitar_campos(self, habilitar):
+        """Habilita ou desabilita os campos de entrada."""
+        estado = "normal" if habilitar else "disabled"
+        for campo in (self.entry_apelido, self.entry_raca, self.entry_nascimento, self.entry_cpf):
+            campo.configure(state=estado)
+
+    def _foto_carregada(self, hash_midia, photo):
+        """Exibe a foto lida em segundo plano, se o usuário não a trocou nesse meio-tempo."""
+        if self.foto_bytes is not None or self.foto_hash != hash_midia:
+            return
+        self._photo_image = photo
+        if photo:
+            self.photo_label.configure(image=self._photo_image, text="")
+        else:
+            self.photo_label.configure(text="Sem foto")
+
+    def _foto_falhou(self, erro):
+        log_event("form_pets", f"ERRO ao carregar foto: {erro}")
+        if self.foto_bytes is None:
+            self.photo_label.configure(text="Foto indisponível")
 
     def salvar(self):
         """
         Coleta os dados dos campos do formulário e salva o pet no banco
         de dados (INSERT ou UPDATE conforme existência do pet_id).
-        Executa o callback de atualização e fecha o formulário.
+        A gravação roda em segundo plano; ao concluir, executa o callback
+        de atualização e fecha o formulário.
         """
         dados = {
             "id": self.pet_id,
@@ -180,22 +246,79 @@ class FormPets(ctk.CTkToplevel):
             "raca": self.entry_raca.get().strip(),
             "data_nascimento": self.entry_nascimento.get().strip(),
             "cpf": self.entry_cpf.get().strip(),
-            "foto": self.foto_bytes
+            "foto": self.foto_bytes,
+            "foto_hash": self.foto_hash
         }
-        salvar_pet(dados)
+        self._ocupar("Salvando...")
+        executar_em_segundo_plano(
+            self, salvar_pet, dados,
+            ao_concluir=self._gravado,
+            # Ex.: CPF que não pertence a nenhum aluno (chave estrangeira pets.cpf)
+            ao_falhar=lambda erro: self._falha(erro, "Falha ao salvar pet")
+        )
+
+    def _gravado(self, resultado):
+        """Atualiza a grade com o pet gravado em segundo plano e fecha o formulário."""
+        pet_id, linha = resultado
+        self._ocupado = False
         if self.atualizar_callback:
-            self.atualizar_callback()  # Atualiza a grid de pets na janela pai
+            # Atualiza apenas a linha deste pet na grid da janela pai
+            self.atualizar_callback("alterado" if self.pet_id else "inserido", pet_id, linha)
         self.destroy()
 
     def excluir(self):
         """
         Exclui o pet atual do banco de dados após confirmação do usuário.
-        Executa o callback de atualização e fecha o formulário.
+        A exclusão roda em segundo plano; ao concluir, executa o callback de
+        atualização e fecha o formulário.
         """
         if not self.pet_id:
             return
         if messagebox.askyesno("Confirmação", "Deseja realmente excluir este pet?"):
-            deletar_pet(self.pet_id)
-            if self.atualizar_callback:
-                self.atualizar_callback()  # Atualiza a grid de pets na janela pai
-            self.destroy()
+            self._ocupar("Excluindo...")
+            executar_em_segundo_plano(
+                self, deletar_pet, self.pet_id,
+                ao_concluir=self._excluido,
+                ao_falhar=lambda erro: self._falha(erro, "Falha ao excluir pet")
+            )
+
+    def _excluido(self, pet_id):
+        """Retira o pet da grade e fecha o formulário após a exclusão."""
+        self._ocupado = False
+        if self.atualizar_callback:
+            self.atualizar_callback("excluido", pet_id, None)  # Retira a linha da grid
+        self.destroy()
+
+    def _falha(self, erro, mensagem):
+        """Reabilita os botões e exibe o erro da gravação ou exclusão."""
+        log_event("form_pets", f"ERRO: {mensagem}: {erro}")
+        self._liberar()
+        messagebox.showerror("Erro", f"{mensagem}: {erro}")
+
+    def _ocupar(self, texto, permite_fechar=False):
+        """
+        Exibe o texto no status e desabilita os botões enquanto o banco responde.
+        Com permite_fechar (leitura), Cancelar continua ativo.
+        """
+        self._ocupado = not permite_fechar
+        self.label_status.configure(text=texto)
+        for botao in (self.botao_foto, self.botao_salvar, self.botao_excluir):
+            botao.configure(state="disabled")
+        self.botao_cancelar.configure(state="normal" if permite_fechar else "disabled")
+
+    def _liberar(self):
+        """Limpa o status e reabilita os botões (Excluir só para pet já gravado)."""
+        self._ocupado = False
+        self.label_status.configure(text="")
+        for botao in (self.botao_foto, self.botao_salvar, self.botao_cancelar):
+            botao.configure(state="normal")
+        self.botao_excluir.configure(state="normal" if self.pet_id else "disabled")
+
+    def fechar(self):
+        """
+        Fecha o formulário. Durante uma gravação ou exclusão a janela fica aberta,
+        para que o retorno do banco ainda atualize a grade.
+        """
+        if self._ocupado:
+            return
+        self.destroy()
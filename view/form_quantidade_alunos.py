@@ -12,6 +12,7 @@
 # - customtkinter: Para criação da interface gráfica.
 # - matplotlib: Para geração de gráficos.
 # - controller.aluno_controller: Para obter contagem de alunos.
+# - view.executor_db: Para consultar o banco sem congelar a interface.
 #
 # Uso: Execute a partir da janela principal para visualizar o gráfico de quantidade.
 # ==============================================================================
@@ -23,6 +24,7 @@ import customtkinter as ctk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 from controller.aluno_controller import contar_alunos
+from view.executor_db import executar_em_segundo_plano
 
 class FormQuantidadeAlunos(ctk.CTkToplevel):
     """
@@ -37,15 +39,32 @@ class FormQuantidadeAlunos(ctk.CTkToplevel):
 
     def __init__(self, master=None):
         """
-        Inicializa o formulário de gráfico de quantidade, consulta o
-        total de alunos via controller e renderiza o gráfico de barras.
+        Inicializa o formulário de gráfico de quantidade e consulta o
+        total de alunos em segundo plano; o gráfico é desenhado quando
+        a contagem chega.
         """
         super().__init__(master)
         self.title("Gráfico de Quantidade de Alunos")
         self.geometry("500x400")
 
-        # Consulta a contagem total de alunos via controller
-        total_alunos = contar_alunos()
+        # Indicador de carregamento exibido até o gráfico ficar pronto
+        self.label_status = ctk.CTkLabel(self, text="Carregando dados...")
+        self.label_status.pack(pady=20)
+
+        # Centraliza a janela na tela
+        self._center_window()
+
+        # Consulta a contagem total de alunos via controller, fora da thread da interface
+        executar_em_segundo_plano(self, contar_alunos, ao_concluir=self._desenhar_grafico)
+
+    def _desenhar_grafico(self, total_alunos):
+        """
+        Renderiza o gráfico de barras com o total de alunos.
+
+        Args:
+            total_alunos (int): Número total de alunos cadastrados.
+        """
+        self.label_status.destroy()
 
         # Cria o gráfico de barras com matplotlib
         fig, ax = plt.subplots()
@@ -58,9 +77,6 @@ class FormQuantidadeAlunos(ctk.CTkToplevel):
         canvas.get_tk_widget().pack(fill="both", expand=True)
         canvas.draw()
 
-        # Centraliza a janela na tela
-        self._center_window()
-
     def _center_window(self):
         """
         Centraliza a janela no centro da tela do usuário.
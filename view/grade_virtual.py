@@ -0,0 +1,544 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: grade_virtual.py - Grade (Treeview) com rolagem virtual
+# Descrição: Este script fornece uma grade que mantém na Treeview apenas as
+#            linhas visíveis (mais uma pequena margem), buscando no banco, em
+#            segundo plano, os blocos de linhas conforme o usuário rola. Abrir
+#            uma grade com centenas de milhares de registros custa o mesmo que
+#            abrir uma com poucas dezenas.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - customtkinter: Para o quadro que contém a grade.
+# - tkinter.ttk: Para os widgets Treeview e Scrollbar.
+# - view.executor_db: Para buscar os blocos sem congelar a interface.
+# - logger: Para registro de logs de eventos.
+#
+# Uso: Usada por GridAlunos, GridPets e FormMestreDetalhe:
+#          self.grade = GradeVirtual(self, colunas, "matricula",
+#                                    obter_pagina_alunos, contar_alunos)
+#          self.grade.pack(fill="both", expand=True)
+#          self.grade.recarregar()
+# ==============================================================================
+
+# view/grade_virtual.py
+# Treeview virtualizada com carregamento sob demanda
+
+import customtkinter as ctk
+from tkinter import ttk
+from view.executor_db import executar_em_segundo_plano
+from logger import log_event
+
+TAMANHO_BLOCO = 200     # Linhas buscadas por consulta (uma página do controller)
+MARGEM_LINHAS = 5       # Linhas extras mantidas na Treeview abaixo das visíveis
+MAX_BLOCOS_CACHE = 20   # Blocos guardados em memória (os mais distantes são descartados)
+ALTURA_LINHA_PADRAO = 20
+ALTURA_CABECALHO = 25
+
+
+def fonte_lista(linhas):
+    """
+    Cria as funções (carregar_pagina, contar) de uma grade a partir de uma
+    lista já carregada, como o resultado de uma busca.
+    """
+    def carregar_pagina(tamanho_pagina, ordenar_por=None, ordem="asc", cursor=None, deslocamento=0):
+        # As páginas desta fonte não têm cursores: a grade sempre pede pela posição
+        ordenadas = linhas
+        if ordenar_por:
+            # Mesma ordem do banco: NULL primeiro e texto sem diferenciar maiúsculas
+            def valor(linha):
+                v = linha.get(ordenar_por)
+                return (v is not None, v.casefold() if isinstance(v, str) else (0 if v is None else v))
+            ordenadas = sorted(linhas, key=valor, reverse=(ordem == "desc"))
+        itens = [] if cursor else ordenadas[deslocamento:deslocamento + tamanho_pagina]
+        return {"itens": itens, "proxima": None, "anterior": None}
+    return carregar_pagina, lambda: len(linhas)
+
+
+class GradeVirtual(ctk.CTkFrame):
+    """
+    Quadro com uma Treeview e uma barra de rolagem vertical que exibe uma
+    tabela inteira sem inserir todas as linhas na Treeview.
+
+    A barra de rolagem representa o total de registros (obtido com 'contar');
+    a Treeview recebe somente as linhas da janela visível, reaproveitando os
+    mesmos itens a cada rolagem. Os blocos vizinhos são buscados com o cursor
+    da página já carregada (paginação por chave); saltos pela barra de
+    rolagem partem do cursor do bloco em memória mais próximo e pulam só as
+    linhas entre ele e o destino (ou, sem nenhum bloco útil, desde o início).
+
+    Parâmetros:
+        master: Widget pai.
+        colunas (list[tuple]): (campo, título, largura) de cada coluna.
+        chave (str): Campo que identifica a linha (ex.: 'matricula', 'Id').
+        carregar_pagina: Função(tamanho_pagina, ordenar_por, ordem, cursor=..,
+                         deslocamento=..) que retorna {"itens", "proxima",
+                         "anterior"} (ex.: obter_pagina_alunos).
+        contar: Função() que retorna o total de registros (ex.: contar_alunos).
+        ordenar_por (str): Coluna de ordenação inicial (padrão: a chave).
+        ordem (str): 'asc' ou 'desc'.
+        ordenacoes (tuple[str]): Colunas que podem ser ordenadas clicando no
+                                 cabeçalho (ex.: ORDENACOES_ALUNOS). A
+                                 ordenação é feita pelo banco.
+        ao_carregar: Callback(total) chamado após cada recarga.
+        ao_falhar: Callback(exceção) chamado se uma consulta falhar.
+    """
+
+    def __init__(self, master, colunas, chave, carregar_pagina, contar, ordenar_por=None,
+                 ordem="asc", ordenacoes=(), ao_carregar=None, ao_falhar=None):
+        super().__init__(master, fg_color="transparent")
+        self.colunas = colunas
+        self.chave = chave
+        self.carregar_pagina = carregar_pagina
+        self.contar = contar
+        self.ordenar_por = ordenar_por or chave
+        self.ordem = ordem
+        self.ordenacoes = ordenacoes
+        self.ao_carregar = ao_carregar
+        self.ao_falhar = ao_falhar
+
+        self.total = 0
+        self._topo = 0              # Índice do primeiro registro visível
+        self._visiveis = 1          # Linhas que cabem na Treeview
+        self._blocos = {}           # índice do bloco -> página retornada pelo controller
+        self._carregando = set()    # Blocos com consulta em andamento
+        self._versao = 0            # Descarta respostas de recargas já superadas
+        self._selecionados = []     # Chaves selecionadas (inclusive fora da janela visível)
+        self._foco = None           # Chave da linha em foco
+        self._renderizando = False
+        self._modificador = False   # Ctrl/Shift pressionado no último clique
+
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in colunas], show="headings")
+        for campo, titulo, largura in colunas:
+            self.tree.heading(campo, text=titulo)
+            if campo in ordenacoes:
+                self.tree.heading(campo, command=lambda c=campo: self._cabecalho_clicado(c))
+            self.tree.column(campo, width=largura)
+        self._indicar_ordenacao()
+        self.barra = ttk.Scrollbar(self, orient="vertical", command=self._rolar)
+        self.barra.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<Configure>", self._redimensionado)
+        self.tree.bind("<<TreeviewSelect>>", self._selecao_alterada)
+        self.tree.bind("<Button-1>", self._clique, add="+")
+        self.tree.bind("<MouseWheel>", self._roda_mouse)
+        self.tree.bind("<Button-4>", lambda e: self._rolar("scroll", -3, "units") or "break")
+        self.tree.bind("<Button-5>", lambda e: self._rolar("scroll", 3, "units") or "break")
+        self.tree.bind("<Up>", lambda e: self._mover_foco(-1))
+        self.tree.bind("<Down>", lambda e: self._mover_foco(1))
+        self.tree.bind("<Prior>", lambda e: self._mover_foco(-self._visiveis))
+        self.tree.bind("<Next>", lambda e: self._mover_foco(self._visiveis))
+
+    # ─── Dados ───────────────────────────────────────────────────────────
+
+    def recarregar(self):
+        """
+        Descarta os blocos em memória e a seleção, reconta os registros e
+        exibe novamente a posição atual (ou o fim da lista, se ela diminuiu).
+        """
+        log_event("grade_virtual", f"recarregar {self.chave}")
+        self._versao += 1
+        versao = self._versao
+        self._blocos.clear()
+        self._carregando.clear()
+        self._selecionados, self._foco = [], None
+        executar_em_segundo_plano(
+            self, self.contar,
+            ao_concluir=lambda total: self._total_carregado(total, versao),
+            ao_falhar=self._falhou
+        )
+
+    def definir_fonte(self, carregar_pagina, contar):
+        """Troca a origem dos dados (ex.: tabela inteira ou resultado de busca) e recarrega do início."""
+        self.carregar_pagina = carregar_pagina
+        self.contar = contar
+        self._topo = 0
+        self.recarregar()
+
+    def definir_linhas(self, linhas):
+        """
+        Exibe uma lista já carregada (ex.: vinda de um cache) na hora, sem
+        passar pelas threads de trabalho. Equivale a definir_fonte(*fonte_lista(linhas)).
+        """
+        self.carregar_pagina, self.contar = fonte_lista(linhas)
+        self._versao += 1
+        self._blocos.clear()
+        self._carregando.clear()
+        self._selecionados, self._foco = [], None
+        self._topo = 0
+        if linhas:
+            self._blocos[0] = self.carregar_pagina(TAMANHO_BLOCO, self.ordenar_por, self.ordem)
+        self._total_carregado(len(linhas), self._versao)
+
+    def ordenar(self, ordenar_por, ordem="asc"):
+        """Troca a ordenação e recarrega a grade a partir do início."""
+        log_event("grade_virtual", f"ordenar {ordenar_por} {ordem}")
+        self.ordenar_por = ordenar_por
+        self.ordem = ordem
+        self._topo = 0
+        self._indicar_ordenacao()
+        self.recarregar()
+
+    def _cabecalho_clicado(self, campo):
+        # Novo clique na mesma coluna inverte a ordem
+        if campo == self.ordenar_por:
+            self.ordenar(campo, "desc" if self.ordem == "asc" else "asc")
+        else:
+            self.ordenar(campo, "asc")
+
+    def _indicar_ordenacao(self):
+        """Marca com uma seta o cabeçalho da coluna ordenada."""
+        for campo, titulo, _ in self.colunas:
+            if campo == self.ordenar_por:
+                titulo += " ▲" if self.ordem == "asc" else " ▼"
+            self.tree.heading(campo, text=titulo)
+
+    def _total_carregado(self, total, versao):
+        if versao != self._versao:
+            return
+        self.total = total
+        self._topo = max(0, min(self._topo, total - self._visiveis))
+        self._renderizar()
+        if self.ao_carregar:
+            self.ao_carregar(total)
+
+    def _falhou(self, erro):
+        log_event("grade_virtual", f"ERRO: {erro}")
+        if self.ao_falhar:
+            self.ao_falhar(erro)
+
+    def _linha(self, indice):
+        """Retorna o registro na posição 'indice' ou None se o bloco ainda não chegou."""
+        bloco = self._blocos.get(indice // TAMANHO_BLOCO)
+        if bloco is None:
+            return None
+        posicao = indice % TAMANHO_BLOCO
+        itens = bloco["itens"]
+        return itens[posicao] if posicao < len(itens) else None
+
+    def _buscar_bloco(self, indice_bloco):
+        """
+        Busca um bloco em segundo plano a partir do cursor do bloco em memória
+        mais próximo, pulando apenas os blocos entre os dois (nenhum, se for
+        vizinho). Sem bloco útil em memória, pula desde o início da tabela.
+        """
+        if indice_bloco in self._blocos or indice_bloco in self._carregando:
+            return
+        if indice_bloco < 0 or indice_bloco * TAMANHO_BLOCO >= self.total:
+            return
+        pular, cursor = indice_bloco * TAMANHO_BLOCO, None
+        for b, bloco in self._blocos.items():
+            if b < indice_bloco and bloco["proxima"]:
+                opcao = ((indice_bloco - b - 1) * TAMANHO_BLOCO, bloco["proxima"])
+            elif b > indice_bloco and bloco["anterior"]:
+                opcao = ((b - indice_bloco - 1) * TAMANHO_BLOCO, bloco["anterior"])
+            else:
+                continue
+            if opcao[0] < pular:
+                pular, cursor = opcao
+        opcoes = {"cursor": cursor, "deslocamento": pular} if cursor else {"deslocamento": pular}
+        self._carregando.add(indice_bloco)
+        versao = self._versao
+        executar_em_segundo_plano(
+            self, self.carregar_pagina, TAMANHO_BLOCO, self.ordenar_por, self.ordem, **opcoes,
+            ao_concluir=lambda pagina: self._bloco_carregado(indice_bloco, pagina, versao),
+            ao_falhar=lambda erro: self._bloco_falhou(indice_bloco, erro, versao)
+        )
+
+    def _bloco_carregado(self, indice_bloco, pagina, versao):
+        if versao != self._versao:
+            return
+        self._carregando.discard(indice_bloco)
+        self._blocos[indice_bloco] = pagina
+        # Mantém apenas os blocos mais próximos da posição atual
+        atual = self._topo // TAMANHO_BLOCO
+        while len(self._blocos) > MAX_BLOCOS_CACHE:
+            del self._blocos[max(self._blocos, key=lambda b: abs(b - atual))]
+        self._renderizar()
+
+    def _bloco_falhou(self, indice_bloco, erro, versao):
+        if versao == self._versao:
+            self._carregando.discard(indice_bloco)
+            self._falhou(erro)
+
+    # ─── Alterações locais (sem recarregar a grade) ──────────────────────
+
+    def aplicar_alteracao(self, acao, chave, linha=None):
+        """
+        Reflete na grade um registro gravado ou excluído, sem nova consulta.
+
+        Args:
+            acao (str): 'inserido', 'alterado' ou 'excluido'.
+            chave: Chave do registro (matrícula, Id...).
+            linha (dict): Registro gravado com as colunas da grade (None
+                          para 'excluido').
+        """
+        if acao == "excluido" or linha is None:
+            self.remover_linha(chave)
+        elif acao == "inserido":
+            self.inserir_linha(linha)
+        else:
+            self.atualizar_linha(chave, linha)
+
+    def atualizar_linha(self, chave, linha):
+        """Troca os valores da linha com a chave informada, se estiver em memória."""
+        indice = self._posicao(chave)
+        if indice is None:
+            return  # Fora dos blocos carregados: será lida atualizada quando exibida
+        self._blocos[indice // TAMANHO_BLOCO]["itens"][indice % TAMANHO_BLOCO] = linha
+        self._renderizar()
+
+    def inserir_linha(self, linha):
+        """
+        Insere um registro novo na posição da ordenação atual, deslocando as
+        linhas seguintes dos blocos em memória, e o seleciona. Se a posição
+        cair fora dos blocos carregados, os blocos afetados são descartados
+        e buscados de novo quando forem exibidos.
+
+        Returns:
+            int ou None: Posição do registro na grade, se conhecida.
+        """
+        self._invalidar_consultas()
+        self.total += 1
+        indice = self._posicao_ordenada(linha)
+        if indice is not None:
+            if indice // TAMANHO_BLOCO in self._blocos:
+                self._deslocar(indice, linha)
+            else:
+                # Primeira linha de um bloco novo no fim da tabela
+                self._blocos[indice // TAMANHO_BLOCO] = {"itens": [linha], "proxima": None, "anterior": None}
+            self._selecionados = [linha[self.chave]]
+            self._foco = linha[self.chave]
+            if not self._topo <= indice < self._topo + self._visiveis:
+                self._topo = max(0, min(indice - self._visiveis // 2, self.total - self._visiveis))
+        self._renderizar()
+        return indice
+
+    def remover_linha(self, chave):
+        """Retira o registro com a chave informada, deslocando as linhas seguintes."""
+        indice = self._posicao(chave)
+        self._invalidar_consultas()
+        self.total = max(0, self.total - 1)
+        if indice is None:
+            # Posição desconhecida: todas as posições em memória podem ter mudado
+            self._blocos.clear()
+        else:
+            self._deslocar(indice)
+        self._selecionados = [c for c in self._selecionados if c != chave]
+        if self._foco == chave:
+            self._foco = None
+        self._topo = max(0, min(self._topo, self.total - self._visiveis))
+        self._renderizar()
+
+    def _invalidar_consultas(self):
+        # Blocos em andamento foram pedidos com as posições anteriores à alteração
+        self._versao += 1
+        self._carregando.clear()
+
+    def _posicao(self, chave):
+        """Posição (índice na grade) do registro com a chave, se estiver em memória."""
+        for indice_bloco, bloco in self._blocos.items():
+            for posicao, linha in enumerate(bloco["itens"]):
+                if linha[self.chave] == chave:
+                    return indice_bloco * TAMANHO_BLOCO + posicao
+        return None
+
+    @staticmethod
+    def _normalizar(valor):
+        return valor.casefold() if isinstance(valor, str) else valor
+
+    def _chave_ordem(self, linha):
+        # Mesma ordem do banco: NULL primeiro, depois o valor e, no empate, a chave
+        valor = linha.get(self.ordenar_por)
+        return (valor is not None, self._normalizar(valor) if valor is not None else 0,
+                self._normalizar(linha[self.chave]))
+
+    def _precede(self, a, b):
+        return a < b if self.ordem == "asc" else a > b
+
+    def _posicao_ordenada(self, linha):
+        """
+        Posição em que 'linha' entra na ordenação atual, calculada pelos
+        blocos em memória, ou None se ela cair em um trecho não carregado.
+        """
+        nova = self._chave_ordem(linha)
+        for indice_bloco in sorted(self._blocos):
+            itens = self._blocos[indice_bloco]["itens"]
+            if not itens or not self._precede(nova, self._chave_ordem(itens[-1])):
+                continue
+            contiguo = indice_bloco == 0 or indice_bloco - 1 in self._blocos
+            if not contiguo and self._precede(nova, self._chave_ordem(itens[0])):
+                # Entre um trecho não carregado e este bloco: posição desconhecida
+                for b in [b for b in self._blocos if b >= indice_bloco]:
+                    del self._blocos[b]
+                return None
+            posicao = next(i for i, l in enumerate(itens) if self._precede(nova, self._chave_ordem(l)))
+            return indice_bloco * TAMANHO_BLOCO + posicao
+        # Depois de todas as linhas em memória: só é conhecida se o fim da tabela estiver carregado
+        if not self._blocos:
+            return 0 if self.total == 1 else None
+        ultimo = max(self._blocos)
+        fim = ultimo * TAMANHO_BLOCO + len(self._blocos[ultimo]["itens"])
+        return fim if fim == self.total - 1 else None
+
+    def _deslocar(self, indice, linha=None):
+        """
+        Insere 'linha' na posição 'indice' (ou remove a linha dessa posição,
+        se linha for None) e reagrupa os blocos consecutivos em memória.
+        """
+        primeiro = indice // TAMANHO_BLOCO
+        cadeia = [primeiro]
+        while cadeia[-1] + 1 in self._blocos:
+            cadeia.append(cadeia[-1] + 1)
+        linhas = [l for b in cadeia for l in self._blocos[b]["itens"]]
+        posicao = indice - primeiro * TAMANHO_BLOCO
+        if linha is None:
+            del linhas[posicao]
+        else:
+            linhas.insert(posicao, linha)
+        for n, indice_bloco in enumerate(cadeia):
+            # A primeira e a última linha mudaram: os cursores do bloco não valem mais,
+            # e os vizinhos passam a ser buscados pela posição
+            self._blocos[indice_bloco] = {
+                "itens": linhas[n * TAMANHO_BLOCO:(n + 1) * TAMANHO_BLOCO],
+                "proxima": None, "anterior": None,
+            }
+        ultimo = cadeia[-1]
+        # Na inserção, a linha que passou do último bloco é descartada (pertence ao
+        # bloco seguinte, não carregado); na remoção, o último bloco fica incompleto
+        # e, se não for o fim da tabela, precisa ser buscado de novo
+        quantidade = len(self._blocos[ultimo]["itens"])
+        if quantidade < TAMANHO_BLOCO and ultimo * TAMANHO_BLOCO + quantidade < self.total:
+            del self._blocos[ultimo]
+        # Blocos depois de um trecho não carregado ficaram com as posições deslocadas
+        for b in [b for b in self._blocos if b > ultimo]:
+            del self._blocos[b]
+
+    # ─── Exibição ────────────────────────────────────────────────────────
+
+    def _redimensionado(self, event):
+        altura = int(ttk.Style().lookup("Treeview", "rowheight") or ALTURA_LINHA_PADRAO)
+        visiveis = max(1, (event.height - ALTURA_CABECALHO) // altura)
+        if visiveis != self._visiveis:
+            self._visiveis = visiveis
+            self._renderizar()
+
+    def _renderizar(self):
+        """
+        Atualiza os itens da Treeview com os registros da janela visível,
+        reaproveitando os itens existentes, e busca os blocos que faltarem.
+        """
+        quantidade = max(0, min(self._visiveis + MARGEM_LINHAS, self.total - self._topo))
+        itens = self.tree.get_children()
+        self._renderizando = True
+        try:
+            if len(itens) > quantidade:
+                self.tree.delete(*itens[quantidade:])
+                itens = itens[:quantidade]
+            for _ in range(quantidade - len(itens)):
+                itens += (self.tree.insert("", "end"),)
+            selecionar = []
+            for item, indice in zip(itens, range(self._topo, self._topo + quantidade)):
+                linha = self._linha(indice)
+                if linha is None:
+                    self.tree.item(item, values=("Carregando...",), tags=())
+                    continue
+                self.tree.item(item, values=[self._formatar(linha.get(c[0])) for c in self.colunas],
+                               tags=(str(linha[self.chave]),))
+                if linha[self.chave] in self._selecionados:
+                    selecionar.append(item)
+                if linha[self.chave] == self._foco:
+                    self.tree.focus(item)
+            self.tree.selection_set(selecionar)
+            self.tree.yview_moveto(0)  # A rolagem é feita trocando os valores, não a vista
+        finally:
+            self._renderizando = False
+
+        if self.total:
+            self.barra.set(self._topo / self.total, (self._topo + self._visiveis) / self.total)
+        else:
+            self.barra.set(0, 1)
+
+        # Busca os blocos da janela visível e os vizinhos (meio bloco de antecedência)
+        inicio = max(0, self._topo - TAMANHO_BLOCO // 2)
+        fim = self._topo + quantidade + TAMANHO_BLOCO // 2
+        for indice_bloco in range(inicio // TAMANHO_BLOCO, fim // TAMANHO_BLOCO + 1):
+            self._buscar_bloco(indice_bloco)
+
+    @staticmethod
+    def _formatar(valor):
+        return "" if valor is None else valor
+
+    def _posicionar(self, topo):
+        topo = max(0, min(int(topo), self.total - self._visiveis))
+        if topo != self._topo:
+            self._topo = topo
+            self._renderizar()
+
+    def _rolar(self, *args):
+        """Comando da barra de rolagem ('moveto' fração | 'scroll' n 'units'/'pages')."""
+        if args[0] == "moveto":
+            self._posicionar(float(args[1]) * self.total)
+        elif args[0] == "scroll":
+            passo = int(args[1]) * (self._visiveis if args[2] == "pages" else 1)
+            self._posicionar(self._topo + passo)
+
+    def _roda_mouse(self, event):
+        self._rolar("scroll", -3 if event.delta > 0 else 3, "units")
+        return "break"
+
+    # ─── Seleção ─────────────────────────────────────────────────────────
+
+    def _chave_item(self, item):
+        tags = self.tree.item(item, "tags")
+        if not tags:
+            return None
+        indice = self._topo + self.tree.index(item)
+        linha = self._linha(indice)
+        return linha[self.chave] if linha else None
+
+    def _clique(self, event):
+        self._modificador = bool(event.state & 0x0005)  # Shift (0x1) ou Ctrl (0x4)
+
+    def _selecao_alterada(self, event=None):
+        if self._renderizando:
+            return
+        visiveis = {self._chave_item(i) for i in self.tree.get_children()}
+        marcados = [self._chave_item(i) for i in self.tree.selection()]
+        fora = [c for c in self._selecionados if c not in visiveis] if self._modificador else []
+        self._selecionados = [c for c in fora + marcados if c is not None]
+        foco = self.tree.focus()
+        self._foco = self._chave_item(foco) if foco else None
+
+    def _mover_foco(self, passo):
+        """Move o foco com o teclado, rolando a grade quando passar da janela visível."""
+        if not self.total:
+            return "break"
+        foco = self.tree.focus()
+        atual = self._topo + (self.tree.index(foco) if foco else 0)
+        destino = max(0, min(atual + passo, self.total - 1))
+        if destino < self._topo:
+            self._posicionar(destino)
+        elif destino >= self._topo + self._visiveis:
+            self._posicionar(destino - self._visiveis + 1)
+        linha = self._linha(destino)
+        self._selecionados = [linha[self.chave]] if linha else []
+        self._foco = linha[self.chave] if linha else None
+        item = self.tree.get_children()[destino - self._topo]
+        self._renderizando = True
+        self.tree.focus(item)
+        self.tree.selection_set(item)
+        self._renderizando = False
+        return "break"
+
+    def chaves_selecionadas(self):
+        """Retorna as chaves de todas as linhas selecionadas (inclusive fora da vista)."""
+        return list(self._selecionados)
+
+    def chave_em_foco(self):
+        """Retorna a chave da linha em foco, ou None."""
+        return self._foco
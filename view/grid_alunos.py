@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 # ==============================================================================
 # Nome do Script: grid_alunos.py - Grade de Alunos
-# Descrição: Este script exibe uma grade (Treeview) listando todos os alunos
-#            e fornece botões para adicionar, editar, excluir ou fechar.
+# Descrição: Este script exibe uma grade (Treeview) listando todos os alunos,
+#            com uma caixa de busca por matrícula, nome ou curso, e fornece
+#            botões para adicionar, editar, excluir ou fechar.
 #
 # Autor: Nome do aluno
 # Data de Criação: 
@@ -10,9 +11,10 @@
 #
 # Dependências:
 # - customtkinter: Para criação da interface gráfica.
-# - tkinter.ttk: Para widget Treeview.
 # - controller.aluno_controller: Para operações de banco de dados de alunos.
 # - view.form_alunos: Para abrir o formulário de cadastro/edição.
+# - view.grade_virtual: Para a grade que carrega apenas as linhas visíveis.
+# - view.executor_db: Para consultar o banco sem congelar a interface.
 # - logger: Para registro de logs de eventos.
 #
 # Uso: Execute a partir da janela principal no menu 'Arquivo' para visualizar a grade.
@@ -28,18 +30,23 @@ if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
 import customtkinter as ctk
-from tkinter import ttk, messagebox
-from controller.aluno_controller import obter_alunos, deletar_aluno
+from tkinter import messagebox
+from controller.aluno_controller import (obter_pagina_alunos, contar_alunos, deletar_alunos, buscar_alunos,
+                                         ORDENACOES_ALUNOS)
 from view.form_alunos import FormAlunos
+from view.grade_virtual import GradeVirtual, fonte_lista
+from view.executor_db import executar_em_segundo_plano
 from logger import log_event
 
+ESPERA_BUSCA_MS = 300  # Pausa na digitação antes de consultar o banco
+
 class GridAlunos(ctk.CTkToplevel):
     """
     Janela modal que exibe uma grade (Treeview) com todos os alunos cadastrados.
 
     Fornece botões para adicionar, editar e excluir registros, além de
     suporte a duplo-clique para edição. A lista é atualizada automaticamente
-    após cada operação CRUD via callback.
+    após cada operação CRUD via callback, alterando apenas a linha afetada.
 
     Parâmetros:
         master: Janela principal que chama esta grade.
@@ -59,18 +66,30 @@ class GridAlunos(ctk.CTkToplevel):
         # Título da grade
         ctk.CTkLabel(self, text="Alunos Cadastrados", font=("Arial", 16)).pack(pady=10)
 
-        # ─── Treeview com colunas de dados dos alunos ────────────────────
-        self.tree = ttk.Treeview(
+        # ─── Busca por matrícula, nome ou curso ──────────────────────────
+        # A consulta só é feita quando o usuário para de digitar por ESPERA_BUSCA_MS
+        self.entry_busca = ctk.CTkEntry(self, placeholder_text="Buscar por matrícula, nome ou curso...")
+        self.entry_busca.pack(fill="x", padx=10)
+        self.entry_busca.bind("<KeyRelease>", self._busca_digitada)
+        self._busca_agendada = None
+        self._versao_busca = 0  # Descarta resultados de buscas já superadas
+
+        # ─── Grade virtual com colunas de dados dos alunos ───────────────
+        # Apenas as linhas visíveis ficam na Treeview; as demais são buscadas
+        # em blocos conforme a rolagem
+        self.grade = GradeVirtual(
             self,
-            columns=("matricula", "nome", "curso", "idade", "sexo"),
-            show="headings"
+            colunas=[("matricula", "Matrícula", 120), ("nome", "Nome", 250), ("curso", "Curso", 200),
+                     ("idade", "Idade", 80), ("sexo", "Sexo", 80)],
+            chave="matricula",
+            carregar_pagina=obter_pagina_alunos,
+            contar=contar_alunos,
+            ordenacoes=ORDENACOES_ALUNOS,  # Clique no cabeçalho ordena (no banco)
+            ao_carregar=self._lista_carregada,
+            ao_falhar=self._falha_carregar
         )
-        self.tree.heading("matricula", text="Matrícula")
-        self.tree.heading("nome", text="Nome")
-        self.tree.heading("curso", text="Curso")
-        self.tree.heading("idade", text="Idade")
-        self.tree.heading("sexo", text="Sexo")
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        self.grade.pack(fill="both", expand=True, padx=10, pady=10)
+        self.tree = self.grade.tree
         self.tree.bind("<Double-1>", self.editar_selecionado)  # Duplo-clique abre edição
 
         # ─── Botões de ação ──────────────────────────────────────────────
@@ -82,6 +101,10 @@ class GridAlunos(ctk.CTkToplevel):
         ctk.CTkButton(frame, text="Excluir", command=self.excluir).pack(side="left", padx=5)
         ctk.CTkButton(frame, text="Fechar", command=self.destroy).pack(side="left", padx=5)
 
+        # Indicador de carregamento (a consulta roda em segundo plano)
+        self.label_status = ctk.CTkLabel(self, text="")
+        self.label_status.pack(pady=(0, 5))
+
         self.atualizar_lista()  # Carrega os dados iniciais
 
         # Centraliza a janela na tela
@@ -102,23 +125,104 @@ class GridAlunos(ctk.CTkToplevel):
 
     def atualizar_lista(self):
         """
-        Recarrega a lista de alunos do banco de dados e atualiza a Treeview.
-        Limpa todos os itens existentes antes de inserir os novos.
+        Recarrega a grade de alunos em segundo plano. A grade reconta os
+        registros e busca apenas os blocos da posição visível; até lá, a
+        janela continua respondendo e exibe "Carregando...".
         """
         log_event("grid_alunos", "atualizar_lista")
-        for i in self.tree.get_children():
-            self.tree.delete(i)  # Limpa a tabela
-        for aluno in obter_alunos():
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    aluno["matricula"],
-                    aluno["nome"],
-                    aluno["curso"],
-                    aluno["idade"], aluno.get("sexo", "")
-                )
-            )
+        if self.entry_busca.get().strip():
+            self.buscar()  # Com filtro ativo, refaz a busca
+            return
+        self.label_status.configure(text="Carregando alunos...")
+        self.grade.recarregar()
+
+    def _busca_digitada(self, event=None):
+        """
+        Reinicia a espera a cada tecla; a busca roda ESPERA_BUSCA_MS depois
+        da última tecla digitada.
+        """
+        if self._busca_agendada is not None:
+            self.after_cancel(self._busca_agendada)
+        self._busca_agendada = self.after(ESPERA_BUSCA_MS, self.buscar)
+
+    def buscar(self):
+        """
+        Filtra a grade pelo texto da busca (consulta no banco em segundo
+        plano). Com a busca vazia, volta a exibir todos os alunos.
+        """
+        self._busca_agendada = None
+        self._versao_busca += 1
+        termo = self.entry_busca.get().strip()
+        if not termo:
+            self.grade.definir_fonte(obter_pagina_alunos, contar_alunos)
+            return
+        log_event("grid_alunos", "buscar")
+        versao = self._versao_busca
+        self.label_status.configure(text="Buscando...")
+        executar_em_segundo_plano(
+            self, buscar_alunos, termo,
+            ao_concluir=lambda alunos: self._busca_concluida(alunos, versao),
+            ao_falhar=self._falha_carregar
+        )
+
+    def _busca_concluida(self, alunos, versao):
+        """
+        Exibe na grade os alunos encontrados, se a busca ainda for a atual.
+        """
+        if versao != self._versao_busca:
+            return
+        self.grade.definir_fonte(*fonte_lista(alunos))
+
+    def _lista_carregada(self, total):
+        """
+        Exibe o total de alunos após a recarga da grade.
+        """
+        if self.entry_busca.get().strip():
+            self.label_status.configure(text=f"{total} aluno(s) encontrado(s)")
+        else:
+            self.label_status.configure(text=f"{total} aluno(s)")
+
+    def _falha_carregar(self, erro):
+        """
+        Exibe o erro de carregamento no indicador de status e em uma mensagem.
+        """
+        log_event("grid_alunos", f"ERRO atualizar_lista: {erro}")
+        self.label_status.configure(text="Falha ao carregar alunos.")
+        messagebox.showerror("Erro", f"Falha ao carregar alunos: {erro}")
+
+    def registro_alterado(self, acao, chave, linha):
+        """
+        Callback dos formulários: insere, atualiza ou remove apenas a linha
+        afetada, sem consultar novamente a tabela inteira.
+
+        Args:
+            acao (str): 'inserido', 'alterado' ou 'excluido'.
+            chave: Chave do registro gravado ou excluído.
+            linha (dict): Registro gravado (None na exclusão).
+        """
+        log_event("grid_alunos", f"registro_alterado {acao} {chave}")
+        self.grade.aplicar_alteracao(acao, chave, linha)
+        self._lista_carregada(self.grade.total)
+        self._refazer_busca_ativa()
+
+    def _excluidos(self, chaves):
+        """
+        Retira da grade as linhas excluídas em lote.
+        """
+        for chave in chaves:
+            self.grade.remover_linha(chave)
+        self._lista_carregada(self.grade.total)
+        self._refazer_busca_ativa()
+
+    def _refazer_busca_ativa(self):
+        """
+        Com um filtro ativo, a grade exibe uma cópia do resultado da busca
+        (fonte_lista): a linha corrigida acima se perderia na próxima
+        ordenação ou rolagem. Refaz a busca, com a mesma espera da digitação
+        para juntar alterações seguidas.
+        """
+        if self.entry_busca.get().strip():
+            self._busca_digitada()
 
     def adicionar(self):
         """
@@ -126,7 +230,7 @@ class GridAlunos(ctk.CTkToplevel):
         passando o callback de atualização da lista.
         """
         log_event("grid_alunos", "adicionar")
-        FormAlunos(self, atualizar_callback=self.atualizar_lista)
+        FormAlunos(self, atualizar_callback=self.registro_alterado)
 
     def editar_selecionado(self, event=None):
         """
@@ -137,24 +241,44 @@ class GridAlunos(ctk.CTkToplevel):
             event: Evento de duplo-clique (opcional, None se via botão).
         """
         log_event("grid_alunos", "editar_selecionado")
-        item = self.tree.focus()
-        if not item:
+        matricula = self.grade.chave_em_foco()
+        if matricula is None:
             messagebox.showwarning("Seleção", "Selecione um aluno.")
             return
-        matricula = self.tree.item(item)["values"][0]  # Obtém a matrícula da primeira coluna
-        FormAlunos(self, matricula=matricula, atualizar_callback=self.atualizar_lista)
+        FormAlunos(self, matricula=matricula, atualizar_callback=self.registro_alterado)
 
     def excluir(self):
         """
-        Exclui o aluno selecionado na Treeview após confirmação do usuário.
-        Exibe aviso se nenhum item estiver selecionado.
+        Exclui os alunos selecionados na Treeview após confirmação do usuário.
+        Vários alunos podem ser selecionados (Ctrl/Shift + clique); todos são
+        excluídos em uma única transação. Exibe aviso se nenhum item estiver
+        selecionado.
         """
         log_event("grid_alunos", "excluir")
-        item = self.tree.focus()
-        if not item:
+        # Matrículas selecionadas, inclusive as que já saíram da área visível
+        matriculas = self.grade.chaves_selecionadas()
+        if not matriculas and self.grade.chave_em_foco() is not None:
+            matriculas = [self.grade.chave_em_foco()]
+        if not matriculas:
             messagebox.showwarning("Seleção", "Selecione um aluno.")
             return
-        matricula = self.tree.item(item)["values"][0]  # Obtém a matrícula da primeira coluna
-        if messagebox.askyesno("Confirmação", f"Deseja excluir o aluno {matricula}?"):
-            deletar_aluno(matricula)
-            self.atualizar_lista()  # Recarrega a lista após exclusão
+        if len(matriculas) == 1:
+            pergunta = f"Deseja excluir o aluno {matriculas[0]}?"
+        else:
+            pergunta = f"Deseja excluir os {len(matriculas)} alunos selecionados?"
+        if messagebox.askyesno("Confirmação", pergunta):
+            self.label_status.configure(text="Excluindo...")
+            executar_em_segundo_plano(
+                self, deletar_alunos, matriculas,
+                ao_concluir=self._excluidos,  # Retira apenas as linhas excluídas
+                ao_falhar=self._falha_excluir
+            )
+
+    def _falha_excluir(self, erro):
+        """
+        Restaura o indicador de status e exibe o erro da exclusão (nenhum
+        registro do lote foi excluído: a transação foi desfeita).
+        """
+        log_event("grid_alunos", f"ERRO excluir: {erro}")
+        self._lista_carregada(self.grade.total)
+        messagebox.showerror("Erro", f"Falha ao excluir alunos: {erro}")
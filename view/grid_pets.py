@@ -10,9 +10,10 @@
 #
 # Dependências:
 # - customtkinter: Para criação da interface gráfica.
-# - tkinter.ttk: Para widget Treeview.
 # - controller.pet_controller: Para operações de banco de dados de pets.
 # - view.form_pets: Para abrir o formulário de cadastro/edição.
+# - view.grade_virtual: Para a grade que carrega apenas as linhas visíveis.
+# - view.executor_db: Para consultar o banco sem congelar a interface.
 # - logger: Para registro de logs de eventos.
 #
 # Uso: Execute a partir da janela principal no menu 'Arquivo' para visualizar a grade.
@@ -22,9 +23,11 @@
 # Grid de pets com listagem, botões de CRUD e logging
 
 import customtkinter as ctk
-from tkinter import ttk, messagebox
-from controller.pet_controller import obter_pets, deletar_pet
+from tkinter import messagebox
+from controller.pet_controller import obter_pagina_pets, contar_pets, deletar_pets, ORDENACOES_PETS
 from view.form_pets import FormPets
+from view.grade_virtual import GradeVirtual
+from view.executor_db import executar_em_segundo_plano
 from logger import log_event
 
 
@@ -34,7 +37,7 @@ class GridPets(ctk.CTkToplevel):
 
     Fornece botões para adicionar, editar e excluir registros, além de
     suporte a duplo-clique para edição. A lista é atualizada automaticamente
-    após cada operação CRUD via callback.
+    após cada operação CRUD via callback, alterando apenas a linha afetada.
 
     Parâmetros:
         master: Janela principal que chama esta grade.
@@ -54,11 +57,22 @@ class GridPets(ctk.CTkToplevel):
         # Título da grade
         ctk.CTkLabel(self, text="Pets Cadastrados", font=("Arial", 16)).pack(pady=10)
 
-        # ─── Treeview com colunas de dados dos pets ──────────────────────
-        self.tree = ttk.Treeview(self, columns=("id", "apelido", "raca", "data_nascimento", "cpf"), show="headings")
-        for col in self.tree["columns"]:
-            self.tree.heading(col, text=col.capitalize())
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        # ─── Grade virtual com colunas de dados dos pets ─────────────────
+        # Apenas as linhas visíveis ficam na Treeview; as demais são buscadas
+        # em blocos conforme a rolagem
+        self.grade = GradeVirtual(
+            self,
+            colunas=[("Id", "Id", 60), ("apelido", "Apelido", 180), ("raca", "Raca", 180),
+                     ("data_nascimento", "Data_nascimento", 150), ("cpf", "Cpf", 150)],
+            chave="Id",
+            carregar_pagina=obter_pagina_pets,
+            contar=contar_pets,
+            ordenacoes=ORDENACOES_PETS,  # Clique no cabeçalho ordena (no banco)
+            ao_carregar=self._lista_carregada,
+            ao_falhar=self._falha_carregar
+        )
+        self.grade.pack(fill="both", expand=True, padx=10, pady=10)
+        self.tree = self.grade.tree
         self.tree.bind("<Double-1>", self.editar_selecionado)  # Duplo-clique abre edição
 
         # ─── Botões de ação ──────────────────────────────────────────────
@@ -70,6 +84,10 @@ class GridPets(ctk.CTkToplevel):
         ctk.CTkButton(frame, text="Excluir", command=self.excluir).pack(side="left", padx=5)
         ctk.CTkButton(frame, text="Fechar", command=self.destroy).pack(side="left", padx=5)
 
+        # Indicador de carregamento (a consulta roda em segundo plano)
+        self.label_status = ctk.CTkLabel(self, text="")
+        self.label_status.pack(pady=(0, 5))
+
         self.atualizar_lista()  # Carrega os dados iniciais
         self._center_window()
 
@@ -88,20 +106,54 @@ class GridPets(ctk.CTkToplevel):
 
     def atualizar_lista(self):
         """
-        Recarrega a lista de pets do banco de dados e atualiza a Treeview.
-        Limpa todos os itens existentes antes de inserir os novos.
+        Recarrega a grade de pets em segundo plano. A grade reconta os
+        registros e busca apenas os blocos da posição visível.
+        """
+        self.label_status.configure(text="Carregando pets...")
+        self.grade.recarregar()
+
+    def _lista_carregada(self, total):
+        """
+        Exibe o total de pets após a recarga da grade.
+        """
+        self.label_status.configure(text=f"{total} pet(s)")
+
+    def _falha_carregar(self, erro):
+        """
+        Exibe o erro de carregamento no indicador de status e em uma mensagem.
+        """
+        log_event("grid_pets", f"ERRO atualizar_lista: {erro}")
+        self.label_status.configure(text="Falha ao carregar pets.")
+        messagebox.showerror("Erro", f"Falha ao carregar pets: {erro}")
+
+    def registro_alterado(self, acao, chave, linha):
+        """
+        Callback dos formulários: insere, atualiza ou remove apenas a linha
+        afetada, sem consultar novamente a tabela inteira.
+
+        Args:
+            acao (str): 'inserido', 'alterado' ou 'excluido'.
+            chave: Chave do registro gravado ou excluído.
+            linha (dict): Registro gravado (None na exclusão).
         """
-        for i in self.tree.get_children():
-            self.tree.delete(i)  # Limpa a tabela
-        for pet in obter_pets():
-            self.tree.insert("", "end", values=(pet["Id"], pet["apelido"], pet["raca"], pet["data_nascimento"], pet["cpf"]))
+        log_event("grid_pets", f"registro_alterado {acao} {chave}")
+        self.grade.aplicar_alteracao(acao, chave, linha)
+        self._lista_carregada(self.grade.total)
+
+    def _excluidos(self, chaves):
+        """
+        Retira da grade as linhas excluídas em lote.
+        """
+        for chave in chaves:
+            self.grade.remover_linha(chave)
+        self._lista_carregada(self.grade.total)
 
     def adicionar(self):
         """
         Abre o formulário de cadastro de um novo pet (FormPets),
         passando o callback de atualização da lista.
         """
-        FormPets(self, atualizar_callback=self.atualizar_lista)
+        FormPets(self, atualizar_callback=self.registro_alterado)
 
     def editar_selecionado(self, event=None):
         """
@@ -111,23 +163,43 @@ class GridPets(ctk.CTkToplevel):
         Args:
             event: Evento de duplo-clique (opcional, None se via botão).
         """
-        item = self.tree.focus()
-        if not item:
+        pet_id = self.grade.chave_em_foco()
+        if pet_id is None:
             messagebox.showwarning("Seleção", "Selecione um pet.")
             return
-        pet_id = self.tree.item(item)["values"][0]  # Obtém o ID da primeira coluna
-        FormPets(self, pet_id=pet_id, atualizar_callback=self.atualizar_lista)
+        FormPets(self, pet_id=pet_id, atualizar_callback=self.registro_alterado)
 
     def excluir(self):
         """
-        Exclui o pet selecionado na Treeview após confirmação do usuário.
-        Exibe aviso se nenhum item estiver selecionado.
+        Exclui os pets selecionados na Treeview após confirmação do usuário.
+        Vários pets podem ser selecionados (Ctrl/Shift + clique); todos são
+        excluídos em uma única transação. Exibe aviso se nenhum item estiver
+        selecionado.
         """
-        item = self.tree.focus()
-        if not item:
+        # IDs selecionados, inclusive os que já saíram da área visível
+        pet_ids = self.grade.chaves_selecionadas()
+        if not pet_ids and self.grade.chave_em_foco() is not None:
+            pet_ids = [self.grade.chave_em_foco()]
+        if not pet_ids:
             messagebox.showwarning("Seleção", "Selecione um pet.")
             return
-        pet_id = self.tree.item(item)["values"][0]  # Obtém o ID da primeira coluna
-        if messagebox.askyesno("Confirmação", "Deseja excluir este pet?"):
-            deletar_pet(pet_id)
-            self.atualizar_lista()  # Recarrega a lista após exclusão
+        if len(pet_ids) == 1:
+            pergunta = "Deseja excluir este pet?"
+        else:
+            pergunta = f"Deseja excluir os {len(pet_ids)} pets selecionados?"
+        if messagebox.askyesno("Confirmação", pergunta):
+            self.label_status.configure(text="Excluindo...")
+            executar_em_segundo_plano(
+                self, deletar_pets, pet_ids,
+                ao_concluir=self._excluidos,  # Retira apenas as linhas excluídas
+                ao_falhar=self._falha_excluir
+            )
+
+    def _falha_excluir(self, erro):
+        """
+        Restaura o indicador de status e exibe o erro da exclusão (nenhum
+        registro do lote foi excluído: a transação foi desfeita).
+        """
+        log_event("grid_pets", f"ERRO excluir: {erro}")
+        self._lista_carregada(self.grade.total)
+        messagebox.showerror("Erro", f"Falha ao excluir pets: {erro}")
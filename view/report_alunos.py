@@ -13,6 +13,7 @@
 # - fpdf: Para geração de arquivos PDF.
 # - tkinter.messagebox: Para exibir mensagens de sucesso ou erro.
 # - controller.aluno_controller: Para obter dados de alunos.
+# - view.executor_db: Para gerar o relatório sem congelar a interface.
 #
 # Uso: Execute a partir da janela principal no menu 'Relatórios' para gerar o PDF.
 # ==============================================================================
@@ -24,6 +25,7 @@ import customtkinter as ctk
 from fpdf import FPDF
 from tkinter import messagebox
 from controller.aluno_controller import obter_alunos
+from view.executor_db import executar_em_segundo_plano
 
 class ReportAlunos(ctk.CTkToplevel):
     """
@@ -47,7 +49,8 @@ class ReportAlunos(ctk.CTkToplevel):
 
         # Título e botões de ação
         ctk.CTkLabel(self, text="Gerar Relatório de Alunos", font=("Arial", 16)).pack(pady=20)
-        ctk.CTkButton(self, text="Gerar PDF", command=self.gerar_pdf).pack(pady=10)
+        self.botao_gerar = ctk.CTkButton(self, text="Gerar PDF", command=self.gerar_pdf)
+        self.botao_gerar.pack(pady=10)
         ctk.CTkButton(self, text="Fechar", command=self.destroy).pack(pady=10)
 
         # Centraliza a janela na tela
@@ -68,18 +71,50 @@ class ReportAlunos(ctk.CTkToplevel):
 
     def gerar_pdf(self):
         """
-        Gera o relatório de alunos em formato PDF usando a biblioteca fpdf2.
+        Gera o relatório de alunos em segundo plano.
 
-        Consulta todos os alunos via controller, monta uma tabela com
-        colunas (Matrícula, Nome, Curso, Idade, Sexo) e salva o arquivo
-        'relatorio_alunos.pdf' na raiz do projeto. Exibe mensagem de
-        sucesso ou informação caso não haja alunos cadastrados.
+        A consulta e a montagem do PDF rodam fora da thread da interface
+        (ver _montar_pdf); enquanto isso o botão fica desabilitado e exibe
+        "Gerando...". Ao terminar, exibe mensagem de sucesso ou informação
+        caso não haja alunos cadastrados.
+        """
+        self.botao_gerar.configure(state="disabled", text="Gerando...")
+        executar_em_segundo_plano(self, self._montar_pdf, ao_concluir=self._pdf_concluido,
+                                  ao_falhar=self._pdf_falhou)
+
+    def _pdf_concluido(self, total):
+        """
+        Reabilita o botão e informa o resultado da geração do relatório.
+        """
+        self.botao_gerar.configure(state="normal", text="Gerar PDF")
+        if not total:
+            messagebox.showinfo("Informação", "Não há alunos cadastrados para gerar o relatório.")
+            return
+        messagebox.showinfo("Sucesso", "Relatório gerado com sucesso!")
+
+    def _pdf_falhou(self, erro):
+        """
+        Reabilita o botão e exibe o erro ocorrido na geração do relatório.
+        """
+        self.botao_gerar.configure(state="normal", text="Gerar PDF")
+        messagebox.showerror("Erro", f"Falha ao gerar relatório: {erro}")
+
+    @staticmethod
+    def _montar_pdf():
+        """
+        Consulta os alunos e gera o relatório em formato PDF usando fpdf2.
+
+        Monta uma tabela com colunas (Matrícula, Nome, Curso, Idade, Sexo)
+        e salva o arquivo 'relatorio_alunos.pdf' na raiz do projeto.
+        Roda em uma thread de trabalho, por isso não acessa widgets.
+
+        Returns:
+            int: Quantidade de alunos no relatório (0 se não houver alunos).
         """
         # Consulta todos os alunos via controller
         alunos = obter_alunos()
         if not alunos:
-            messagebox.showinfo("Informação", "Não há alunos cadastrados para gerar o relatório.")
-            return
+            return 0
 
         # Inicializa o documento PDF com fpdf2
         pdf = FPDF()
@@ -107,4 +142,4 @@ class ReportAlunos(ctk.CTkToplevel):
 
         # Salva o arquivo PDF na raiz do projeto
         pdf.output("relatorio_alunos.pdf")
-        messagebox.showinfo("Sucesso", "Relatório gerado com sucesso!")
\ No newline at end of file
+        return len(alunos)
\ No newline at end of file
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# Nome do Script: report_alunos_pets.py - Relatório de Alunos e seus Pets
+# Descrição: Este script gera um relatório em PDF com cada aluno seguido dos
+#            seus pets e salva o arquivo 'relatorio_alunos_pets.pdf'. Os dados
+#            vêm de uma única consulta (LEFT JOIN de alunos com pets), lida em
+#            lotes.
+#
+# Autor: Nome do aluno
+# Data de Criação:
+# Hora de Criação:
+#
+# Dependências:
+# - customtkinter: Para criação da interface gráfica.
+# - fpdf: Para geração de arquivos PDF.
+# - tkinter.messagebox: Para exibir mensagens de sucesso ou erro.
+# - controller.aluno_controller: Para percorrer os alunos com os seus pets.
+# - view.executor_db: Para gerar o relatório sem congelar a interface.
+#
+# Uso: Execute a partir da janela principal no menu 'Relatórios' >
+#      'Relatório de Alunos e Pets'.
+# ==============================================================================
+
+# view/report_alunos_pets.py
+# Geração de relatório em PDF com os alunos e os seus pets
+
+import customtkinter as ctk
+from fpdf import FPDF
+from tkinter import messagebox
+from controller.aluno_controller import iterar_alunos_com_pets
+from view.executor_db import executar_em_segundo_plano
+
+
+class ReportAlunosPets(ctk.CTkToplevel):
+    """
+    Janela modal para geração do relatório de alunos e pets em PDF.
+
+    Exibe um botão para gerar o PDF e outro para fechar. O relatório é
+    criado com fpdf2 e salvo como 'relatorio_alunos_pets.pdf' na raiz do projeto.
+
+    Parâmetros:
+        master: Janela principal que chama este formulário.
+    """
+
+    def __init__(self, master=None):
+        """
+        Inicializa a janela de relatório com título, botão de geração
+        de PDF e botão de fechar.
+        """
+        super().__init__(master)
+        self.title("Relatório de Alunos e Pets")
+        self.geometry("400x200")
+
+        # Título e botões de ação
+        ctk.CTkLabel(self, text="Gerar Relatório de Alunos e Pets", font=("Arial", 16)).pack(pady=20)
+        self.botao_gerar = ctk.CTkButton(self, text="Gerar PDF", command=self.gerar_pdf)
+        self.botao_gerar.pack(pady=10)
+        ctk.CTkButton(self, text="Fechar", command=self.destroy).pack(pady=10)
+
+        # Centraliza a janela na tela
+        self._center_window()
+
+    def _center_window(self):
+        """
+        Centraliza a janela no centro da tela do usuário.
+        """
+        self.update_idletasks()
+        w = 400
+        h = 200
+        sw = self.winfo_screenwidth()
+        sh = self.winfo_screenheight()
+        x = (sw // 2) - (w // 2)
+        y = (sh // 2) - (h // 2)
+        self.geometry(f"{w}x{h}+{x}+{y}")
+
+    def gerar_pdf(self):
+        """
+        Gera o relatório em segundo plano (ver _montar_pdf); enquanto isso
+        o botão fica desabilitado e exibe "Gerando...".
+        """
+        self.botao_gerar.configure(state="disabled", text="Gerando...")
+        executar_em_segundo_plano(self, self._montar_pdf, ao_concluir=self._pdf_concluido,
+                                  ao_falhar=self._pdf_falhou)
+
+    def _pdf_concluido(self, totais):
+        """
+        Reabilita o botão e informa o resultado da geração do relatório.
+        """
+        self.botao_gerar.configure(state="normal", text="Gerar PDF")
+        alunos, pets = totais
+        if not alunos:
+            messagebox.showinfo("Informação", "Não há alunos cadastrados para gerar o relatório.")
+            return
+        messagebox.showinfo("Sucesso", f"Relatório gerado com sucesso! ({alunos} alunos, {pets} pets)")
+
+    def _pdf_falhou(self, erro):
+        """
+        Reabilita o botão e exibe o erro ocorrido na geração do relatório.
+        """
+        self.botao_gerar.configure(state="normal", text="Gerar PDF")
+        messagebox.showerror("Erro", f"Falha ao gerar relatório: {erro}")
+
+    @staticmethod
+    def _montar_pdf():
+        """
+        Percorre os alunos com os seus pets e gera o relatório em PDF.
+
+        Para cada aluno é impressa uma linha (Matrícula, Nome, Curso) e, abaixo
+        dela, uma tabela com os pets (Id, Apelido, Raça, Nascimento). Roda em
+        uma thread de trabalho, por isso não acessa widgets.
+
+        Returns:
+            tuple: (alunos, pets) incluídos no relatório; (0, 0) se não houver alunos.
+        """
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_font("Arial", size=12)
+        pdf.cell(200, 10, txt="Relatório de Alunos e Pets", ln=True, align="C")
+        pdf.ln(5)
+
+        total_alunos = total_pets = 0
+        for lote in iterar_alunos_com_pets():
+            for aluno in lote:
+                total_alunos += 1
+                # Dono: uma linha em negrito
+                pdf.set_font("Arial", "B", 11)
+                pdf.cell(0, 8, f"{aluno['matricula']} - {aluno['nome']} ({aluno['curso']})", ln=True)
+                pdf.set_font("Arial", size=10)
+                if not aluno["pets"]:
+                    pdf.cell(10, 7, "")
+                    pdf.cell(0, 7, "Nenhum pet cadastrado", ln=True)
+                for pet in aluno["pets"]:
+                    total_pets += 1
+                    pdf.cell(10, 7, "")
+                    pdf.cell(20, 7, str(pet["Id"]), border=1)
+                    pdf.cell(60, 7, str(pet["apelido"] or ""), border=1)
+                    pdf.cell(60, 7, str(pet["raca"] or ""), border=1)
+                    pdf.cell(30, 7, str(pet["data_nascimento"] or ""), border=1)
+                    pdf.ln()
+                pdf.ln(2)
+
+        if not total_alunos:
+            return 0, 0
+        # Salva o arquivo PDF na raiz do projeto
+        pdf.output("relatorio_alunos_pets.pdf")
+        return total_alunos, total_pets